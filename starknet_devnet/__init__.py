@@ -1,17 +1,23 @@
 """
 Contains the server implementation and its utility classes and functions.
 """
+import functools
 import sys
 from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash
 from crypto_cpp_py.cpp_bindings import cpp_hash
 
+from .constants import COMPILED_HINT_CACHE_SIZE, PEDERSEN_HASH_CACHE_SIZE
+
 
 __version__ = "0.2.6"
 
 
+@functools.lru_cache(maxsize=PEDERSEN_HASH_CACHE_SIZE)
 def patched_pedersen_hash(left: int, right: int) -> int:
     """
     Pedersen hash function written in c++
+    Results are cached, since the same hashes are calculated repeatedly,
+    e.g. the storage addresses of the same variables and the untouched Patricia tree nodes.
     """
     return cpp_hash(left, right)
 
@@ -24,3 +30,55 @@ setattr(
     "pedersen_hash",
     patched_pedersen_hash,
 )
+
+# The hash function of the facts storage, the hash builtin and the storage address calculation
+# use the pedersen_hash imported into this module, so it has to be patched as well
+# pylint: disable=wrong-import-position,unused-import
+import starkware.cairo.lang.vm.crypto
+setattr(
+    sys.modules["starkware.cairo.lang.vm.crypto"],
+    "pedersen_hash",
+    patched_pedersen_hash,
+)
+
+# Every entry point execution creates a new Cairo runner, which compiles all the hints of the executed program,
+# so the compiled hints of the frequently executed classes (e.g. the fee token and the accounts) are cached
+from starkware.cairo.lang.vm.virtual_machine_base import VirtualMachineBase
+original_compile_hint = VirtualMachineBase.compile_hint
+
+
+@functools.lru_cache(maxsize=COMPILED_HINT_CACHE_SIZE)
+def compile_hint_source(source: str, filename: str):
+    """
+    Compiles the python source code of a hint.
+    The filename identifies the hint in the error tracebacks, so it's a part of the cache key.
+    Since it's derived from the position of the hint in its program, it's the same across runs of the same program.
+    """
+    return compile(source, filename, mode="exec")
+
+
+def patched_compile_hint(self, source, filename, hint_index, pc):
+    """Returns the cached compiled hint; errors are reported by the original implementation."""
+    try:
+        return compile_hint_source(source, filename)
+    except (IndentationError, SyntaxError):
+        return original_compile_hint(self, source, filename, hint_index, pc)
+
+
+setattr(VirtualMachineBase, "compile_hint", patched_compile_hint)
+
+# Declaring and deploying calculate the class hash, which hashes the whole program, usually of a class seen before
+from .class_hash_cache import ClassHashCache
+class_hash_cache = ClassHashCache(hash_functions=(patched_pedersen_hash, pedersen_hash))
+
+import starkware.starknet.business_logic.internal_transaction
+import starkware.starknet.business_logic.state.objects
+import starkware.starknet.core.os.contract_address.contract_address
+import starkware.starknet.core.os.transaction_hash.transaction_hash
+for module_name in [
+    "starkware.starknet.business_logic.internal_transaction",
+    "starkware.starknet.business_logic.state.objects",
+    "starkware.starknet.core.os.contract_address.contract_address",
+    "starkware.starknet.core.os.transaction_hash.transaction_hash",
+]:
+    setattr(sys.modules[module_name], "compute_class_hash", class_hash_cache.compute_class_hash)
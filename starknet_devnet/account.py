@@ -2,6 +2,8 @@
 Account class and its predefined constants.
 """
 
+from typing import List
+
 from starkware.cairo.lang.vm.crypto import pedersen_hash
 from starkware.solidity.utils import load_nearby_contract
 from starkware.starknet.business_logic.state.objects import ContractState, ContractCarriedState
@@ -26,19 +28,24 @@ class Account:
     HASH = 3234970678029762354735267567433689214900679403476863445247436772798892968339
     HASH_BYTES = to_bytes(HASH)
 
-    def __init__(self, private_key: int, public_key: int, initial_balance: int):
+    def __init__(self, private_key: int, public_key: int, initial_balance: int, address: int = None):
+        """If `address` is not provided, it's calculated from `public_key`."""
         self.private_key = private_key
         self.public_key = public_key
+        self.address = address if address is not None else Account.calculate_address(public_key)
+        self.initial_balance = initial_balance
 
+    @staticmethod
+    def calculate_address(public_key: int) -> int:
+        """Returns the address of the account with `public_key`."""
         # salt and class_hash have frozen values that make the constructor_calldata
         # the only thing that affects the account address
-        self.address = calculate_contract_address_from_hash(
+        return calculate_contract_address_from_hash(
             salt=20,
             class_hash=1803505466663265559571280894381905521939782500874858933595227108099796801620,
             constructor_calldata=[public_key],
             deployer_address=0
         )
-        self.initial_balance = initial_balance
 
     @classmethod
     def get_contract_class(cls):
@@ -58,36 +65,56 @@ class Account:
 
     async def deploy(self, starknet: Starknet) -> StarknetContract:
         """Deploy this account."""
-        account_carried_state = starknet.state.state.contract_states[self.address]
-        account_state = account_carried_state.state
-        assert not account_state.initialized
-
-        starknet.state.state.contract_definitions[Account.HASH_BYTES] = Account.get_contract_class()
-
+        contracts = await Account.deploy_all(starknet, [self])
+        return contracts[0]
+
+    @staticmethod
+    async def deploy_all(starknet: Starknet, accounts: List["Account"]) -> List[StarknetContract]:
+        """
+        Deploy `accounts` and set their initial balances in one pass over the carried state.
+        The accounts share the same contract state, which only differs in storage.
+        """
+        if not accounts:
+            return []
+
+        carried_state = starknet.state.state
+        carried_state.contract_definitions[Account.HASH_BYTES] = Account.get_contract_class()
+
+        # all the accounts are undeployed, so their states are the same
+        account_state = carried_state.contract_states[accounts[0].address].state
         newly_deployed_account_state = await ContractState.create(
             contract_hash=Account.HASH_BYTES,
             storage_commitment_tree=account_state.storage_commitment_tree
         )
 
-        starknet.state.state.contract_states[self.address] = ContractCarriedState(
-            state=newly_deployed_account_state,
-            storage_updates={
-                get_selector_from_name("Account_public_key"): StorageLeaf(self.public_key)
-            }
-        )
-
-        # set initial balance
+        public_key_selector = get_selector_from_name("Account_public_key")
+        balances_selector = get_selector_from_name("ERC20_balances")
         fee_token_address = starknet.state.general_config.fee_token_address
-        fee_token_storage_updates = starknet.state.state.contract_states[fee_token_address].storage_updates
-
-        balance_address = pedersen_hash(get_selector_from_name("ERC20_balances"), self.address)
-        initial_balance_uint256 = Uint256.from_felt(self.initial_balance)
-        fee_token_storage_updates[balance_address] = StorageLeaf(initial_balance_uint256.low)
-        fee_token_storage_updates[balance_address + 1] = StorageLeaf(initial_balance_uint256.high)
-
-        return StarknetContract(
-            state=starknet.state,
-            abi=Account.get_contract_class().abi,
-            contract_address=self.address,
-            deploy_execution_info=None
-        )
+        fee_token_storage_updates = carried_state.contract_states[fee_token_address].storage_updates
+        abi = Account.get_contract_class().abi
+
+        contracts = []
+        for account in accounts:
+            assert not carried_state.contract_states[account.address].state.initialized
+
+            carried_state.contract_states[account.address] = ContractCarriedState(
+                state=newly_deployed_account_state,
+                storage_updates={
+                    public_key_selector: StorageLeaf(account.public_key)
+                }
+            )
+
+            # set initial balance
+            balance_address = pedersen_hash(balances_selector, account.address)
+            initial_balance_uint256 = Uint256.from_felt(account.initial_balance)
+            fee_token_storage_updates[balance_address] = StorageLeaf(initial_balance_uint256.low)
+            fee_token_storage_updates[balance_address + 1] = StorageLeaf(initial_balance_uint256.high)
+
+            contracts.append(StarknetContract(
+                state=starknet.state,
+                abi=abi,
+                contract_address=account.address,
+                deploy_execution_info=None
+            ))
+
+        return contracts
@@ -0,0 +1,68 @@
+"""
+Derivation of the public keys and addresses of the predeployed accounts.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from starkware.crypto.signature.signature import private_to_stark_key
+
+from . import __version__
+from .account import Account
+from .constants import ACCOUNT_KEYS_PARALLEL_THRESHOLD
+
+def derive_keys(private_key: int) -> Tuple[int, int]:
+    """Returns the public key and the address of the account with `private_key`."""
+    public_key = private_to_stark_key(private_key)
+    return public_key, Account.calculate_address(public_key)
+
+def derive_all_keys(private_keys: List[int]) -> List[Tuple[int, int]]:
+    """
+    Returns the public keys and the addresses of the accounts with `private_keys`, in order.
+    If there are at least ACCOUNT_KEYS_PARALLEL_THRESHOLD of them, they are derived in a pool of processes.
+    """
+    if len(private_keys) < ACCOUNT_KEYS_PARALLEL_THRESHOLD:
+        return [derive_keys(private_key) for private_key in private_keys]
+
+    n_workers = os.cpu_count() or 1
+    chunksize = max(1, len(private_keys) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(derive_keys, private_keys, chunksize=chunksize))
+
+class AccountKeysCache:
+    """
+    Stores the derived keys of the accounts generated with a seed in `cache_dir`, one file per seed.
+    Entries are stored by account index, with their private keys, so that a mismatching entry is ignored.
+    """
+
+    def __init__(self, cache_dir: str, seed: int):
+        self.path = os.path.join(cache_dir, f"accounts-{__version__}-{seed}.json")
+
+    def load(self, private_keys: List[int]) -> List[Tuple[int, int]]:
+        """Returns the cached public keys and addresses of the longest prefix of `private_keys`."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+        keys = []
+        for private_key, entry in zip(private_keys, entries):
+            if int(entry["private_key"], 16) != private_key:
+                break
+            keys.append((int(entry["public_key"], 16), int(entry["address"], 16)))
+
+        return keys
+
+    def store(self, private_keys: List[int], keys: List[Tuple[int, int]]):
+        """Stores the public keys and addresses derived from `private_keys`."""
+        entries = [
+            {"private_key": hex(private_key), "public_key": hex(public_key), "address": hex(address)}
+            for private_key, (public_key, address) in zip(private_keys, keys)
+        ]
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(entries, file)
@@ -0,0 +1,35 @@
+"""
+Periodic sealing of the pending block.
+"""
+
+import asyncio
+import threading
+import time
+
+from .state import state
+
+class IntervalBlockProducer:
+    """Seals the pending block every `interval` milliseconds, if it contains any transactions."""
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self.__thread = None
+
+    def start(self):
+        """Starts producing blocks in a daemon thread."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    def __run(self):
+        while True:
+            time.sleep(self.interval / 1000)
+            with state.lock:
+                starknet_wrapper = state.starknet_wrapper
+                if not starknet_wrapper.pending_transactions:
+                    continue
+
+                try:
+                    asyncio.run(starknet_wrapper.create_block())
+                except Exception as error: # pylint: disable=broad-except
+                    print(f"Error: Sealing the pending block failed: {error}")
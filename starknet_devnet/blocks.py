@@ -2,9 +2,10 @@
 Class for generating and handling blocks
 """
 
-from typing import Dict
+from typing import Dict, List
 
-from starkware.starknet.testing.state import StarknetState
+from starkware.starknet.business_logic.state.state import BlockInfo
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
 from starkware.starknet.core.os.block_hash.block_hash import calculate_block_hash
 from starkware.starknet.services.api.feeder_gateway.response_objects import StarknetBlock, BlockStatus
 from starkware.starknet.services.api.feeder_gateway.response_objects import BlockStateUpdate
@@ -34,6 +35,13 @@ class DevnetBlocks():
         """Returns the number of blocks stored so far."""
         return len(self.__num2block) + self.origin.get_number_of_blocks()
 
+    def truncate(self, number_of_blocks: int):
+        """Removes the blocks whose block_number is at least `number_of_blocks`."""
+        for block_number in range(number_of_blocks, self.get_number_of_blocks()):
+            block = self.__num2block.pop(block_number)
+            self.__hash2num.pop(block.block_hash, None)
+            self.__state_updates.pop(block_number, None)
+
     def get_by_number(self, block_number: int) -> StarknetBlock:
         """Returns the block whose block_number is provided"""
         if block_number is None:
@@ -89,17 +97,16 @@ class DevnetBlocks():
         return self.__state_updates.get(self.get_number_of_blocks() - 1) or self.origin.get_state_update()
 
     async def generate(
-        self, transaction: DevnetTransaction, state: StarknetState,
-        state_root: bytes, state_update = None
+        self, transactions: List[DevnetTransaction], block_info: BlockInfo,
+        general_config: StarknetGeneralConfig, state_root: bytes, state_update = None
     ) -> StarknetBlock:
         """
-        Generates a block and stores it to blocks and hash2block. The block contains just the passed transaction.
-        The `tx_wrapper.transaction` dict should contain a key `transaction`.
-        Returns (block_hash, block_number).
+        Generates a block and stores it to blocks and hash2block. The block contains the passed transactions, in order.
+        The hash and the commitment are calculated once per block, regardless of the number of transactions.
+        Returns the generated block.
         """
         block_number = self.get_number_of_blocks()
-        timestamp = state.state.block_info.block_timestamp
-        signature = transaction.get_signature()
+        timestamp = block_info.block_timestamp
 
         if block_number == 0:
             parent_block_hash = 0
@@ -107,33 +114,36 @@ class DevnetBlocks():
             last_block = self.__get_last_block()
             parent_block_hash = last_block.block_hash
 
+        for transaction_index, transaction in enumerate(transactions):
+            transaction.transaction_index = transaction_index
+
         if self.lite:
             block_hash = block_number
         else:
             block_hash = await calculate_block_hash(
-                general_config=state.general_config,
+                general_config=general_config,
                 parent_hash=parent_block_hash,
                 block_number=block_number,
                 global_state_root=state_root,
                 block_timestamp=timestamp,
-                tx_hashes=[transaction.internal_tx.hash_value],
-                tx_signatures=[signature],
+                tx_hashes=[transaction.internal_tx.hash_value for transaction in transactions],
+                tx_signatures=[transaction.get_signature() for transaction in transactions],
                 event_hashes=[],
-                sequencer_address=state.general_config.sequencer_address
+                sequencer_address=general_config.sequencer_address
             )
 
-        transaction_receipts = (transaction.get_execution(),)
+        transaction_receipts = tuple(transaction.get_execution() for transaction in transactions)
 
         block = StarknetBlock.create(
             block_hash=block_hash,
             block_number=block_number,
             state_root=state_root,
-            transactions=[transaction.internal_tx],
+            transactions=[transaction.internal_tx for transaction in transactions],
             timestamp=timestamp,
             transaction_receipts=transaction_receipts,
             status=BlockStatus.ACCEPTED_ON_L2,
-            gas_price=state.state.block_info.gas_price,
-            sequencer_address=state.general_config.sequencer_address,
+            gas_price=block_info.gas_price,
+            sequencer_address=general_config.sequencer_address,
             parent_block_hash=parent_block_hash,
             starknet_version=CAIRO_LANG_VERSION
         )
@@ -2,10 +2,12 @@
 Base routes
 """
 from flask import Blueprint, Response, request, jsonify
+from starknet_devnet import class_hash_cache, compile_hint_source, patched_pedersen_hash
 from starknet_devnet.fee_token import FeeToken
 
 from starknet_devnet.state import state
-from starknet_devnet.util import StarknetDevnetException, check_valid_dump_path
+from starknet_devnet.util import StarknetDevnetException, check_valid_dump_path, lru_cache_stats
+from .shared import changes_state, consistent_reads
 
 base = Blueprint("base", __name__)
 
@@ -47,12 +49,50 @@ def is_alive():
     return "Alive!!!"
 
 @base.route("/restart", methods=["POST"])
+@changes_state()
 async def restart():
     """Restart the starknet_wrapper"""
     await state.reset()
     return Response(status=200)
 
+@base.route("/restart_pool", methods=["GET"])
+def get_restart_pool():
+    """Get the size and the estimated memory use of the pool of states prepared for restarts"""
+    if state.restart_pool is None:
+        raise StarknetDevnetException(
+            message="Restart pool is not enabled; start Devnet with --restart-pool-size.",
+            status_code=400
+        )
+
+    return jsonify(state.restart_pool.get_stats())
+
+@base.route("/mempool", methods=["GET"])
+def get_mempool():
+    """Get the queue depth, the transaction counts and the wait times of the mempool"""
+    if state.mempool is None:
+        raise StarknetDevnetException(message="Mempool is not enabled; start Devnet with --mempool-size.", status_code=400)
+
+    return jsonify(state.mempool.get_metrics())
+
+@base.route("/snapshot", methods=["POST"])
+@changes_state()
+async def snapshot():
+    """Takes a snapshot of the starknet_wrapper"""
+    snapshot_id = await state.starknet_wrapper.snapshot()
+    return jsonify({"snapshot_id": snapshot_id})
+
+@base.route("/revert", methods=["POST"])
+@changes_state()
+async def revert():
+    """Reverts the starknet_wrapper to a snapshot"""
+    request_dict = request.json or {}
+    snapshot_id = extract_positive(request_dict, "snapshot_id")
+
+    await state.starknet_wrapper.revert(snapshot_id)
+    return jsonify({"snapshot_id": snapshot_id})
+
 @base.route("/dump", methods=["POST"])
+@changes_state()
 def dump():
     """Dumps the starknet_wrapper"""
 
@@ -70,6 +110,7 @@ def dump():
     return Response(status=200)
 
 @base.route("/load", methods=["POST"])
+@changes_state()
 def load():
     """Loads the starknet_wrapper"""
 
@@ -82,6 +123,7 @@ def load():
     return Response(status=200)
 
 @base.route("/increase_time", methods=["POST"])
+@changes_state()
 def increase_time():
     """Increases the block timestamp offset"""
     request_dict = request.json or {}
@@ -92,6 +134,7 @@ def increase_time():
     return jsonify({"timestamp_increased_by": time_s})
 
 @base.route("/set_time", methods=["POST"])
+@changes_state()
 def set_time():
     """Sets the block timestamp offset"""
     request_dict = request.json or {}
@@ -101,12 +144,40 @@ def set_time():
 
     return jsonify({"next_block_timestamp": time_s})
 
+@base.route("/create_block", methods=["POST"])
+@changes_state()
+async def create_block():
+    """Seals the pending block, even if it contains no transactions"""
+    block = await state.starknet_wrapper.create_block()
+    return Response(block.dumps(), status=200, mimetype="application/json")
+
+@base.route("/gc", methods=["POST"])
+@changes_state()
+async def collect_garbage():
+    """Removes the state commitment facts unreachable from the current state and the retained blocks"""
+    request_dict = request.json or {}
+    retained_blocks = extract_positive(request_dict, "retained_blocks") if "retained_blocks" in request_dict else 0
+
+    result = await state.starknet_wrapper.collect_garbage(retained_blocks)
+    return jsonify(result)
+
+@base.route("/cache_stats", methods=["GET"])
+def get_cache_stats():
+    """Get the hit and miss counts of the caches"""
+    return jsonify({
+        "pedersen_hash": lru_cache_stats(patched_pedersen_hash),
+        "class_hash": class_hash_cache.get_stats(),
+        "compiled_hints": lru_cache_stats(compile_hint_source),
+        "call_result": state.call_cache.get_stats() if state.call_cache is not None else None,
+    })
+
 @base.route("/account_balance", methods=["GET"])
 async def get_balance():
     """Gets balance for the address"""
 
     address = request.args.get("address", type=lambda x: int(x, 16))
-    balance = await FeeToken.get_balance(address)
+    with consistent_reads():
+        balance = await FeeToken.get_balance(address)
     return jsonify({
         "amount": balance,
         "unit": "wei"
@@ -126,6 +197,7 @@ async def get_fee_token():
     return jsonify({"symbol": symbol, "address": hex(fee_token_address)})
 
 @base.route("/mint", methods=["POST"])
+@changes_state()
 async def mint():
     """Mint token and transfer to the provided address"""
     request_json = request.json or {}
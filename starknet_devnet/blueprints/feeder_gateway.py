@@ -2,14 +2,20 @@
 Feeder gateway routes.
 """
 
+import json
+from itertools import chain
+
 from flask import request, jsonify, Blueprint, Response
 from marshmallow import ValidationError
 from starkware.starknet.services.api.feeder_gateway.response_objects import BlockTransactionTraces
 from starkware.starknet.services.api.gateway.transaction import InvokeFunction
+from starkware.starkware_utils.error_handling import StarkException
 from werkzeug.datastructures import MultiDict
 
+from starknet_devnet.constants import CALL_ROWS_CHUNK_SIZE
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException, custom_int, fixed_length_hex
+from .shared import commit_blocks, consistent_reads, run_call, run_calls, run_read_only, run_read_only_in_parallel, validate_transactions
 
 feeder_gateway = Blueprint("feeder_gateway", __name__, url_prefix="/feeder_gateway")
 
@@ -63,13 +69,100 @@ async def call_contract():
 
     call_specifications = validate_call(request.data)
 
-    result_dict = await state.starknet_wrapper.call(call_specifications)
+    result_dict = await run_call(call_specifications)
 
     return jsonify(result_dict)
 
+@feeder_gateway.route("/call_contracts", methods=["POST"])
+async def call_contracts():
+    """
+    Endpoint for receiving an array of calls, executed in order against the same state.
+    Returns the array of their results; a failed or malformed call is replaced with its error.
+    """
+    try:
+        call_dicts = json.loads(request.data)
+    except json.JSONDecodeError as err:
+        raise StarknetDevnetException(message=f"Invalid JSON: {err}", status_code=400) from err
+
+    if not isinstance(call_dicts, list):
+        raise StarknetDevnetException(message="Expected an array of calls.", status_code=400)
+
+    result_dicts = [None] * len(call_dicts)
+    valid_calls = {}
+    for index, call_dict in enumerate(call_dicts):
+        try:
+            valid_calls[index] = InvokeFunction.load(call_dict)
+        except (TypeError, ValidationError) as err:
+            result_dicts[index] = {"message": f"Invalid Starknet function call: {err}", "status_code": 400}
+
+    call_results = await run_calls(list(valid_calls.values()))
+    for index, result_dict in zip(valid_calls, call_results):
+        result_dicts[index] = result_dict
+
+    return jsonify(result_dicts)
+
+def validate_call_rows(data: bytes):
+    """
+    Ensure `data` is a valid Starknet function call with `calldata_rows` instead of `calldata`.
+    Returns the `InvokeFunction` and the list of calldata rows.
+    """
+    try:
+        call_dict = json.loads(data)
+        calldata_rows = call_dict.pop("calldata_rows")
+        call_specifications = InvokeFunction.load({**call_dict, "calldata": []})
+        calldata_field = InvokeFunction.Schema().fields["calldata"]
+        calldata_rows = [calldata_field.deserialize(calldata) for calldata in calldata_rows]
+    except (json.JSONDecodeError, AttributeError, KeyError, TypeError, ValidationError) as err:
+        raise StarknetDevnetException(message=f"Invalid Starknet function call: {err}", status_code=400) from err
+
+    return call_specifications, calldata_rows
+
+def _dump_line(line: dict) -> str:
+    return json.dumps(line) + "\n"
+
+@feeder_gateway.route("/call_contract_rows", methods=["POST"])
+async def call_contract_rows():
+    """
+    Endpoint for calling a function with many calldata rows.
+    The results are streamed as NDJSON, one line per row; a failed call is replaced with its error.
+    """
+    call_specifications, calldata_rows = validate_call_rows(request.data)
+    chunks = [
+        calldata_rows[index:index + CALL_ROWS_CHUNK_SIZE]
+        for index in range(0, len(calldata_rows), CALL_ROWS_CHUNK_SIZE)
+    ]
+
+    call_pool = state.call_pool
+    if call_pool is None:
+        # all of the chunks are executed before responding, since the state mustn't change in between
+        with consistent_reads():
+            chunk_lines = [await run_read_only("call_rows", call_specifications, chunk) for chunk in chunks]
+        return Response(map(_dump_line, chain.from_iterable(chunk_lines)), mimetype="application/x-ndjson")
+
+    # checked before responding, so that a missing contract is reported with its status code
+    state.starknet_wrapper.contracts.get_by_address(call_specifications.contract_address)
+
+    # all of the chunks are submitted at once, to be executed in parallel against the same copy of the state
+    with consistent_reads():
+        futures = [
+            call_pool.submit(state.starknet_wrapper, "call_rows", call_specifications, chunk) for chunk in chunks
+        ]
+
+    def generate_lines():
+        for chunk, future in zip(chunks, futures):
+            try:
+                lines = call_pool.get_result(future)
+            except StarkException as error:
+                lines = [{"message": error.message, "status_code": error.status_code}] * len(chunk)
+            yield from map(_dump_line, lines)
+
+    # the lines of a chunk are streamed as soon as it's executed
+    return Response(generate_lines(), mimetype="application/x-ndjson")
+
 @feeder_gateway.route("/get_block", methods=["GET"])
-def get_block():
+async def get_block():
     """Endpoint for retrieving a block identified by its hash or number."""
+    await commit_blocks()
 
     block_hash = request.args.get("blockHash")
     block_number = request.args.get("blockNumber", type=custom_int)
@@ -79,8 +172,9 @@ def get_block():
     return Response(block.dumps(), status=200, mimetype="application/json")
 
 @feeder_gateway.route("/get_block_traces", methods=["GET"])
-def get_block_traces():
+async def get_block_traces():
     """Returns the traces of the transactions in the specified block."""
+    await commit_blocks()
 
     block_hash = request.args.get("blockHash")
     block_number = request.args.get("blockNumber", type=custom_int)
@@ -155,30 +249,33 @@ async def get_storage_at():
     return jsonify(storage)
 
 @feeder_gateway.route("/get_transaction_status", methods=["GET"])
-def get_transaction_status():
+async def get_transaction_status():
     """
     Returns the status of the transaction identified by the transactionHash argument in the GET request.
     """
+    await commit_blocks()
 
     transaction_hash = request.args.get("transactionHash")
     transaction_status = state.starknet_wrapper.transactions.get_transaction_status(transaction_hash)
     return jsonify(transaction_status)
 
 @feeder_gateway.route("/get_transaction", methods=["GET"])
-def get_transaction():
+async def get_transaction():
     """
     Returns the transaction identified by the transactionHash argument in the GET request.
     """
+    await commit_blocks()
 
     transaction_hash = request.args.get("transactionHash")
     transaction_info = state.starknet_wrapper.transactions.get_transaction(transaction_hash)
     return Response(response=transaction_info.dumps(), status=200, mimetype="application/json")
 
 @feeder_gateway.route("/get_transaction_receipt", methods=["GET"])
-def get_transaction_receipt():
+async def get_transaction_receipt():
     """
     Returns the transaction receipt identified by the transactionHash argument in the GET request.
     """
+    await commit_blocks()
 
     transaction_hash = request.args.get("transactionHash")
     transaction_receipt = state.starknet_wrapper.transactions.get_transaction_receipt(transaction_hash)
@@ -196,11 +293,12 @@ def get_transaction_trace():
     return Response(response=transaction_trace.dumps(), status=200, mimetype="application/json")
 
 @feeder_gateway.route("/get_state_update", methods=["GET"])
-def get_state_update():
+async def get_state_update():
     """
     Returns the status update from the block identified by the blockHash argument in the GET request.
     If no block hash was provided it will default to the last block.
     """
+    await commit_blocks()
 
     block_hash = request.args.get("blockHash")
     block_number = request.args.get("blockNumber", type=custom_int)
@@ -216,6 +314,34 @@ def get_state_update():
 async def estimate_fee():
     """Returns the estimated fee for a transaction."""
     transaction = validate_call(request.data)
-    fee_response = await state.starknet_wrapper.calculate_actual_fee(transaction)
+    fee_response = await run_read_only("calculate_actual_fee", transaction)
 
     return jsonify(fee_response)
+
+@feeder_gateway.route("/estimate_fee_bulk", methods=["POST"])
+async def estimate_fee_bulk():
+    """
+    Returns the estimated fees for an array of transactions, against the same state.
+    If the `sequential` query parameter is true, each transaction is estimated after applying the preceding ones.
+    A failed estimation is replaced with its error.
+    """
+    transactions = validate_transactions(request.data, loader=InvokeFunction)
+    sequential = request.args.get("sequential", "false").lower() == "true"
+
+    if sequential:
+        fee_responses = await run_read_only("estimate_fee_bulk", transactions, sequential)
+    else:
+        fee_responses = await run_read_only_in_parallel("estimate_fee_bulk", transactions)
+
+    return jsonify(fee_responses)
+
+@feeder_gateway.route("/simulate_transactions", methods=["POST"])
+async def simulate_transactions():
+    """
+    Endpoint for simulating an array of transactions, executed in order without being committed.
+    Returns, per transaction, its result, fee estimation, events and trace; or its error if it was rejected.
+    """
+    transactions = validate_transactions(request.data)
+    simulation_results = await run_read_only("simulate_transactions", transactions)
+
+    return jsonify(simulation_results)
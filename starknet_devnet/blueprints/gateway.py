@@ -1,13 +1,17 @@
 """
 Gateway routes
 """
+from itertools import groupby
+from typing import List
+
 from flask import Blueprint, request, jsonify
 from starkware.starknet.definitions.transaction_type import TransactionType
+from starkware.starknet.services.api.gateway.transaction import Transaction
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
 from starknet_devnet.util import DumpOn, StarknetDevnetException,fixed_length_hex
 from starknet_devnet.state import state
-from .shared import validate_transaction
+from .shared import changes_state, validate_transaction, validate_transactions
 
 gateway = Blueprint("gateway", __name__, url_prefix="/gateway")
 
@@ -16,11 +20,17 @@ def is_alive():
     """Health check endpoint."""
     return "Alive!!!"
 
-@gateway.route("/add_transaction", methods=["POST"])
-async def add_transaction():
-    """Endpoint for accepting DEPLOY and INVOKE_FUNCTION transactions."""
+def get_invoke_response(contract_address: int, transaction_hash: int, result_dict: dict) -> dict:
+    """Returns the response dict of an invoke transaction."""
+    return {
+        "code": StarkErrorCode.TRANSACTION_RECEIVED.name,
+        "address": fixed_length_hex(contract_address),
+        **result_dict,
+        "transaction_hash": hex(transaction_hash),
+    }
 
-    transaction = validate_transaction(request.data)
+async def submit_transaction(transaction: Transaction) -> dict:
+    """Adds `transaction` to the state. Returns the response dict of the transaction."""
     tx_type = transaction.tx_type
 
     response_dict = {
@@ -36,17 +46,122 @@ async def add_transaction():
         response_dict["address"] = fixed_length_hex(contract_address)
 
     elif tx_type == TransactionType.INVOKE_FUNCTION:
-        contract_address, transaction_hash, result_dict = await state.starknet_wrapper.invoke(transaction)
-        response_dict["address"] = fixed_length_hex(contract_address)
-        response_dict.update(result_dict)
+        invoke_result = await state.starknet_wrapper.invoke(transaction)
+        return get_invoke_response(*invoke_result)
 
     else:
         raise StarknetDevnetException(message=f"Invalid tx_type: {tx_type.name}.", status_code=400)
 
     response_dict["transaction_hash"] = hex(transaction_hash)
+    return response_dict
+
+async def submit_transactions(transactions: List[Transaction]) -> List[dict]:
+    """
+    Adds `transactions` to the state, in order. Returns the response dicts of the transactions.
+    Consecutive invokes are executed speculatively in parallel if the speculative executor is enabled.
+    """
+    response_dicts = []
+
+    for tx_type, group in groupby(transactions, key=lambda transaction: transaction.tx_type):
+        group = list(group)
+
+        if tx_type == TransactionType.INVOKE_FUNCTION and state.speculative_executor is not None:
+            invoke_results = await state.starknet_wrapper.invoke_batch(group, state.speculative_executor)
+            response_dicts.extend(get_invoke_response(*invoke_result) for invoke_result in invoke_results)
+        else:
+            response_dicts.extend([await submit_transaction(transaction) for transaction in group])
+
+    return response_dicts
+
+async def receive_transactions(transactions: List[Transaction], single_block=False) -> List[dict]:
+    """
+    Adds `transactions` to the mempool without executing them.
+    Doesn't need the state lock, so it doesn't wait for the sequencer executing the preceding transactions.
+    Returns the response dicts of the transactions, containing the hashes they will have once executed.
+    """
+    response_dicts = []
+    tx_hashes = []
+    internal_txs = []
+
+    for transaction in transactions:
+        identifier, transaction_hash, internal_tx = await state.starknet_wrapper.calculate_hashes(transaction)
+
+        response_dict = {
+            "code": StarkErrorCode.TRANSACTION_RECEIVED.name,
+        }
+        if transaction.tx_type == TransactionType.DECLARE:
+            response_dict["class_hash"] = hex(identifier)
+        else:
+            response_dict["address"] = fixed_length_hex(identifier)
+        response_dict["transaction_hash"] = hex(transaction_hash)
+
+        response_dicts.append(response_dict)
+        tx_hashes.append(transaction_hash)
+        internal_txs.append(internal_tx)
+
+    # marked before queueing, since the sequencer may execute and store the transactions right away
+    for transaction_hash, internal_tx in zip(tx_hashes, internal_txs):
+        state.starknet_wrapper.transactions.receive(transaction_hash, internal_tx)
+    try:
+        state.mempool.add(transactions, tx_hashes, single_block)
+    except StarknetDevnetException:
+        for transaction_hash in tx_hashes:
+            state.starknet_wrapper.transactions.discard_received(transaction_hash)
+        raise
+
+    return response_dicts
 
-    # after tx
+async def execute_transactions(transactions: List[Transaction], single_block=False) -> List[dict]:
+    """Adds `transactions` to the state, in order. Returns the response dicts of the transactions."""
+    if single_block:
+        async with state.starknet_wrapper.single_block():
+            response_dicts = await submit_transactions(transactions)
+    else:
+        response_dicts = await submit_transactions(transactions)
+
+    # after txs
     if state.dumper.dump_on == DumpOn.TRANSACTION:
         state.dumper.dump()
 
-    return jsonify(response_dict)
+    return response_dicts
+
+async def execute_received_transactions(transactions: List[Transaction], tx_hashes: List[int], single_block: bool):
+    """Adds `transactions` taken from the mempool to the state."""
+    try:
+        await execute_transactions(transactions, single_block)
+    finally:
+        # in case the execution failed before a transaction was stored
+        for transaction_hash in tx_hashes:
+            state.starknet_wrapper.transactions.discard_received(transaction_hash)
+
+@gateway.route("/add_transaction", methods=["POST"])
+@changes_state(when=lambda: state.mempool is None)
+async def add_transaction():
+    """Endpoint for accepting DEPLOY and INVOKE_FUNCTION transactions."""
+
+    transaction = validate_transaction(request.data)
+
+    if state.mempool is not None:
+        response_dicts = await receive_transactions([transaction])
+    else:
+        response_dicts = await execute_transactions([transaction])
+
+    return jsonify(response_dicts[0])
+
+@gateway.route("/add_transactions", methods=["POST"])
+@changes_state(when=lambda: state.mempool is None)
+async def add_transactions():
+    """
+    Endpoint for accepting an array of DECLARE, DEPLOY and INVOKE_FUNCTION transactions, executed in order.
+    If the `singleBlock` query parameter is true, the transactions are included in a single block.
+    """
+
+    transactions = validate_transactions(request.data)
+    single_block = request.args.get("singleBlock", "false").lower() == "true"
+
+    if state.mempool is not None:
+        response_dicts = await receive_transactions(transactions, single_block)
+    else:
+        response_dicts = await execute_transactions(transactions, single_block)
+
+    return jsonify(response_dicts)
@@ -7,6 +7,7 @@ import json
 from flask import Blueprint, jsonify, request
 from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
+from .shared import changes_state
 
 postman = Blueprint("postman", __name__, url_prefix="/postman")
 
@@ -21,6 +22,7 @@ def validate_load_messaging_contract(request_dict: dict):
     return network_url
 
 @postman.route("/load_l1_messaging_contract", methods=["POST"])
+@changes_state()
 async def load_l1_messaging_contract():
     """
     Loads a MockStarknetMessaging contract. If one is already deployed in the L1 network specified by the networkUrl argument,
@@ -37,6 +39,7 @@ async def load_l1_messaging_contract():
     return jsonify(result_dict)
 
 @postman.route("/flush", methods=["POST"])
+@changes_state()
 async def flush():
     """
     Handles all pending L1 <> L2 messages and sends them to the other layer
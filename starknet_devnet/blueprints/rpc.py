@@ -10,7 +10,7 @@ import json
 
 from typing import Callable, Union, List, Tuple, Optional, Any
 from typing_extensions import TypedDict
-from flask import Blueprint, request
+from flask import Blueprint, jsonify, request
 from marshmallow.exceptions import MarshmallowError
 
 from starkware.starknet.services.api.contract_class import ContractClass
@@ -37,18 +37,67 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
 
 from starknet_devnet.state import state
 from ..util import StarknetDevnetException
+from .shared import changes_state, commit_blocks, consistent_reads, run_call, run_read_only, run_read_only_in_parallel
 
 rpc = Blueprint("rpc", __name__, url_prefix="/rpc")
 
 PROTOCOL_VERSION = "0.15.0"
 
 
+STATE_CHANGING_METHODS = {"addInvokeTransaction", "addDeclareTransaction", "addDeployTransaction"}
+
+
+def changes_state_of_request() -> bool:
+    """
+    Returns True if the current request, or any request of the current batch, adds a transaction
+    """
+    body = request.get_json(silent=True)
+    bodies = body if isinstance(body, list) else [body]
+    return any(
+        isinstance(body, dict) and str(body.get("method")).replace("starknet_", "") in STATE_CHANGING_METHODS
+        for body in bodies
+    )
+
+
 @rpc.route("", methods=["POST"])
+@changes_state(when=changes_state_of_request)
 async def base_route():
     """
     Base route for RPC calls
+    A batch (an array of requests) is handled in order against the same state, and responded to with an array.
+    """
+    body = request.json
+    if not isinstance(body, list):
+        return await handle_request(body)
+
+    if not body:
+        return rpc_error(message_id=None, code=-32600, message="Invalid Request")
+
+    with consistent_reads():
+        responses = [await handle_batched_request(request_body) for request_body in body]
+
+    return jsonify(responses)
+
+
+async def handle_batched_request(body: dict) -> dict:
     """
-    method, args, message_id = parse_body(request.json)
+    Handles a request of a batch; unlike a single request, a malformed request is reported in the response.
+    """
+    if not isinstance(body, dict) or not {"method", "params", "id"} <= body.keys():
+        return rpc_error(message_id=None, code=-32600, message="Invalid Request")
+
+    try:
+        return await handle_request(body)
+    except RpcError as error:
+        return rpc_error(message_id=body["id"], code=error.code, message=error.message)
+
+
+async def handle_request(body: dict) -> dict:
+    """
+    Handles a single RPC request
+    """
+    method, args, message_id = parse_body(body)
+    await commit_blocks()
 
     try:
         result = await method(*args) if isinstance(args, list) else await method(**args)
@@ -274,22 +323,62 @@ async def call(contract_address: str, entry_point_selector: str, calldata: list,
         raise RpcError(code=20, message="Contract not found")
 
     try:
-        return await state.starknet_wrapper.call(transaction=make_invoke_function(request_body))
+        return await run_call(make_invoke_function(request_body))
     except StarknetDevnetException as ex:
         raise RpcError(code=-1, message=ex.message) from ex
     except StarkException as ex:
-        if f"Entry point {entry_point_selector} not found" in ex.message:
-            raise RpcError(code=21, message="Invalid message selector") from ex
-        if "While handling calldata" in ex.message:
-            raise RpcError(code=22, message="Invalid call data") from ex
-        raise RpcError(code=-1, message=ex.message) from ex
+        raise execution_error(ex.message, entry_point_selector) from ex
 
 
-async def estimate_fee():
+async def estimate_fee(request: dict, block_hash: str = "latest") -> dict:
     """
     Get the estimate fee for the transaction
     """
-    raise NotImplementedError()
+    if block_hash != "latest":
+        raise RpcError(code=-1, message="Fee estimations with block_hash != 'latest' are not supported currently.")
+
+    if not state.starknet_wrapper.contracts.is_deployed(int(request["contract_address"], 16)):
+        raise RpcError(code=20, message="Contract not found")
+
+    try:
+        fee_estimation = await run_read_only("calculate_actual_fee", make_invoke_function(request))
+    except StarknetDevnetException as ex:
+        raise RpcError(code=-1, message=ex.message) from ex
+    except StarkException as ex:
+        raise execution_error(ex.message, request["entry_point_selector"]) from ex
+
+    return rpc_fee_estimate(fee_estimation)
+
+
+async def estimate_fee_bulk(requests: List[dict], block_hash: str = "latest", sequential: bool = False) -> list:
+    """
+    Get the estimate fees for the transactions, against the same state
+    If `sequential`, each transaction is estimated after applying the preceding ones
+    A failed estimation is replaced with its error object
+    """
+    if block_hash != "latest":
+        raise RpcError(code=-1, message="Fee estimations with block_hash != 'latest' are not supported currently.")
+
+    results: list = [None] * len(requests)
+    deployed = {}
+    for index, request_body in enumerate(requests):
+        if state.starknet_wrapper.contracts.is_deployed(int(request_body["contract_address"], 16)):
+            deployed[index] = make_invoke_function(request_body)
+        else:
+            results[index] = {"code": 20, "message": "Contract not found"}
+
+    if sequential:
+        fee_estimations = await run_read_only("estimate_fee_bulk", list(deployed.values()), sequential)
+    else:
+        fee_estimations = await run_read_only_in_parallel("estimate_fee_bulk", list(deployed.values()))
+    for index, fee_estimation in zip(deployed, fee_estimations):
+        if "message" in fee_estimation:
+            error = execution_error(fee_estimation["message"], requests[index]["entry_point_selector"])
+            results[index] = {"code": error.code, "message": error.message}
+        else:
+            results[index] = rpc_fee_estimate(fee_estimation)
+
+    return results
 
 
 async def get_block_number() -> int:
@@ -420,12 +509,23 @@ def make_invoke_function(request_body: dict) -> InvokeFunction:
         contract_address=int(request_body["contract_address"], 16),
         entry_point_selector=int(request_body["entry_point_selector"], 16),
         calldata=[int(data, 16) for data in request_body["calldata"]],
-        max_fee=0,
-        version=0,
-        signature=[],
+        max_fee=int(request_body.get("max_fee", "0x0"), 16),
+        version=int(request_body.get("version", "0x0"), 16),
+        signature=[int(data, 16) for data in request_body.get("signature", [])],
     )
 
 
+def execution_error(message: str, entry_point_selector: str) -> RpcError:
+    """
+    Convert the message of a failed execution of the function at `entry_point_selector` to rpc error
+    """
+    if f"Entry point {entry_point_selector} not found" in message:
+        return RpcError(code=21, message="Invalid message selector")
+    if "While handling calldata" in message:
+        return RpcError(code=22, message="Invalid call data")
+    return RpcError(code=-1, message=message)
+
+
 class EntryPoint(TypedDict):
     """
     TypedDict for rpc contract class entry point
@@ -702,6 +802,27 @@ class RpcDeployTransactionResult(TypedDict):
     contract_address: str
 
 
+class RpcFeeEstimate(TypedDict):
+    """
+    TypedDict for rpc fee estimate
+    """
+    gas_consumed: str
+    gas_price: str
+    overall_fee: str
+
+
+def rpc_fee_estimate(fee_estimation: dict) -> RpcFeeEstimate:
+    """
+    Convert gateway fee estimation to rpc fee estimate
+    """
+    fee_estimate: RpcFeeEstimate = {
+        "gas_consumed": rpc_felt(fee_estimation["gas_usage"]),
+        "gas_price": rpc_felt(fee_estimation["gas_price"]),
+        "overall_fee": rpc_felt(fee_estimation["overall_fee"]),
+    }
+    return fee_estimate
+
+
 def rpc_invoke_transaction(transaction: InvokeSpecificInfo) -> RpcInvokeTransaction:
     """
     Convert gateway invoke transaction to rpc format
@@ -1010,6 +1131,7 @@ def parse_body(body: dict) -> Tuple[Callable, Union[List, dict], int]:
         "getClassHashAt": get_class_hash_at,
         "getClassAt": get_class_at,
         "estimateFee": estimate_fee,
+        "estimateFeeBulk": estimate_fee_bulk,
         "addInvokeTransaction": add_invoke_transaction,
         "addDeclareTransaction": add_declare_transaction,
         "addDeployTransaction": add_deploy_transaction,
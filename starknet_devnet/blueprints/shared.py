@@ -2,10 +2,18 @@
 Shared functions between blueprints
 """
 
+import json
+from contextlib import contextmanager
+from itertools import chain
+from typing import Callable, List, Optional
+
+from flask import g
 from marshmallow import ValidationError
-from starkware.starknet.services.api.gateway.transaction import Transaction
+from starkware.starknet.services.api.gateway.transaction import InvokeFunction, Transaction
 
+from starknet_devnet.call_cache import CallKey
 from starknet_devnet.constants import CAIRO_LANG_VERSION
+from starknet_devnet.state import state
 from starknet_devnet.util import StarknetDevnetException
 
 def validate_transaction(data: bytes, loader: Transaction=Transaction):
@@ -17,3 +25,161 @@ def validate_transaction(data: bytes, loader: Transaction=Transaction):
         raise StarknetDevnetException(message=msg, status_code=400) from err
 
     return transaction
+
+def validate_transactions(data: bytes, loader: Transaction=Transaction) -> List[Transaction]:
+    """Ensure `data` is a JSON array of valid Starknet transactions. Returns the parsed `Transaction`s, in order."""
+    try:
+        tx_dicts = json.loads(data)
+    except json.JSONDecodeError as err:
+        raise StarknetDevnetException(message=f"Invalid JSON: {err}", status_code=400) from err
+
+    if not isinstance(tx_dicts, list):
+        raise StarknetDevnetException(message="Expected an array of transactions.", status_code=400)
+
+    transactions = []
+    for index, tx_dict in enumerate(tx_dicts):
+        try:
+            transactions.append(loader.load(tx_dict))
+        except (TypeError, ValidationError) as err:
+            msg = f"Invalid tx at index {index}: {err}\nBe sure to use the correct compilation (json) artifact. Devnet-compatible cairo-lang version: {CAIRO_LANG_VERSION}"
+            raise StarknetDevnetException(message=msg, status_code=400) from err
+
+    return transactions
+
+def changes_state(when: Callable[[], bool] = None):
+    """
+    Marks the decorated view as changing the state, or as having to see it unchanged throughout, like dumping.
+    Its requests, or only those for which `when` returns True, are handled while holding the state lock (see `server.py`).
+    The requests of the other views only hold the lock while executing against the live state; see `consistent_reads`.
+    """
+    def decorator(view):
+        view.changes_state = when or (lambda: True)
+        return view
+    return decorator
+
+def request_changes_state(view) -> bool:
+    """Returns True if the current request, to be handled by `view`, changes the state."""
+    changes_state_predicate = getattr(view, "changes_state", None)
+    return changes_state_predicate is not None and changes_state_predicate()
+
+async def run_read_only(method_name: str, *args):
+    """
+    Runs the read-only `method_name` of the starknet wrapper,
+    in the call pool if it's enabled, otherwise in-process, holding the state lock.
+    """
+    if state.call_pool is None:
+        with consistent_reads():
+            return await getattr(state.starknet_wrapper, method_name)(*args)
+
+    # the state lock is only needed while submitting, since the workers execute against their own copies of the state
+    state_lock = None if g.get("holds_state_lock", False) else state.lock
+    return await state.call_pool.run(state.starknet_wrapper, state_lock, method_name, *args)
+
+async def run_read_only_in_parallel(method_name: str, items: list, *args) -> list:
+    """
+    Runs the read-only `method_name` of the starknet wrapper, which maps `items` to a list of results, like `run_read_only`.
+    With the call pool, `items` are split into a chunk per worker, executed in parallel against the same copy of the state.
+    """
+    call_pool = state.call_pool
+    if call_pool is None or len(items) <= 1:
+        return await run_read_only(method_name, items, *args)
+
+    chunk_size = -(-len(items) // call_pool.n_workers)
+    with consistent_reads():
+        futures = [
+            call_pool.submit(state.starknet_wrapper, method_name, items[index:index + chunk_size], *args)
+            for index in range(0, len(items), chunk_size)
+        ]
+
+    return list(chain.from_iterable(await call_pool.gather(futures)))
+
+async def commit_blocks():
+    """
+    Commits the blocks sealed in lazy commitment mode, before reading block data; see `StarknetWrapper.commit_blocks`.
+    The committed state is swapped in holding the state lock, so it doesn't race with the sealing of blocks.
+    """
+    state_lock = None if g.get("holds_state_lock", False) else state.lock
+    await state.starknet_wrapper.commit_blocks(state_lock)
+
+@contextmanager
+def consistent_reads():
+    """
+    Within this context, the state lock is held, unless the request holds it already,
+    so the state isn't changed in the meantime and the read-only methods run by `run_read_only` all see the same state.
+    """
+    if g.get("holds_state_lock", False):
+        yield
+        return
+
+    with state.lock:
+        g.holds_state_lock = True
+        try:
+            yield
+        finally:
+            g.holds_state_lock = False
+
+async def _get_call_keys(transactions: List[InvokeFunction]) -> Optional[List[CallKey]]:
+    """Returns the call cache keys of the calls specified with `transactions`; None if they can't be cached."""
+    call_cache = state.call_cache
+    starknet_wrapper = state.starknet_wrapper
+    # the workers of the call pool execute against the state of the last sealed block
+    preserved = state.call_pool is not None
+
+    # the writes are only tracked in sealed blocks
+    if call_cache is None or (not preserved and await starknet_wrapper.has_pending_changes()):
+        return None
+
+    return [call_cache.get_key(transaction) for transaction in transactions]
+
+async def run_call(transaction: InvokeFunction) -> dict:
+    """
+    Runs the call specified with `transaction`, like `run_read_only`.
+    If the call cache is enabled, the cached result is returned as long as
+    none of the contracts accessed by the call has been written to since.
+    """
+    result_dicts = await _run_calls([transaction], raise_errors=True)
+    return result_dicts[0]
+
+async def run_calls(transactions: List[InvokeFunction]) -> List[dict]:
+    """
+    Runs the calls specified with `transactions` against the same state, like `run_call`.
+    Returns, per call, the result dict, or the error dict if the call failed.
+    """
+    return await _run_calls(transactions, raise_errors=False)
+
+async def _run_calls(transactions: List[InvokeFunction], raise_errors: bool) -> List[dict]:
+    """
+    Returns the cached results of the calls specified with `transactions` and runs the rest.
+    If `raise_errors`, the calls are run one by one, and the first error is raised instead of being returned.
+    """
+    call_cache = state.call_cache
+    starknet_wrapper = state.starknet_wrapper
+
+    keys = await _get_call_keys(transactions)
+    if keys is None:
+        result_dicts = [None] * len(transactions)
+    else:
+        result_dicts = [call_cache.get(key, starknet_wrapper.get_write_version) for key in keys]
+
+    missing = [index for index, result_dict in enumerate(result_dicts) if result_dict is None]
+    if not missing:
+        return result_dicts
+
+    state_version = starknet_wrapper.get_state_version()
+    if raise_errors:
+        call_results = [
+            await run_read_only("call_and_get_accessed_addresses", transactions[index]) for index in missing
+        ]
+    else:
+        call_results = await run_read_only_in_parallel("call_all", [transactions[index] for index in missing])
+
+    # the state lock isn't held after the calls, and not while waiting for the call pool, so the state could have changed
+    cache_results = keys is not None and state.starknet_wrapper is starknet_wrapper \
+        and starknet_wrapper.get_state_version() == state_version
+
+    for index, (result_dict, addresses) in zip(missing, call_results):
+        result_dicts[index] = result_dict
+        if cache_results and addresses is not None:
+            call_cache.put(keys[index], result_dict, addresses, starknet_wrapper.get_write_version)
+
+    return result_dicts
@@ -0,0 +1,87 @@
+"""
+Cache of call results, invalidated by the writes to the contracts accessed by the calls.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Tuple
+
+from starkware.starknet.services.api.gateway.transaction import InvokeFunction
+
+CallKey = Tuple
+"""Identifies a call: everything that its result depends on, except the state of the accessed contracts."""
+
+class CallCache:
+    """
+    Stores the results of up to `max_size` calls; the least recently used are evicted first.
+    An entry holds the write versions of the contracts accessed by its call (provided by the starknet wrapper),
+    so it's only used as long as none of those contracts has been written to since the call was executed.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.__entries: "OrderedDict[CallKey, Tuple[dict, Dict[int, int]]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get_key(transaction: InvokeFunction) -> CallKey:
+        """
+        Returns the key of the call specified with `transaction`.
+        The block info isn't a part of the key, since it changes with every block;
+        the results of the calls which may read it aren't cached at all.
+        """
+        return (
+            transaction.contract_address,
+            transaction.entry_point_selector,
+            tuple(transaction.calldata),
+            tuple(transaction.signature or ()),
+            transaction.max_fee,
+            transaction.version,
+        )
+
+    def get(self, key: CallKey, get_write_version: Callable[[int], int]) -> dict:
+        """Returns the cached result of the call identified with `key`; None if there is no valid entry."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, write_versions = entry
+            if any(get_write_version(address) != version for address, version in write_versions.items()):
+                del self.__entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: CallKey, result: dict, addresses: Iterable[int], get_write_version: Callable[[int], int]):
+        """Stores the `result` of the call identified with `key`, which accessed the contracts at `addresses`."""
+        write_versions = {address: get_write_version(address) for address in addresses}
+        with self.__lock:
+            self.__entries[key] = (result, write_versions)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all the entries."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self) -> dict:
+        """Returns the hit, miss and invalidation counts and the size of the cache."""
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self.__entries),
+                "max_size": self.max_size,
+            }
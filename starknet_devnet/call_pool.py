@@ -0,0 +1,109 @@
+"""
+Execution of read-only requests in a pool of processes forked from the state of the last sealed block.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from starkware.starkware_utils.error_handling import StarkException
+
+from .starknet_wrapper import StarknetWrapper
+
+_snapshot_wrapper: StarknetWrapper = None
+"""The wrapper inherited by the forked workers."""
+
+def _initialize_worker():
+    asyncio.run(_snapshot_wrapper.use_preserved_state())
+
+def _run_in_worker(method_name: str, args: tuple) -> Tuple[object, tuple]:
+    """
+    Runs the read-only `method_name` of the inherited wrapper. Returns the result and the error, one of which is None.
+    The error is returned as (class, attributes), since StarkException instances can't be reliably pickled.
+    """
+    try:
+        return asyncio.run(getattr(_snapshot_wrapper, method_name)(*args)), None
+    except StarkException as error:
+        return None, (type(error), vars(error))
+
+class CallPool:
+    """
+    Runs read-only methods of the starknet wrapper (calls and fee estimations) in `n_workers` processes.
+    The workers are forked whenever the state of the last sealed block has changed since the previous request,
+    so each of them executes against its own immutable copy of that state.
+    The server handles one request at a time, so the workers only run in parallel the methods submitted together,
+    like the chunks of a batch read.
+    """
+
+    def __init__(self, n_workers: int):
+        self.n_workers = n_workers
+        self.__pool: ProcessPoolExecutor = None
+        self.__pool_version = None
+        self.__lock = threading.Lock()
+
+    def __get_pool(self, starknet_wrapper: StarknetWrapper) -> ProcessPoolExecutor:
+        # pylint: disable=global-statement
+        global _snapshot_wrapper
+
+        version = (id(starknet_wrapper), starknet_wrapper.get_state_version())
+        if version != self.__pool_version:
+            if self.__pool is not None:
+                # the submitted requests are still completed by the previous workers
+                self.__pool.shutdown(wait=False)
+
+            _snapshot_wrapper = starknet_wrapper
+            self.__pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_initialize_worker
+            )
+            self.__pool_version = version
+
+        return self.__pool
+
+    def submit(self, starknet_wrapper: StarknetWrapper, method_name: str, *args) -> Future:
+        """
+        Submits the read-only `method_name` of `starknet_wrapper` to the workers.
+        Should be called while no changes are being made to `starknet_wrapper`.
+        """
+        with self.__lock:
+            return self.__get_pool(starknet_wrapper).submit(_run_in_worker, method_name, args)
+
+    async def run(
+        self, starknet_wrapper: StarknetWrapper, state_lock: Optional[threading.Lock], method_name: str, *args
+    ):
+        """
+        Runs the read-only `method_name` of `starknet_wrapper` in a worker and returns its result.
+        `state_lock` is held while submitting, so that the workers aren't forked from a state being changed;
+        if it's None, the caller holds it, and keeps the state unchanged until the result is returned.
+        """
+        if state_lock is None:
+            future = self.submit(starknet_wrapper, method_name, *args)
+        else:
+            with state_lock:
+                future = self.submit(starknet_wrapper, method_name, *args)
+
+        return self.__unwrap(await asyncio.wrap_future(future))
+
+    def get_result(self, future: Future):
+        """Waits for the result of the method submitted with `submit` and returns it, or raises its error."""
+        return self.__unwrap(future.result())
+
+    async def gather(self, futures: List[Future]) -> list:
+        """Waits for the methods submitted with `submit` and returns their results, in order, or raises the first error."""
+        results_and_errors = await asyncio.gather(*map(asyncio.wrap_future, futures))
+        return [self.__unwrap(result_and_error) for result_and_error in results_and_errors]
+
+    @staticmethod
+    def __unwrap(result_and_error: Tuple[object, tuple]):
+        result, error = result_and_error
+
+        if error is not None:
+            error_class, error_attributes = error
+            raised_error = error_class(code=error_attributes.get("code"), message=error_attributes.get("message"))
+            vars(raised_error).update(error_attributes)
+            raise raised_error
+
+        return result
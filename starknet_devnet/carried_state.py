@@ -0,0 +1,271 @@
+"""
+Classes and functions for tracking the changes of the carried state
+and for preserving the carried state between blocks.
+"""
+
+from copy import copy, deepcopy
+from typing import Dict, List, Set
+
+from starkware.starknet.business_logic.internal_transaction import (
+    CallInfo,
+    InternalDeclare,
+    InternalDeploy,
+    InternalTransaction,
+)
+from starkware.starknet.business_logic.state.objects import ContractCarriedState
+from starkware.starknet.business_logic.state.state import CarriedState
+from starkware.starknet.testing.state import StarknetState
+
+from .util import to_bytes
+
+JOURNAL_CONTRACT = "contract"
+JOURNAL_STORAGE = "storage"
+JOURNAL_CLASS = "class"
+
+class StateChanges:
+    """
+    Contract addresses, storage keys and class hashes touched by the executed transactions.
+    Read entries are included as well; unchanged entries are filtered out by the consumers.
+    """
+
+    def __init__(self):
+        self.addresses: Set[int] = set()
+        self.storage_keys: Dict[int, Set[int]] = {}
+        self.class_hashes: Set[bytes] = set()
+
+    def add_storage_keys(self, address: int, keys):
+        """Marks `keys` of the contract at `address` as touched."""
+        self.addresses.add(address)
+        self.storage_keys.setdefault(address, set()).update(keys)
+
+    def add_call_info(self, call_info: CallInfo):
+        """Marks the entries accessed in `call_info` and its internal calls as touched."""
+        self.add_storage_keys(call_info.contract_address, call_info.accessed_storage_keys)
+
+        if call_info.class_hash is not None:
+            self.class_hashes.add(to_bytes(call_info.class_hash))
+
+        for internal_call in call_info.internal_calls:
+            self.add_call_info(internal_call)
+
+    def add_execution_info(self, execution_info):
+        """Marks the entries accessed during the execution described by `execution_info` as touched."""
+        for call_info in (execution_info.call_info, getattr(execution_info, "fee_transfer_info", None)):
+            if call_info is not None:
+                self.add_call_info(call_info)
+
+    def add_transaction(self, internal_tx: InternalTransaction):
+        """Marks the contract and the class introduced by `internal_tx` as touched."""
+        if isinstance(internal_tx, InternalDeploy):
+            self.addresses.add(internal_tx.contract_address)
+
+        if isinstance(internal_tx, (InternalDeclare, InternalDeploy)):
+            self.class_hashes.add(to_bytes(internal_tx.class_hash))
+
+    def update(self, other: "StateChanges"):
+        """Marks the entries marked in `other` as touched."""
+        self.addresses.update(other.addresses)
+        for address, keys in other.storage_keys.items():
+            self.add_storage_keys(address, keys)
+        self.class_hashes.update(other.class_hashes)
+
+    def is_empty(self) -> bool:
+        """Returns True if no entry is marked as touched."""
+        return not (self.addresses or self.class_hashes)
+
+    def consume(self) -> "StateChanges":
+        """Returns the changes gathered so far and starts gathering anew."""
+        changes = StateChanges()
+        changes.addresses, self.addresses = self.addresses, set()
+        changes.storage_keys, self.storage_keys = self.storage_keys, {}
+        changes.class_hashes, self.class_hashes = self.class_hashes, set()
+        return changes
+
+class DevnetStarknetState(StarknetState):
+    """
+    StarknetState which records the entries touched by the transactions it executes.
+    All of the transactions are executed by `declare`, `deploy` and `invoke_raw` (L1 handlers included),
+    each of which applies its transaction atomically, so a failed transaction leaves nothing to record.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.changes = StateChanges()
+
+    async def declare(self, *args, **kwargs):
+        tx_execution_info = await super().declare(*args, **kwargs)
+        # the call info of a declare is attributed to its sender, which isn't a contract
+        self.changes.class_hashes.add(to_bytes(tx_execution_info.call_info.class_hash))
+        return tx_execution_info
+
+    async def deploy(self, *args, **kwargs):
+        contract_address, tx_execution_info = await super().deploy(*args, **kwargs)
+        self.changes.addresses.add(contract_address)
+        self.changes.add_execution_info(tx_execution_info)
+        return contract_address, tx_execution_info
+
+    async def invoke_raw(self, *args, **kwargs):
+        tx_execution_info = await super().invoke_raw(*args, **kwargs)
+        self.changes.add_execution_info(tx_execution_info)
+        return tx_execution_info
+
+def copy_carried_state(state: CarriedState) -> CarriedState:
+    """
+    Returns a deep copy of `state`.
+    The facts storage and the shared state are immutable from the perspective of the carried state, so they are shared.
+    """
+    memo = {
+        id(state.ffc): state.ffc,
+        id(state.shared_state): state.shared_state,
+    }
+    return deepcopy(state, memo)
+
+def snapshot_carried_state(state: CarriedState, changes: StateChanges) -> CarriedState:
+    """
+    Returns a copy of `state` containing only the contracts and classes marked in `changes`.
+    Unlike `state`, the snapshot isn't affected by the subsequent transactions.
+    """
+    snapshot = copy(state)
+    snapshot.contract_states = {
+        address: ContractCarriedState(
+            state=state.contract_states[address].state,
+            storage_updates=dict(state.contract_states[address].storage_updates)
+        )
+        for address in changes.addresses
+        if address in state.contract_states
+    }
+    snapshot.contract_definitions = {
+        class_hash: state.contract_definitions[class_hash]
+        for class_hash in changes.class_hashes
+        if class_hash in state.contract_definitions
+    }
+    return snapshot
+
+def get_written_addresses(previous_state: CarriedState, current_state: CarriedState, changes: StateChanges) -> Set[int]:
+    """
+    Returns the addresses of the contracts marked in `changes` whose state or storage differs
+    between `previous_state` and `current_state`; the contracts which were only read are left out.
+    """
+    written = set()
+    for address in changes.addresses:
+        current_contract_state = current_state.contract_states.get(address)
+        previous_contract_state = previous_state.contract_states.get(address)
+
+        if current_contract_state is None or previous_contract_state is None:
+            if current_contract_state is not previous_contract_state:
+                written.add(address)
+            continue
+
+        if previous_contract_state.state is not current_contract_state.state or any(
+            previous_contract_state.storage_updates.get(key) is not current_contract_state.storage_updates.get(key)
+            for key in changes.storage_keys.get(address, ())
+        ):
+            written.add(address)
+
+    return written
+
+def update_carried_state(
+    previous_state: CarriedState, current_state: CarriedState, changes: StateChanges, journal: List[tuple] = None
+):
+    """
+    Brings `previous_state` up to date with `current_state`.
+    Only the entries marked in `changes` are visited, so the cost doesn't depend on the size of the state.
+    If `journal` is provided, the overwritten entries of `previous_state` are appended to it,
+    so that they can be restored with `revert_carried_state`.
+    """
+    def record(*entry):
+        if journal is not None:
+            journal.append(entry)
+
+    for address in changes.addresses:
+        current_contract_state = current_state.contract_states.get(address)
+        previous_contract_state = previous_state.contract_states.get(address)
+
+        if current_contract_state is None:
+            if previous_contract_state is not None:
+                record(JOURNAL_CONTRACT, address, previous_contract_state)
+                del previous_state.contract_states[address]
+            continue
+
+        if previous_contract_state is None:
+            record(JOURNAL_CONTRACT, address, None)
+            previous_state.contract_states[address] = ContractCarriedState(
+                state=current_contract_state.state,
+                storage_updates=dict(current_contract_state.storage_updates)
+            )
+            continue
+
+        storage_updates = previous_contract_state.storage_updates
+        current_storage_updates = current_contract_state.storage_updates
+
+        for key in changes.storage_keys.get(address, ()):
+            previous_leaf = storage_updates.get(key)
+            current_leaf = current_storage_updates.get(key)
+            if previous_leaf is current_leaf:
+                continue
+
+            record(JOURNAL_STORAGE, address, key, previous_leaf)
+            if current_leaf is None:
+                del storage_updates[key]
+            else:
+                storage_updates[key] = current_leaf
+
+        if previous_contract_state.state is not current_contract_state.state:
+            record(JOURNAL_CONTRACT, address, previous_contract_state)
+            previous_state.contract_states[address] = ContractCarriedState(
+                state=current_contract_state.state,
+                storage_updates=storage_updates
+            )
+
+    for class_hash in changes.class_hashes:
+        previous_definition = previous_state.contract_definitions.get(class_hash)
+        current_definition = current_state.contract_definitions.get(class_hash)
+        if previous_definition is current_definition:
+            continue
+
+        record(JOURNAL_CLASS, class_hash, previous_definition)
+        if current_definition is None:
+            del previous_state.contract_definitions[class_hash]
+        else:
+            previous_state.contract_definitions[class_hash] = current_definition
+
+    previous_state.block_info = current_state.block_info
+    previous_state.shared_state = current_state.shared_state
+
+def revert_carried_state(state: CarriedState, journal: List[tuple], journal_length: int) -> StateChanges:
+    """
+    Undoes the updates of `state` recorded in `journal` after its first `journal_length` entries, and removes them.
+    The cost depends only on the number of undone entries.
+    Returns the changes marking the restored entries.
+    """
+    changes = StateChanges()
+
+    while len(journal) > journal_length:
+        kind, *entry = journal.pop()
+
+        if kind == JOURNAL_CONTRACT:
+            address, contract_state = entry
+            changes.addresses.add(address)
+            if contract_state is None:
+                del state.contract_states[address]
+            else:
+                state.contract_states[address] = contract_state
+
+        elif kind == JOURNAL_STORAGE:
+            address, key, leaf = entry
+            changes.add_storage_keys(address, (key,))
+            storage_updates = state.contract_states[address].storage_updates
+            if leaf is None:
+                del storage_updates[key]
+            else:
+                storage_updates[key] = leaf
+
+        else:
+            class_hash, definition = entry
+            changes.class_hashes.add(class_hash)
+            if definition is None:
+                del state.contract_definitions[class_hash]
+            else:
+                state.contract_definitions[class_hash] = definition
+
+    return changes
@@ -0,0 +1,86 @@
+"""
+Cache of class hashes, keyed by the digest of the contract class, optionally stored in a file.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Tuple
+
+from starkware.starknet.core.os.class_hash import compute_class_hash
+from starkware.starknet.services.api.contract_class import ContractClass
+
+from .constants import CAIRO_LANG_VERSION
+
+class ClassHashCache:
+    """
+    Maps the sha256 digest of the sorted JSON dump of a contract class to its class hash,
+    so that redeclaring and redeploying the same class doesn't hash its whole program again.
+    Only the hashes calculated with one of `hash_functions` (implementations of the Pedersen hash) are cached.
+    If a cache directory is set, the entries are loaded from and stored to a file in it.
+    """
+
+    def __init__(self, hash_functions: Tuple[Callable[[int, int], int], ...]):
+        self.hash_functions = hash_functions
+        self.hits = 0
+        self.misses = 0
+        self.path: str = None
+        self.__class_hashes: Dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def set_cache_dir(self, cache_dir: str):
+        """Loads the entries stored in `cache_dir` and stores the calculated class hashes there from now on."""
+        self.path = os.path.join(cache_dir, f"class-hashes-{CAIRO_LANG_VERSION}.json")
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        with self.__lock:
+            for digest, class_hash in entries.items():
+                self.__class_hashes.setdefault(digest, int(class_hash, 16))
+
+    def compute_class_hash(self, contract_class: ContractClass, hash_func: Callable[[int, int], int] = None) -> int:
+        """Drop-in replacement of cairo-lang's `compute_class_hash`, returning the cached class hash if present."""
+        if hash_func is None:
+            hash_func = self.hash_functions[0]
+        if hash_func not in self.hash_functions:
+            return compute_class_hash(contract_class=contract_class, hash_func=hash_func)
+
+        digest = hashlib.sha256(contract_class.dumps(sort_keys=True).encode()).hexdigest()
+        with self.__lock:
+            class_hash = self.__class_hashes.get(digest)
+            if class_hash is not None:
+                self.hits += 1
+                return class_hash
+            self.misses += 1
+
+        class_hash = compute_class_hash(contract_class=contract_class, hash_func=hash_func)
+        with self.__lock:
+            self.__class_hashes[digest] = class_hash
+            if self.path is not None:
+                self.__store()
+
+        return class_hash
+
+    def __store(self):
+        entries = {digest: hex(class_hash) for digest, class_hash in self.__class_hashes.items()}
+
+        # written to a temporary file first, so that concurrently running devnets never read a partial file
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(entries, file)
+        os.replace(tmp_path, self.path)
+
+    def get_stats(self) -> dict:
+        """Returns the hit and miss counts and the size of the cache."""
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.__class_hashes),
+                "max_size": None,
+            }
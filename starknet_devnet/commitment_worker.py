@@ -0,0 +1,43 @@
+"""
+Background calculation of the state commitment of the sealed blocks.
+"""
+
+import asyncio
+import threading
+import traceback
+
+from .state import state
+
+WRAPPER_CHECK_INTERVAL = 1
+"""Seconds after which the worker stops waiting for the sealing of a block, in case the wrapper has been replaced."""
+
+class CommitmentWorker:
+    """
+    Commits the blocks sealed in lazy commitment mode as soon as they are sealed, in order.
+    The next transactions are executed while the previous blocks are being committed.
+    """
+
+    def __init__(self):
+        self.__thread = None
+
+    def start(self):
+        """Starts committing blocks in a daemon thread."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    @staticmethod
+    def __run():
+        while True:
+            # the wrapper is replaced on restart and load, so the event of the current one is waited for with a timeout
+            starknet_wrapper = state.starknet_wrapper
+            if not starknet_wrapper.block_sealed.wait(timeout=WRAPPER_CHECK_INTERVAL):
+                continue
+            starknet_wrapper.block_sealed.clear()
+
+            # a failed block stays uncommitted, so the error is raised again to the request which next reads block data
+            try:
+                asyncio.run(starknet_wrapper.commit_blocks(state.lock))
+            except Exception: # pylint: disable=broad-except
+                print("Error: Committing the sealed blocks failed; retrying on the next read of block data.")
+                traceback.print_exc()
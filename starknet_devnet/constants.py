@@ -17,3 +17,9 @@ DEFAULT_PORT = 5050
 DEFAULT_ACCOUNTS = 10
 DEFAULT_INITIAL_BALANCE = 10 ** 21
 DEFAULT_GAS_PRICE = 10 ** 11
+
+PEDERSEN_HASH_CACHE_SIZE = 2 ** 18
+COMPILED_HINT_CACHE_SIZE = 2 ** 14
+DEFAULT_HASH_BATCH_THRESHOLD = 256
+ACCOUNT_KEYS_PARALLEL_THRESHOLD = 64
+CALL_ROWS_CHUNK_SIZE = 256
@@ -2,26 +2,29 @@
 Contains code for wrapping StarknetContract instances.
 """
 
-from typing import List
+import dataclasses
+from typing import Iterable, List, Optional, Tuple
 
-from starkware.starknet.services.api.contract_class import ContractClass
+from starkware.starknet.business_logic.execution.execute_entry_point import ExecuteEntryPoint
+from starkware.starknet.business_logic.execution.objects import CallType, TransactionExecutionContext
+from starkware.starknet.business_logic.utils import preprocess_invoke_function_fields
+from starkware.starknet.core.os.transaction_hash.transaction_hash import calculate_transaction_hash_common
+from starkware.starknet.definitions import constants
+from starkware.starknet.services.api.contract_class import ContractClass, EntryPointType
 from starkware.starknet.testing.contract import StarknetContract
 from starkware.starknet.utils.api_utils import cast_to_felts
+from starkware.starkware_utils.error_handling import StarkException
 
 class ContractWrapper:
     """
-    Wraps a StarknetContract, storing its types and code for later use.
+    Wraps a StarknetContract, storing its class for later use.
+    Once stored in DevnetContracts, the class is replaced with the instance shared by all contracts of the same class.
     """
     def __init__(self, contract: StarknetContract, contract_class: ContractClass, deployment_tx_hash: int = None):
         self.contract: StarknetContract = contract
-        self.contract_class = contract_class.remove_debug_info()
+        self.contract_class = contract_class
         self.deployment_tx_hash = deployment_tx_hash
 
-        self.code: dict = {
-            "abi": contract_class.abi,
-            "bytecode": self.contract_class.dump()["program"]["data"]
-        }
-
     # pylint: disable=too-many-arguments
     async def call(
         self,
@@ -33,6 +36,7 @@ class ContractWrapper:
     ):
         """
         Calls the function identified with `entry_point_selector`, potentially passing in `calldata` and `signature`.
+        Returns the result and the call info.
         """
 
         call_info, _ = await self.contract.state.call_raw(
@@ -46,7 +50,89 @@ class ContractWrapper:
 
         result = list(map(hex, call_info.retdata))
 
-        return result
+        return result, call_info
+
+    # pylint: disable=too-many-arguments
+    async def call_rows(
+        self,
+        entry_point_selector: int,
+        calldata_rows: Iterable[List[int]],
+        signature: List[int],
+        caller_address: int,
+        max_fee: int
+    ) -> List[Tuple[Optional[List[str]], Optional[StarkException]]]:
+        """
+        Calls the function identified with `entry_point_selector` once per row of `calldata_rows`.
+        Every call is executed in its own child of the same child of the current state, so the rows don't affect each other.
+        The contract class and the entry point are resolved once for all the rows.
+        Returns, per row, the result, or the error the call failed with.
+        """
+        starknet_state = self.contract.state
+        general_config = starknet_state.general_config
+        query_state = starknet_state.state.create_child_state_for_querying()
+        signature = cast_to_felts(values=signature) if signature else []
+        calldata_rows = list(calldata_rows)
+
+        template_call = ExecuteEntryPoint(
+            call_type=CallType.CALL,
+            class_hash=None,
+            contract_address=self.contract.contract_address,
+            code_address=None,
+            entry_point_selector=entry_point_selector,
+            entry_point_type=EntryPointType.EXTERNAL,
+            calldata=[],
+            caller_address=caller_address
+        )
+        # pylint: disable=protected-access
+        try:
+            contract_class = query_state.get_contract_class(class_hash=template_call._get_class_hash(state=query_state))
+            template_call._get_selected_entry_point(contract_class=contract_class, state=query_state)
+        except StarkException as error:
+            return [(None, error)] * len(calldata_rows)
+
+        # the fields of the query transactions which only depend on the call, as in StarknetState.call_raw
+        tx_hash_prefix, additional_data = preprocess_invoke_function_fields(
+            entry_point_type=EntryPointType.EXTERNAL,
+            entry_point_selector=entry_point_selector,
+            message_from_l1_nonce=None,
+            max_fee=max_fee,
+            version=constants.QUERY_VERSION,
+            only_query=True
+        )
+
+        results = []
+        for calldata in calldata_rows:
+            tx_hash = calculate_transaction_hash_common(
+                tx_hash_prefix=tx_hash_prefix,
+                version=constants.QUERY_VERSION,
+                contract_address=self.contract.contract_address,
+                entry_point_selector=entry_point_selector,
+                calldata=calldata,
+                max_fee=max_fee,
+                chain_id=general_config.chain_id.value,
+                additional_data=additional_data
+            )
+            tx_execution_context = TransactionExecutionContext.create(
+                account_contract_address=self.contract.contract_address,
+                transaction_hash=tx_hash,
+                signature=signature,
+                max_fee=max_fee,
+                n_steps=general_config.invoke_tx_max_n_steps,
+                version=constants.QUERY_VERSION
+            )
+
+            try:
+                call_info = await dataclasses.replace(template_call, calldata=calldata).execute(
+                    state=query_state.create_child_state_for_querying(),
+                    general_config=general_config,
+                    tx_execution_context=tx_execution_context
+                )
+            except StarkException as error:
+                results.append((None, error))
+            else:
+                results.append((list(map(hex, call_info.retdata)), None))
+
+        return results
 
     async def invoke(
         self,
@@ -2,7 +2,7 @@
 Class for storing and handling contracts
 """
 
-from typing import Dict
+from typing import Dict, Tuple
 
 from starkware.starknet.services.api.contract_class import ContractClass
 
@@ -13,15 +13,21 @@ from .util import (
 )
 from .contract_wrapper import ContractWrapper
 
+BLOCK_INFO_SYSCALLS = ("syscall_handler.get_block_number", "syscall_handler.get_block_timestamp")
+"""The beginnings of the hints of the system calls reading the block info."""
+
 class DevnetContracts:
     """
     This class is used to store the deployed contracts of the devnet.
+    Classes are stored once per class hash and shared by all the contracts of the same class.
     """
 
     def __init__(self, origin: Origin):
         self.origin = origin
         self.__instances: Dict[int, ContractWrapper] = {}
         self.__classes: Dict[int, ContractClass] = {}
+        self.__codes: Dict[int, dict] = {}
+        self.__block_info_readers: Dict[int, bool] = {}
 
     def store(self, address: int, contract_wrapper: ContractWrapper) -> None:
         """
@@ -30,11 +36,36 @@ class DevnetContracts:
         self.__instances[address] = contract_wrapper
 
         class_hash = self.get_class_hash_at(address)
-        self.__classes[class_hash] = contract_wrapper.contract_class
+        contract_wrapper.contract_class = self.__intern_class(class_hash, contract_wrapper.contract_class)
 
     def store_class(self, class_hash: int, contract_class: ContractClass) -> None:
         """Store contract class."""
-        self.__classes[class_hash] = contract_class.remove_debug_info()
+        self.__intern_class(class_hash, contract_class)
+
+    def __intern_class(self, class_hash: int, contract_class: ContractClass) -> ContractClass:
+        """Returns the stored class with `class_hash`; if there is none, stores `contract_class` first."""
+        if class_hash not in self.__classes:
+            self.__classes[class_hash] = contract_class.remove_debug_info()
+
+        return self.__classes[class_hash]
+
+    def get_revision(self) -> Tuple[int, int]:
+        """
+        Get the numbers of the stored contracts and classes, to be passed to `revert`.
+        """
+        return len(self.__instances), len(self.__classes)
+
+    def revert(self, revision: Tuple[int, int]) -> None:
+        """
+        Remove the contracts and classes stored after `revision` was obtained.
+        """
+        n_instances, n_classes = revision
+        while len(self.__instances) > n_instances:
+            self.__instances.popitem()
+        while len(self.__classes) > n_classes:
+            class_hash, _ = self.__classes.popitem()
+            self.__codes.pop(class_hash, None)
+            self.__block_info_readers.pop(class_hash, None)
 
     def is_deployed(self, address: int) -> bool:
         """
@@ -59,7 +90,15 @@ class DevnetContracts:
         if not self.is_deployed(address):
             return self.origin.get_code(address)
 
-        return self.__instances[address].code
+        class_hash = self.get_class_hash_at(address)
+        if class_hash not in self.__codes:
+            contract_class = self.__classes[class_hash]
+            self.__codes[class_hash] = {
+                "abi": contract_class.abi,
+                "bytecode": contract_class.dump()["program"]["data"]
+            }
+
+        return self.__codes[class_hash]
 
     def get_full_contract(self, address: int) -> ContractClass:
         """
@@ -75,6 +114,22 @@ class DevnetContracts:
 
         return self.__classes[class_hash]
 
+    def reads_block_info(self, class_hash: int) -> bool:
+        """
+        Check if the class with `class_hash` may read the block number or timestamp,
+        i.e. if its program contains either of the system calls. True if the class isn't stored.
+        """
+        if class_hash not in self.__classes:
+            return True
+
+        if class_hash not in self.__block_info_readers:
+            hints = self.__classes[class_hash].program.hints
+            self.__block_info_readers[class_hash] = any(
+                hint.code.startswith(BLOCK_INFO_SYSCALLS) for pc_hints in hints.values() for hint in pc_hints
+            )
+
+        return self.__block_info_readers[class_hash]
+
     def get_class_hash_at(self, address: int) -> int:
         """Gets the class hash at the provided address."""
         if not self.is_deployed(address):
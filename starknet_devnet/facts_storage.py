@@ -0,0 +1,145 @@
+"""
+In-memory storage of the facts of the state commitment.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from starkware.starknet.business_logic.state.objects import ContractState
+from starkware.starknet.storage.starknet_storage import StorageLeaf
+from starkware.storage.storage import Storage
+
+PATRICIA_NODE_PREFIX = b"patricia_node"
+BINARY_NODE_LENGTH = 64
+EDGE_NODE_LENGTH = 65
+EMPTY_NODE_HASH = bytes(32)
+
+class DevnetFactsStorage(Storage):
+    """
+    Dict-based facts storage, storing the prefix of a key as a single byte.
+    Patricia tree nodes and leaves unreachable from the roots in use can be removed with `collect_garbage`.
+    """
+
+    def __init__(self, db: Dict[bytes, bytes] = None):
+        self.db: Dict[bytes, bytes] = {}
+        self.__prefix_ids: Dict[bytes, bytes] = {}
+
+        for key, value in (db or {}).items():
+            self.db[self.__compact_key(key)] = value
+
+    def __compact_key(self, key: bytes) -> bytes:
+        prefix, separator, suffix = key.partition(b":")
+        if not separator:
+            return bytes(1) + key
+
+        prefix_id = self.__prefix_ids.get(prefix)
+        if prefix_id is None:
+            assert len(self.__prefix_ids) < 255, "Too many distinct key prefixes"
+            prefix_id = self.__prefix_ids[prefix] = bytes([len(self.__prefix_ids) + 1])
+
+        return prefix_id + suffix
+
+    def __fact_key(self, prefix: bytes, fact_hash: bytes) -> bytes:
+        return self.__compact_key(prefix + b":" + fact_hash)
+
+    async def set_value(self, key: bytes, value: bytes):
+        self.db[self.__compact_key(key)] = value
+
+    async def setnx_value(self, key: bytes, value: bytes) -> bool:
+        return self.db.setdefault(self.__compact_key(key), value) is value
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        return self.db.get(self.__compact_key(key))
+
+    async def del_value(self, key: bytes):
+        self.db.pop(self.__compact_key(key), None)
+
+    async def mset(self, updates: Dict[bytes, bytes]):
+        for key, value in updates.items():
+            self.db[self.__compact_key(key)] = value
+
+    async def mget(self, keys: Iterable[bytes]) -> Tuple[Optional[bytes], ...]:
+        return tuple(self.db.get(self.__compact_key(key)) for key in keys)
+
+    def __mark_tree(self, root: bytes, height: int, leaf_prefix: bytes, marked: Set[bytes]) -> List[bytes]:
+        """Marks the nodes and the leaves of the tree with `root`. Returns the hashes of the leaves."""
+        leaves = []
+        stack = [(root, height)]
+
+        while stack:
+            node_hash, node_height = stack.pop()
+            if node_hash == EMPTY_NODE_HASH:
+                continue
+
+            if node_height == 0:
+                key = self.__fact_key(leaf_prefix, node_hash)
+                if key not in marked:
+                    marked.add(key)
+                    leaves.append(node_hash)
+                continue
+
+            key = self.__fact_key(PATRICIA_NODE_PREFIX, node_hash)
+            if key in marked:
+                continue
+            marked.add(key)
+
+            node = self.db[key]
+            if len(node) == BINARY_NODE_LENGTH:
+                stack.append((node[:32], node_height - 1))
+                stack.append((node[32:], node_height - 1))
+            else:
+                assert len(node) == EDGE_NODE_LENGTH, f"Unknown Patricia node of length {len(node)}"
+                stack.append((node[:32], node_height - node[64]))
+
+        return leaves
+
+    def collect_garbage(self, global_trees: Iterable[Tuple[bytes, int]], storage_trees: Iterable[Tuple[bytes, int]]) -> int:
+        """
+        Removes the Patricia tree nodes and leaves which are not reachable from
+        the (root, height) pairs of the global state trees and of the contract storage trees.
+        Other facts, e.g. contract classes, are kept. Returns the number of removed facts.
+        """
+        marked: Set[bytes] = set()
+        storage_trees = list(storage_trees)
+
+        for root, height in global_trees:
+            for leaf_hash in self.__mark_tree(root, height, ContractState.prefix(), marked):
+                contract_state = ContractState.deserialize(self.db[self.__fact_key(ContractState.prefix(), leaf_hash)])
+                tree = contract_state.storage_commitment_tree
+                storage_trees.append((tree.root, tree.height))
+
+        for root, height in storage_trees:
+            self.__mark_tree(root, height, StorageLeaf.prefix(), marked)
+
+        collectable_prefix_ids = {
+            self.__prefix_ids[prefix]
+            for prefix in (PATRICIA_NODE_PREFIX, ContractState.prefix(), StorageLeaf.prefix())
+            if prefix in self.__prefix_ids
+        }
+        garbage = [key for key in self.db if key[:1] in collectable_prefix_ids and key not in marked]
+
+        for key in garbage:
+            del self.db[key]
+
+        return len(garbage)
+
+class OverlayStorage(Storage):
+    """
+    Storage which keeps its own writes and reads the rest of the keys from `storage`, which is never written to.
+    The keys deleted from the overlay are only deleted from its own writes.
+    """
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+        self.db: Dict[bytes, bytes] = {}
+
+    async def set_value(self, key: bytes, value: bytes):
+        self.db[key] = value
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        value = self.db.get(key)
+        if value is None:
+            return await self.storage.get_value(key)
+        return value
+
+    async def del_value(self, key: bytes):
+        self.db.pop(key, None)
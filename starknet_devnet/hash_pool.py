@@ -0,0 +1,78 @@
+"""
+Batched Pedersen hashing of the facts storage in a pool of processes.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from starkware.cairo.lang.vm.crypto import pedersen_hash
+
+from .constants import DEFAULT_HASH_BATCH_THRESHOLD
+
+def hash_pairs(pairs: List[Tuple[bytes, bytes]]) -> List[bytes]:
+    """Returns the Pedersen hashes of `pairs` of 32-byte values, as 32-byte values."""
+    return [
+        pedersen_hash(int.from_bytes(left, "big"), int.from_bytes(right, "big")).to_bytes(32, "big")
+        for left, right in pairs
+    ]
+
+class BatchingHashFunction:
+    """
+    Async hash function of the facts storage, which hashes the pairs requested concurrently as one batch.
+    The Patricia tree update requests the hashes of independent nodes concurrently, level by level.
+    Batches of at least `threshold` pairs are split between `n_workers` processes, smaller batches are hashed in-process.
+    The results are the same as those of the default hash function.
+    """
+
+    def __init__(self, n_workers: int, threshold: int = DEFAULT_HASH_BATCH_THRESHOLD):
+        self.n_workers = n_workers
+        self.threshold = threshold
+        self.__pool: ProcessPoolExecutor = None
+        self.__batches: Dict[asyncio.AbstractEventLoop, list] = {}
+
+    def __getstate__(self):
+        return {"n_workers": self.n_workers, "threshold": self.threshold}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __get_pool(self) -> ProcessPoolExecutor:
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(max_workers=self.n_workers)
+        return self.__pool
+
+    async def __call__(self, left: bytes, right: bytes) -> bytes:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self.__batches.get(loop)
+        if batch is None:
+            batch = self.__batches[loop] = []
+            # the batch is hashed after the coroutines which are currently ready have requested their hashes
+            loop.create_task(self.__hash_batch(loop))
+
+        batch.append((left, right, future))
+        return await future
+
+    async def __hash_batch(self, loop: asyncio.AbstractEventLoop):
+        batch = self.__batches.pop(loop)
+        pairs = [(left, right) for left, right, _ in batch]
+
+        try:
+            if len(pairs) < self.threshold:
+                hashes = hash_pairs(pairs)
+            else:
+                chunk_size = -(-len(pairs) // self.n_workers)
+                chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+                chunk_hashes = await asyncio.gather(*[
+                    loop.run_in_executor(self.__get_pool(), hash_pairs, chunk) for chunk in chunks
+                ])
+                hashes = [value for chunk in chunk_hashes for value in chunk]
+        except Exception as error: # pylint: disable=broad-except
+            for _, _, future in batch:
+                future.set_exception(error)
+            return
+
+        for (_, _, future), value in zip(batch, hashes):
+            future.set_result(value)
@@ -0,0 +1,120 @@
+"""
+Mempool of received transactions, executed in the background by a sequencer thread.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Tuple
+
+from starkware.starknet.services.api.gateway.transaction import Transaction
+
+from .util import StarknetDevnetException
+
+Batch = Tuple[List[Transaction], List[int], bool, float]
+"""Transactions, their hashes, whether they form a single block, and the time they were received."""
+
+class Mempool:
+    """
+    Bounded queue of received transactions, guarded by its own condition, so adding doesn't wait for the execution.
+    A sequencer daemon thread executes the transactions in the order they were received, holding `lock` only while
+    awaiting `execute(transactions, tx_hashes, single_block)`, in batches as they were added.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        execute: Callable[[List[Transaction], List[int], bool], Awaitable],
+        lock: threading.Lock
+    ):
+        self.max_size = max_size
+        self.__execute = execute
+        self.__lock = lock
+        self.__batches: Deque[Batch] = deque()
+        self.__size = 0
+        self.__condition = threading.Condition()
+        self.__thread = None
+
+        self.received = 0
+        self.executed = 0
+        self.rejected = 0
+        self.__total_wait_time = 0.0
+        self.__max_wait_time = 0.0
+
+    def start(self):
+        """Starts executing the received transactions in a daemon thread."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    def add(self, transactions: List[Transaction], tx_hashes: List[int], single_block=False):
+        """
+        Adds `transactions` to the end of the queue, all or none of them.
+        Raises a 503 error if the queue can't accommodate them.
+        """
+        with self.__condition:
+            if self.__size + len(transactions) > self.max_size:
+                self.rejected += len(transactions)
+                raise StarknetDevnetException(
+                    message=f"Mempool is full ({self.__size} of {self.max_size} transactions); retry later.",
+                    status_code=503
+                )
+
+            self.__batches.append((transactions, tx_hashes, single_block, time.perf_counter()))
+            self.__size += len(transactions)
+            self.received += len(transactions)
+            self.__condition.notify()
+
+    def clear(self) -> List[int]:
+        """Removes the transactions which are not being executed yet. Returns their hashes."""
+        with self.__condition:
+            tx_hashes = [tx_hash for _, batch_hashes, _, _ in self.__batches for tx_hash in batch_hashes]
+            self.__batches.clear()
+            self.__size = 0
+            return tx_hashes
+
+    def get_metrics(self) -> dict:
+        """Returns the queue depth, the transaction counts and the wait times (in seconds) of the mempool."""
+        with self.__condition:
+            oldest_wait_time = time.perf_counter() - self.__batches[0][3] if self.__batches else 0.0
+            return {
+                "size": self.__size,
+                "max_size": self.max_size,
+                "received": self.received,
+                "executed": self.executed,
+                "rejected": self.rejected,
+                "mean_wait_time": self.__total_wait_time / self.executed if self.executed else 0.0,
+                "max_wait_time": self.__max_wait_time,
+                "oldest_wait_time": oldest_wait_time,
+            }
+
+    def __take(self) -> Batch:
+        with self.__condition:
+            while not self.__batches:
+                self.__condition.wait()
+            return self.__batches[0]
+
+    def __run(self):
+        while True:
+            batch = self.__take()
+            transactions, tx_hashes, single_block, received_at = batch
+
+            with self.__lock:
+                with self.__condition:
+                    # the batch could have been cleared in the meantime
+                    if not self.__batches or self.__batches[0] is not batch:
+                        continue
+                    self.__batches.popleft()
+                    self.__size -= len(transactions)
+
+                wait_time = time.perf_counter() - received_at
+                try:
+                    asyncio.run(self.__execute(transactions, tx_hashes, single_block))
+                except Exception as error: # pylint: disable=broad-except
+                    print(f"Error: Executing the received transactions failed: {error}")
+
+            with self.__condition:
+                self.executed += len(transactions)
+                self.__total_wait_time += wait_time * len(transactions)
+                self.__max_wait_time = max(self.__max_wait_time, wait_time)
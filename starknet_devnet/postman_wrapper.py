@@ -4,6 +4,7 @@ This module wraps the usage of Postman for L1 <> L2 interaction.
 import json
 
 from abc import ABC, abstractmethod
+from typing import Dict, Tuple
 from web3 import HTTPProvider, Web3
 from web3.middleware import geth_poa_middleware
 
@@ -100,6 +101,25 @@ and that the Messaging Contract is deployed at the provided address ({contract_a
 
         return self.__parse_l1_l2_messages(l1_to_l2_messages, l2_to_l1_messages)
 
+    @staticmethod
+    def get_revision(state) -> Tuple[int, Dict[str, int]]:
+        """Get the revision of the L2 -> L1 messages sent in `state`, to be passed to `revert`."""
+        # pylint: disable=protected-access
+        return len(state.l2_to_l1_messages_log), dict(state._l2_to_l1_messages)
+
+    def revert(self, state, revision: Tuple[int, Dict[str, int]]):
+        """
+        Removes the L2 -> L1 messages sent in `state` after `revision` was obtained.
+        The messages already flushed to L1 stay there, but won't be counted as flushed anymore.
+        """
+        log_length, message_counts = revision
+        del state.l2_to_l1_messages_log[log_length:]
+        state._l2_to_l1_messages = dict(message_counts) # pylint: disable=protected-access
+
+        if self.__postman_wrapper is not None:
+            postman = self.__postman_wrapper.postman
+            postman.n_consumed_l2_to_l1_messages = min(postman.n_consumed_l2_to_l1_messages, log_length)
+
 
 
 class PostmanWrapper(ABC):
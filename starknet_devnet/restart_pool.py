@@ -0,0 +1,107 @@
+"""
+Pool of initialized starknet wrappers, prepared in the background for restarts.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+import cloudpickle as pickle
+
+from .starknet_wrapper import StarknetWrapper
+
+class RestartPool:
+    """
+    Keeps up to `size` starknet wrappers cloned from the current genesis image, so that restarting only swaps one in.
+    The pool is refilled in a daemon thread whenever a wrapper is taken or the genesis image changes.
+    If `memory_limit` (in bytes) is provided, the number of pooled wrappers is reduced so that
+    their estimated memory use (based on the size of the genesis image) stays within it.
+    """
+
+    def __init__(self, size: int, memory_limit: int = None):
+        self.size = size
+        self.memory_limit = memory_limit
+        self.hits = 0
+        self.misses = 0
+
+        self.__wrappers: Deque[StarknetWrapper] = deque()
+        self.__genesis_key: str = None
+        self.__genesis_image: bytes = None
+        self.__lock = threading.Lock()
+        self.__refill_requested = threading.Event()
+        self.__thread = None
+
+    def start(self):
+        """Starts refilling the pool in a daemon thread."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    def __get_capacity(self) -> int:
+        if self.__genesis_image is None:
+            return 0
+        if self.memory_limit is None:
+            return self.size
+        return min(self.size, self.memory_limit // len(self.__genesis_image))
+
+    def set_genesis(self, genesis_key: str, genesis_image: bytes):
+        """Makes the pool prepare the clones of `genesis_image`, discarding the clones of a different genesis."""
+        with self.__lock:
+            if genesis_key == self.__genesis_key:
+                return
+
+            self.__wrappers.clear()
+            self.__genesis_key = genesis_key
+            self.__genesis_image = genesis_image
+
+        self.__refill_requested.set()
+
+    def take(self, genesis_key: str) -> Optional[StarknetWrapper]:
+        """Returns a prepared clone of the genesis identified by `genesis_key`; None if there is no such clone."""
+        with self.__lock:
+            if genesis_key == self.__genesis_key and self.__wrappers:
+                self.hits += 1
+                starknet_wrapper = self.__wrappers.popleft()
+            else:
+                self.misses += 1
+                starknet_wrapper = None
+
+        self.__refill_requested.set()
+        return starknet_wrapper
+
+    def get_stats(self) -> dict:
+        """Returns the size, the estimated memory use and the hit statistics of the pool."""
+        with self.__lock:
+            image_size = len(self.__genesis_image) if self.__genesis_image is not None else 0
+            return {
+                "size": len(self.__wrappers),
+                "max_size": self.size,
+                "capacity": self.__get_capacity(),
+                "memory_limit": self.memory_limit,
+                "estimated_memory": len(self.__wrappers) * image_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __run(self):
+        while True:
+            self.__refill_requested.wait()
+            self.__refill_requested.clear()
+
+            while True:
+                with self.__lock:
+                    if len(self.__wrappers) >= self.__get_capacity():
+                        break
+                    genesis_key = self.__genesis_key
+                    genesis_image = self.__genesis_image
+
+                # unpickling is the expensive part, so it's done without holding the lock
+                try:
+                    starknet_wrapper = pickle.loads(genesis_image)
+                except Exception as error: # pylint: disable=broad-except
+                    print(f"Error: Preparing a starknet wrapper for restart failed: {error}")
+                    break
+
+                with self.__lock:
+                    if genesis_key == self.__genesis_key and len(self.__wrappers) < self.__get_capacity():
+                        self.__wrappers.append(starknet_wrapper)
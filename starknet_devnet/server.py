@@ -5,16 +5,25 @@ A server exposing Starknet functionalities as API endpoints.
 from pickle import UnpicklingError
 import sys
 
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 import meinheld
 from starkware.starkware_utils.error_handling import StarkException
 
+from . import class_hash_cache
+from .block_producer import IntervalBlockProducer
+from .call_cache import CallCache
+from .call_pool import CallPool
 from .blueprints.base import base
-from .blueprints.gateway import gateway
+from .blueprints.gateway import execute_received_transactions, gateway
 from .blueprints.feeder_gateway import feeder_gateway
 from .blueprints.postman import postman
 from .blueprints.rpc import rpc
+from .blueprints.shared import request_changes_state
+from .commitment_worker import CommitmentWorker
+from .mempool import Mempool
+from .speculative_execution import SpeculativeExecutor
+from .restart_pool import RestartPool
 from .util import DumpOn, check_valid_dump_path, parse_args
 from .starknet_wrapper import DevnetConfig
 from .state import state
@@ -25,7 +34,23 @@ CORS(app)
 @app.before_first_request
 async def initialize_starknet():
     """Initialize Starknet to assert it's defined before its first use."""
-    await state.starknet_wrapper.initialize()
+    await state.initialize()
+
+@app.before_request
+def acquire_state_lock():
+    """
+    Prevent the other requests, the block producer and the mempool sequencer from using the state
+    while a request changing it is being handled.
+    """
+    if request_changes_state(app.view_functions.get(request.endpoint)):
+        state.lock.acquire()
+        g.holds_state_lock = True
+
+@app.teardown_request
+def release_state_lock(_error=None):
+    """Release the lock acquired in `acquire_state_lock`."""
+    if g.pop("holds_state_lock", False):
+        state.lock.release()
 
 app.register_blueprint(base)
 app.register_blueprint(gateway)
@@ -39,7 +64,8 @@ def generate_accounts(args):
         state.generate_accounts(
             n_accounts=args.accounts,
             initial_balance=args.initial_balance,
-            seed=args.seed
+            seed=args.seed,
+            cache_dir=args.account_cache_dir
         )
 
 def set_dump_options(args):
@@ -61,21 +87,71 @@ def load_dumped(args):
         except (FileNotFoundError, UnpicklingError):
             sys.exit(f"Error: Cannot load from {args.load_path}. Make sure the file exists and contains a Devnet dump.")
 
-def enable_lite_mode(args):
-    """Enable lite mode if specified."""
-    if args.lite_mode:
-        config = DevnetConfig(
-            lite_mode_block_hash=True,
-            lite_mode_deploy_hash=True
-        )
-    else:
-        config = DevnetConfig(
-            lite_mode_block_hash=args.lite_mode_block_hash,
-            lite_mode_deploy_hash=args.lite_mode_deploy_hash
-        )
+def set_config(args):
+    """Assign lite mode, commitment, hashing and block production options from args to the devnet config."""
+    max_txs_per_block = args.max_txs_per_block
+    if max_txs_per_block is None and args.block_interval is None:
+        max_txs_per_block = 1
+
+    config = DevnetConfig(
+        lite_mode_block_hash=args.lite_mode or args.lite_mode_block_hash,
+        lite_mode_deploy_hash=args.lite_mode or args.lite_mode_deploy_hash,
+        lazy_commitment=args.lazy_commitment or args.pipelined_commitment,
+        hash_workers=args.hash_workers,
+        hash_batch_threshold=args.hash_batch_threshold,
+        block_interval=args.block_interval,
+        max_txs_per_block=max_txs_per_block
+    )
 
     state.starknet_wrapper.set_config(config)
 
+def start_commitment_worker(args):
+    """Start committing the sealed blocks in the background if specified."""
+    if args.pipelined_commitment:
+        CommitmentWorker().start()
+
+def start_block_producer(args):
+    """Start sealing the pending block periodically if specified."""
+    if args.block_interval is not None:
+        IntervalBlockProducer(args.block_interval).start()
+
+def start_mempool(args):
+    """Start executing the received transactions in the background if specified."""
+    if args.mempool_size is not None:
+        state.mempool = Mempool(args.mempool_size, execute_received_transactions, state.lock)
+        state.mempool.start()
+
+def set_call_pool(args):
+    """Assign the pool of processes running calls if specified."""
+    if args.call_workers is not None:
+        state.call_pool = CallPool(args.call_workers)
+
+def set_call_cache(args):
+    """Assign the cache of call results if specified."""
+    if args.call_cache_size is not None:
+        state.call_cache = CallCache(args.call_cache_size)
+
+def set_speculative_executor(args):
+    """Assign the processes executing batched invokes if specified."""
+    if args.speculative_workers is not None:
+        state.speculative_executor = SpeculativeExecutor(args.speculative_workers)
+
+def set_genesis_cache(args):
+    """Assign the genesis cache directory if specified."""
+    state.genesis_cache_dir = args.genesis_cache_dir
+
+def set_class_hash_cache(args):
+    """Assign the class hash cache directory if specified."""
+    if args.class_hash_cache_dir is not None:
+        class_hash_cache.set_cache_dir(args.class_hash_cache_dir)
+
+def start_restart_pool(args):
+    """Start preparing starknet wrappers for restarts if specified."""
+    if args.restart_pool_size is not None:
+        memory_limit = args.restart_pool_memory * 2**20 if args.restart_pool_memory is not None else None
+        state.restart_pool = RestartPool(args.restart_pool_size, memory_limit)
+        state.restart_pool.start()
+
 def set_start_time(args):
     """Assign start time if specified."""
     if args.start_time is not None:
@@ -97,9 +173,18 @@ def main():
     load_dumped(args)
     set_dump_options(args)
     generate_accounts(args)
-    enable_lite_mode(args)
+    set_config(args)
+    set_genesis_cache(args)
+    set_class_hash_cache(args)
+    start_restart_pool(args)
     set_start_time(args)
     set_gas_price(args)
+    start_commitment_worker(args)
+    start_block_producer(args)
+    start_mempool(args)
+    set_call_pool(args)
+    set_call_cache(args)
+    set_speculative_executor(args)
 
     try:
         meinheld.listen((args.host, args.port))
@@ -0,0 +1,169 @@
+"""
+Speculative execution of invoke transactions in a pool of processes forked from the current state.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from starkware.starknet.business_logic.internal_transaction import CallInfo, InternalInvokeFunction
+from starkware.starknet.business_logic.state.objects import ContractCarriedState, ContractState
+from starkware.starknet.business_logic.state.state import CarriedState
+from starkware.starknet.services.api.contract_class import EntryPointType
+from starkware.starknet.services.api.gateway.transaction import InvokeFunction
+from starkware.starknet.storage.starknet_storage import StorageLeaf
+from starkware.starknet.testing.objects import TransactionExecutionInfo
+from starkware.starknet.testing.state import StarknetState
+from starkware.starkware_utils.error_handling import StarkException
+
+from .carried_state import StateChanges
+
+@dataclass
+class SpeculativeResult:
+    """The outcome of executing an invoke against the state preceding its batch."""
+    execution_info: TransactionExecutionInfo
+    accessed: StateChanges
+    """Entries read or written."""
+    storage_writes: Dict[Tuple[int, int], StorageLeaf]
+    deployed: Dict[int, ContractState]
+
+def get_deployed_addresses(call_info: CallInfo) -> Set[int]:
+    """Returns the addresses of the contracts deployed in `call_info` and its internal calls."""
+    addresses = set()
+    if call_info.entry_point_type == EntryPointType.CONSTRUCTOR:
+        addresses.add(call_info.contract_address)
+    for internal_call in call_info.internal_calls:
+        addresses.update(get_deployed_addresses(internal_call))
+    return addresses
+
+def has_l2_to_l1_messages(call_info: CallInfo) -> bool:
+    """Returns True if `call_info` or any of its internal calls sends a message to L1."""
+    return bool(call_info.l2_to_l1_messages) or any(map(has_l2_to_l1_messages, call_info.internal_calls))
+
+class WriteSet:
+    """Storage entries and contracts written by the transactions committed so far in a batch."""
+
+    def __init__(self):
+        self.storage_keys: Set[Tuple[int, int]] = set()
+        self.addresses: Set[int] = set()
+
+    def conflicts_with(self, accessed: StateChanges) -> bool:
+        """Returns True if any of the `accessed` entries has been written."""
+        if not self.addresses.isdisjoint(accessed.addresses):
+            return True
+
+        return any(
+            (address, key) in self.storage_keys
+            for address, keys in accessed.storage_keys.items()
+            for key in keys
+        )
+
+    def add_result(self, result: SpeculativeResult):
+        """Marks the entries written by a speculatively executed transaction."""
+        self.storage_keys.update(result.storage_writes)
+        self.addresses.update(result.deployed)
+
+    def add_execution_info(self, execution_info: TransactionExecutionInfo):
+        """Marks the entries possibly written during the execution described by `execution_info`."""
+        accessed = StateChanges()
+        accessed.add_execution_info(execution_info)
+        for address, keys in accessed.storage_keys.items():
+            self.storage_keys.update((address, key) for key in keys)
+
+        if execution_info.call_info is not None:
+            self.addresses.update(get_deployed_addresses(execution_info.call_info))
+
+def apply_speculative_writes(state: CarriedState, result: SpeculativeResult):
+    """Applies the entries written by the speculatively executed transaction of `result` to `state`."""
+    for address, contract_state in result.deployed.items():
+        contract_carried_state = state.contract_states.get(address)
+        state.contract_states[address] = ContractCarriedState(
+            state=contract_state,
+            storage_updates=contract_carried_state.storage_updates if contract_carried_state else {}
+        )
+
+    for (address, key), leaf in result.storage_writes.items():
+        state.contract_states[address].storage_updates[key] = leaf
+
+_base_state: StarknetState = None
+"""The state inherited by the forked workers."""
+
+async def _execute(invoke_function: InvokeFunction) -> Optional[SpeculativeResult]:
+    internal_tx = InternalInvokeFunction.from_external(invoke_function, _base_state.general_config)
+    child_state = _base_state.state.create_child_state_for_querying()
+
+    try:
+        # the same as StarknetState.invoke_raw, without recording the messages to L1 and the events
+        with child_state.copy_and_apply() as tx_state:
+            execution_info = await internal_tx.apply_state_updates(
+                state=tx_state, general_config=_base_state.general_config
+            )
+    except StarkException:
+        # rejection can depend on the preceding transactions, so it's left to the serial execution
+        return None
+
+    # messages to L1 are recorded in the state outside of the carried state
+    if execution_info.call_info is None or has_l2_to_l1_messages(execution_info.call_info):
+        return None
+
+    accessed = StateChanges()
+    accessed.add_execution_info(execution_info)
+
+    storage_writes = {}
+    deployed = {}
+    for address in accessed.addresses:
+        contract_carried_state = child_state.contract_states.get(address)
+        if contract_carried_state is None:
+            continue
+
+        base_contract_carried_state = _base_state.state.contract_states.get(address)
+        base_storage_updates = base_contract_carried_state.storage_updates if base_contract_carried_state else {}
+        if base_contract_carried_state is None or contract_carried_state.state != base_contract_carried_state.state:
+            deployed[address] = contract_carried_state.state
+
+        for key in accessed.storage_keys.get(address, ()):
+            leaf = contract_carried_state.storage_updates.get(key)
+            if leaf is not None and leaf != base_storage_updates.get(key):
+                storage_writes[(address, key)] = leaf
+
+    return SpeculativeResult(
+        execution_info=execution_info,
+        accessed=accessed,
+        storage_writes=storage_writes,
+        deployed=deployed
+    )
+
+def _execute_in_worker(invoke_function: InvokeFunction) -> Optional[SpeculativeResult]:
+    return asyncio.run(_execute(invoke_function))
+
+class SpeculativeExecutor:
+    """
+    Executes invoke transactions in `n_workers` processes, each against the state preceding the whole batch.
+    The results are only valid for the transactions which don't access the entries written by the preceding
+    transactions of the batch; the rest have to be executed serially.
+    """
+
+    def __init__(self, n_workers: int):
+        self.n_workers = n_workers
+
+    async def execute(
+        self, state: StarknetState, invoke_functions: List[InvokeFunction]
+    ) -> List[Optional[SpeculativeResult]]:
+        """
+        Returns the results of executing `invoke_functions` against `state`, in order.
+        A result is None if the transaction has to be executed serially.
+        Should be called while no changes are being made to `state`.
+        """
+        # pylint: disable=global-statement
+        global _base_state
+        _base_state = state
+
+        # the workers are forked on submission, so they inherit the current state
+        with ProcessPoolExecutor(
+            max_workers=min(self.n_workers, len(invoke_functions)),
+            mp_context=multiprocessing.get_context("fork")
+        ) as pool:
+            futures = [pool.submit(_execute_in_worker, invoke_function) for invoke_function in invoke_functions]
+            return await asyncio.gather(*map(asyncio.wrap_future, futures))
@@ -3,39 +3,67 @@ This module introduces `StarknetWrapper`, a wrapper class of
 starkware.starknet.testing.starknet.Starknet.
 """
 
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from copy import copy
 import dataclasses
-from copy import deepcopy
-from typing import Dict, List, Tuple, Union
+import threading
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, Union
 
 import cloudpickle as pickle
 from starkware.starknet.business_logic.internal_transaction import (
     InternalInvokeFunction,
     InternalDeclare,
     InternalDeploy,
+    InternalTransaction,
 )
 from starkware.starknet.business_logic.internal_transaction import CallInfo
-from starkware.starknet.business_logic.state.state import CarriedState
+from starkware.starknet.business_logic.state.state import BlockInfo, CarriedState, SharedState
+from starkware.starknet.definitions.general_config import StarknetGeneralConfig
 from starkware.starknet.services.api.gateway.transaction import InvokeFunction, Deploy, Declare
 from starkware.starknet.testing.starknet import Starknet
 from starkware.starkware_utils.error_handling import StarkException
+from starkware.storage.storage import FactFetchingContext
 from starkware.starknet.business_logic.transaction_fee import calculate_tx_fee
+from starkware.starknet.business_logic.utils import write_contract_class_fact
 from starkware.starknet.services.api.contract_class import EntryPointType
-from starkware.starknet.services.api.feeder_gateway.response_objects import TransactionStatus
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockStateUpdate,
+    StarknetBlock,
+    TransactionStatus
+)
 from starkware.starknet.testing.contract import StarknetContract
 from starkware.starknet.testing.objects import FunctionInvocation
 
 from .account import Account
+from .carried_state import (
+    JOURNAL_CONTRACT,
+    DevnetStarknetState,
+    StateChanges,
+    copy_carried_state,
+    get_written_addresses,
+    revert_carried_state,
+    snapshot_carried_state,
+    update_carried_state
+)
+from .constants import DEFAULT_HASH_BATCH_THRESHOLD
+from .facts_storage import DevnetFactsStorage, OverlayStorage
 from .fee_token import FeeToken
 from .general_config import DEFAULT_GENERAL_CONFIG
+from .hash_pool import BatchingHashFunction
 from .origin import NullOrigin, Origin
 from .util import (
     DummyExecutionInfo,
+    StarknetDevnetException,
     enable_pickling,
+    fixed_length_hex,
     generate_state_update,
+    get_fee_estimation,
     to_bytes
 )
 from .contract_wrapper import ContractWrapper
 from .postman_wrapper import DevnetL1L2
+from .speculative_execution import SpeculativeExecutor, SpeculativeResult, WriteSet, apply_speculative_writes
 from .transactions import DevnetTransactions, DevnetTransaction
 from .contracts import DevnetContracts
 from .blocks import DevnetBlocks
@@ -48,6 +76,41 @@ class DevnetConfig:
     """Configuration for the devnet."""
     lite_mode_block_hash: bool = False
     lite_mode_deploy_hash: bool = False
+    block_interval: int = None
+    """Milliseconds between sealing the pending block; None if blocks aren't sealed periodically."""
+    max_txs_per_block: int = 1
+    """Number of transactions after which the pending block is sealed; None if there is no limit."""
+    lazy_commitment: bool = False
+    """Defer the state commitment and block hash calculation until the block data is requested."""
+    hash_workers: int = None
+    """Number of processes hashing large batches of facts storage hashes; None if hashing in-process only."""
+    hash_batch_threshold: int = DEFAULT_HASH_BATCH_THRESHOLD
+    """Minimum number of concurrently requested hashes to be hashed in the process pool."""
+
+@dataclasses.dataclass
+class Snapshot:
+    """The parts of the devnet needed to revert to a snapshot, apart from the journaled carried state entries."""
+    journal_length: int
+    shared_state: SharedState
+    block_info: BlockInfo
+    block_info_generator: BlockInfoGenerator
+    number_of_blocks: int
+    transactions_revision: int
+    contracts_revision: Tuple[int, int]
+    messages_revision: Tuple[int, Dict[str, int]]
+
+@dataclasses.dataclass
+class UncommittedBlock:
+    """A sealed block whose state commitment and hash are yet to be calculated."""
+    transactions: List[DevnetTransaction]
+    previous_state: CarriedState
+    """Snapshot of the touched entries before the block."""
+    current_state: CarriedState
+    """Snapshot of the touched entries after the block."""
+    changes: StateChanges
+    shared_state: Optional[SharedState] = None
+    """The shared state resulting from the block, once its commitment has been calculated."""
+    state_update: Optional[BlockStateUpdate] = None
 
 #pylint: disable=too-many-instance-attributes
 class StarknetWrapper:
@@ -66,13 +129,44 @@ class StarknetWrapper:
         self.contracts = DevnetContracts(self.origin)
         self.l1l2 = DevnetL1L2()
         self.transactions = DevnetTransactions(self.origin)
+        self.pending_transactions: List[DevnetTransaction] = []
+        """Accepted transactions which are not yet part of a block."""
         self.__starknet = None
         self.__current_carried_state = None
+        self.__uncommitted_blocks: Deque[UncommittedBlock] = deque()
         self.__initialized = False
+        self.__snapshots: List[Snapshot] = []
+        self.__journal: List[tuple] = []
+        """Entries of the preserved carried state overwritten since the first snapshot."""
+        self.__single_block = False
+        """If True, the pending block isn't sealed when it reaches its size limit."""
+        self.__state_version = 0
+        """Incremented whenever the preserved carried state changes."""
+        self.__write_versions: Dict[int, int] = {}
+        """Per contract address, incremented whenever the contract is written to in the preserved carried state."""
 
         self.accounts: List[Account] = []
         """List of predefined accounts"""
 
+        self.__init_commitment_sync()
+
+    def __init_commitment_sync(self):
+        self.commit_lock = threading.Lock()
+        """Held while committing the blocks sealed in lazy commitment mode, which may happen in a background thread."""
+        self.block_sealed = threading.Event()
+        """Set whenever a block is sealed in lazy commitment mode."""
+
+    def __getstate__(self):
+        # the lock and the event can't be pickled; every clone and loaded dump gets its own
+        wrapper_state = vars(self).copy()
+        del wrapper_state["commit_lock"]
+        del wrapper_state["block_sealed"]
+        return wrapper_state
+
+    def __setstate__(self, wrapper_state: dict):
+        vars(self).update(wrapper_state)
+        self.__init_commitment_sync()
+
     @staticmethod
     def load(path: str) -> "StarknetWrapper":
         """Load a serialized instance of this class from `path`."""
@@ -86,20 +180,67 @@ class StarknetWrapper:
 
             await self.__deploy_fee_token()
             await self.__deploy_accounts()
+            await self.__commit_genesis()
 
-            await self.__preserve_current_state(starknet.state.state)
+            await self.__preserve_current_state(starknet.state.state, starknet.state.changes.consume())
             self.__initialized = True
 
-    async def __preserve_current_state(self, state: CarriedState):
-        self.__current_carried_state = deepcopy(state)
-        self.__current_carried_state.shared_state = state.shared_state
+    def is_initialized(self) -> bool:
+        """Returns True if `initialize` has been called."""
+        return self.__initialized
+
+    def get_state_version(self) -> int:
+        """Returns the number which changes whenever the state of the last sealed block changes."""
+        return self.__state_version
+
+    def get_write_version(self, address: int) -> int:
+        """Returns the number which changes whenever the contract at `address` is written to in a sealed block."""
+        return self.__write_versions.get(address, 0)
+
+    def __increment_write_versions(self, addresses: Iterable[int]):
+        for address in addresses:
+            self.__write_versions[address] = self.get_write_version(address) + 1
+
+    async def has_pending_changes(self) -> bool:
+        """Returns True if the current state differs from the state of the last sealed block."""
+        state = await self.get_state()
+        return bool(self.pending_transactions) or not state.changes.is_empty()
+
+    async def use_preserved_state(self):
+        """
+        Makes the state of the last sealed block the one used for execution, discarding the pending changes.
+        Meant only for read-only copies of the wrapper, since the preserved state is no longer tracked afterwards.
+        """
+        state = await self.get_state()
+        state.state = self.__current_carried_state
+
+    async def __preserve_current_state(self, state: CarriedState, changes: StateChanges):
+        """
+        Makes the preserved carried state equal to `state`.
+        After the initial copy, only the entries marked in `changes` are copied.
+        """
+        if self.__current_carried_state is None:
+            self.__current_carried_state = copy_carried_state(state)
+        else:
+            journal = self.__journal if self.__snapshots else None
+            self.__increment_write_versions(get_written_addresses(self.__current_carried_state, state, changes))
+            update_carried_state(self.__current_carried_state, state, changes, journal)
+        self.__state_version += 1
 
     async def __get_starknet(self):
         """
         Returns the underlying Starknet instance, creating it first if necessary.
         """
         if not self.__starknet:
-            self.__starknet = await Starknet.empty(general_config=DEFAULT_GENERAL_CONFIG)
+            starknet_state = await DevnetStarknetState.empty(general_config=DEFAULT_GENERAL_CONFIG)
+            ffc = starknet_state.state.ffc
+            ffc.storage = DevnetFactsStorage(ffc.storage.db)
+            if self.config.hash_workers:
+                ffc.hash_func = BatchingHashFunction(
+                    n_workers=self.config.hash_workers,
+                    threshold=self.config.hash_batch_threshold
+                )
+            self.__starknet = Starknet(state=starknet_state)
         return self.__starknet
 
     async def get_state(self):
@@ -110,17 +251,13 @@ class StarknetWrapper:
         starknet = await self.__get_starknet()
         return starknet.state
 
-    async def __update_state(self):
+    async def __update_state(self, changes: StateChanges):
         previous_state = self.__current_carried_state
         assert previous_state is not None
-        current_carried_state = (await self.get_state()).state
         state = await self.get_state()
+        current_carried_state = state.state
 
-        current_carried_state.block_info = self.block_info_generator.next_block(
-            block_info=current_carried_state.block_info,
-            general_config=state.general_config
-        )
-
+        state_update = None
         if not self.config.lite_mode_block_hash:
             # This is the most time-intensive part of the function.
             # With only skipping it in lite-mode, we still get the time benefit.
@@ -132,41 +269,286 @@ class StarknetWrapper:
             )
 
             state.state.shared_state = updated_shared_state
-            await self.__preserve_current_state(state.state)
+            state_update = generate_state_update(previous_state, current_carried_state, changes)
 
-            return generate_state_update(previous_state, current_carried_state)
+        # the preserved state is updated in place, so this has to come after the state update generation
+        await self.__preserve_current_state(state.state, changes)
 
-        return None
+        return state_update
 
     async def __get_state_root(self):
         state = await self.get_state()
         return state.state.shared_state.contract_states.root
 
-    async def __store_transaction(
-        self, transaction: DevnetTransaction, tx_hash: int,
-        state_update: Dict, error_message: str=None
-    ) -> None:
+    async def __store_transaction(self, transaction: DevnetTransaction, tx_hash: int, error_message: str=None) -> None:
         """
-        Stores the provided data as a deploy transaction in `self.transactions`.
-        Generates a new block
+        Stores the provided data as a transaction in `self.transactions`.
+        An accepted transaction is added to the pending block, which is sealed if it has reached its size limit.
         """
 
         if transaction.status == TransactionStatus.REJECTED:
             assert error_message, "error_message must be present if tx rejected"
             transaction.set_failure_reason(error_message)
-        else:
-            state = await self.get_state()
-            state_root = await self.__get_state_root()
+            self.transactions.store(tx_hash, transaction)
+            return
+
+        transaction.status = TransactionStatus.PENDING
+        self.pending_transactions.append(transaction)
+        self.transactions.store(tx_hash, transaction)
+
+        max_txs_per_block = self.config.max_txs_per_block
+        if self.__single_block or max_txs_per_block is None:
+            return
+
+        if len(self.pending_transactions) >= max_txs_per_block:
+            await self.__seal_pending_block()
+
+    @asynccontextmanager
+    async def single_block(self):
+        """
+        Makes the transactions added within the context part of a single block, which is sealed on exit.
+        The transactions pending before entering the context are sealed in their own block.
+        """
+        if self.pending_transactions:
+            await self.__seal_pending_block()
+
+        self.__single_block = True
+        try:
+            yield
+        finally:
+            self.__single_block = False
+            if self.pending_transactions:
+                await self.__seal_pending_block()
 
-            block = await self.blocks.generate(
-                transaction,
-                state,
-                state_root,
-                state_update=state_update,
+    async def create_block(self) -> StarknetBlock:
+        """
+        Seals the pending block and generates it, together with any block whose generation was deferred.
+        The block is generated even if there are no pending transactions.
+        Returns the generated block.
+        """
+        await self.__seal_pending_block()
+        await self.commit_blocks()
+        return self.blocks.get_by_number(None)
+
+    async def __seal_pending_block(self):
+        """
+        Closes the pending block to new transactions and commits the state.
+        In lazy commitment mode, the commitment and the block generation are deferred until `commit_blocks` is called.
+        """
+        state = await self.get_state()
+        state.state.block_info = self.block_info_generator.next_block(
+            block_info=state.state.block_info,
+            general_config=state.general_config
+        )
+
+        changes = state.changes.consume()
+        transactions, self.pending_transactions = self.pending_transactions, []
+
+        if self.config.lazy_commitment and not self.config.lite_mode_block_hash:
+            self.__uncommitted_blocks.append(UncommittedBlock(
+                transactions=transactions,
+                previous_state=snapshot_carried_state(self.__current_carried_state, changes),
+                current_state=snapshot_carried_state(state.state, changes),
+                changes=changes
+            ))
+            await self.__preserve_current_state(state.state, changes)
+            self.block_sealed.set()
+            return
+
+        state_update = await self.__update_state(changes)
+        state_root = await self.__get_state_root()
+        await self.__generate_block(transactions, state.state.block_info, state_root, state_update)
+
+    async def commit_blocks(self, state_lock: Optional[threading.Lock] = None):
+        """
+        Calculates the state commitment and generates the blocks sealed in lazy commitment mode, in order.
+        Should be called before reading blocks, state updates or the block data of transactions.
+        The commitment is calculated holding only `commit_lock`, so the next blocks can be sealed in the meantime;
+        each committed block is generated and its shared state swapped into the live state while holding `state_lock`
+        as well, which is acquired first. If `state_lock` is None, the caller holds it.
+        If committing a block fails, it stays uncommitted together with the following blocks, and the error is raised.
+        """
+        while self.__uncommitted_blocks:
+            try:
+                with self.commit_lock:
+                    uncommitted_block = await self.__commit_first_block()
+                if uncommitted_block is None:
+                    return
+
+                with state_lock or nullcontext(), self.commit_lock:
+                    await self.__complete_first_block(uncommitted_block)
+            except StarkException:
+                raise
+            except Exception as error:
+                raise StarknetDevnetException(message=f"Committing the sealed blocks failed: {error}") from error
+
+    async def __commit_first_block(self) -> Optional[UncommittedBlock]:
+        """
+        Calculates the state commitment and the state update of the first uncommitted block, if not calculated yet.
+        The live state isn't changed. Returns the block; None if there are no uncommitted blocks.
+        """
+        if not self.__uncommitted_blocks:
+            return None
+
+        uncommitted_block = self.__uncommitted_blocks[0]
+        if uncommitted_block.shared_state is not None:
+            return uncommitted_block
+
+        # the preceding blocks have been completed, so the live shared state is the one resulting from them
+        state = await self.get_state()
+        shared_state = state.state.shared_state
+        previous_state = uncommitted_block.previous_state
+        current_state = uncommitted_block.current_state
+
+        # the snapshots were taken before the preceding blocks were committed
+        previous_state.shared_state = shared_state
+        current_state.shared_state = shared_state
+        shared_state = await shared_state.apply_state_updates(
+            ffc=current_state.ffc,
+            previous_carried_state=previous_state,
+            current_carried_state=current_state
+        )
+        current_state.shared_state = shared_state
+
+        uncommitted_block.state_update = generate_state_update(previous_state, current_state, uncommitted_block.changes)
+        uncommitted_block.shared_state = shared_state
+        return uncommitted_block
+
+    async def __complete_first_block(self, uncommitted_block: UncommittedBlock):
+        """
+        Generates the committed `uncommitted_block` and makes its shared state the one of the live state,
+        unless it has already been completed or reverted in the meantime.
+        """
+        if not self.__uncommitted_blocks or self.__uncommitted_blocks[0] is not uncommitted_block:
+            return
+
+        shared_state = uncommitted_block.shared_state
+        await self.__generate_block(
+            uncommitted_block.transactions,
+            uncommitted_block.current_state.block_info,
+            shared_state.contract_states.root,
+            uncommitted_block.state_update
+        )
+
+        state = await self.get_state()
+        state.state.shared_state = shared_state
+        self.__current_carried_state.shared_state = shared_state
+        self.__uncommitted_blocks.popleft()
+
+    async def collect_garbage(self, retained_blocks: int = 0) -> dict:
+        """
+        Removes the state commitment facts which are reachable neither from the current state
+        nor from the state roots of the last `retained_blocks` blocks and of the snapshots.
+        """
+        await self.commit_blocks()
+
+        with self.commit_lock:
+            state = await self.get_state()
+            global_tree = state.state.shared_state.contract_states
+            global_roots = [global_tree.root]
+
+            number_of_blocks = self.blocks.get_number_of_blocks()
+            for block_number in range(max(number_of_blocks - retained_blocks, 0), number_of_blocks):
+                global_roots.append(to_bytes(self.blocks.get_by_number(block_number).state_root))
+
+            global_roots.extend(snapshot.shared_state.contract_states.root for snapshot in self.__snapshots)
+
+            carried_states = [state.state, self.__current_carried_state]
+            contract_states = [
+                contract_state
+                for carried_state in carried_states
+                for contract_state in carried_state.contract_states.values()
+            ]
+            contract_states.extend(
+                entry[2] for entry in self.__journal
+                if entry[0] == JOURNAL_CONTRACT and entry[2] is not None
+            )
+            storage_trees = [
+                (contract_state.state.storage_commitment_tree.root, contract_state.state.storage_commitment_tree.height)
+                for contract_state in contract_states
+            ]
+
+            storage = state.state.ffc.storage
+            removed = storage.collect_garbage(
+                global_trees=[(root, global_tree.height) for root in global_roots],
+                storage_trees=storage_trees
             )
+
+            return {"removed_facts": removed, "remaining_facts": len(storage.db)}
+
+    async def snapshot(self) -> int:
+        """
+        Takes a snapshot of the devnet, which can be restored with `revert`. Returns the id of the snapshot.
+        The pending block is sealed first if there are any pending transactions or state changes outside of blocks.
+        """
+        state = await self.get_state()
+        if self.pending_transactions or not state.changes.is_empty():
+            await self.__seal_pending_block()
+        await self.commit_blocks()
+
+        self.__snapshots.append(Snapshot(
+            journal_length=len(self.__journal),
+            shared_state=state.state.shared_state,
+            block_info=state.state.block_info,
+            block_info_generator=copy(self.block_info_generator),
+            number_of_blocks=self.blocks.get_number_of_blocks(),
+            transactions_revision=self.transactions.get_revision(),
+            contracts_revision=self.contracts.get_revision(),
+            messages_revision=self.l1l2.get_revision(state.state)
+        ))
+        return len(self.__snapshots) - 1
+
+    async def revert(self, snapshot_id: int):
+        """
+        Restores the devnet to the snapshot with `snapshot_id`. The snapshots taken after it are discarded.
+        The cost depends on the number of changes since the snapshot, not on the size of the state.
+        """
+        if not 0 <= snapshot_id < len(self.__snapshots):
+            raise StarknetDevnetException(message=f"No snapshot with id {snapshot_id}.", status_code=400)
+
+        snapshot = self.__snapshots[snapshot_id]
+        del self.__snapshots[snapshot_id + 1:]
+        state = await self.get_state()
+
+        with self.commit_lock:
+            # the blocks are committed when taking a snapshot, so all of the uncommitted blocks are reverted
+            self.__uncommitted_blocks.clear()
+
+            preserved_state = self.__current_carried_state
+            changes = revert_carried_state(preserved_state, self.__journal, snapshot.journal_length)
+            changes.update(state.changes.consume())
+            preserved_state.shared_state = snapshot.shared_state
+            preserved_state.block_info = snapshot.block_info
+
+            # the current state differs from the preserved one only in the entries changed since the snapshot
+            update_carried_state(state.state, preserved_state, changes)
+            self.__increment_write_versions(changes.addresses)
+            self.__state_version += 1
+
+        self.pending_transactions = []
+        self.block_info_generator = copy(snapshot.block_info_generator)
+        self.blocks.truncate(snapshot.number_of_blocks)
+        self.transactions.revert(snapshot.transactions_revision)
+        self.contracts.revert(snapshot.contracts_revision)
+        self.l1l2.revert(state.state, snapshot.messages_revision)
+
+    async def __generate_block(
+        self, transactions: List[DevnetTransaction], block_info: BlockInfo, state_root: bytes, state_update
+    ) -> StarknetBlock:
+        state = await self.get_state()
+        block = await self.blocks.generate(
+            transactions,
+            block_info,
+            state.general_config,
+            state_root,
+            state_update=state_update
+        )
+
+        for transaction in transactions:
+            transaction.status = TransactionStatus.ACCEPTED_ON_L2
             transaction.set_block(block=block)
 
-        self.transactions.store(tx_hash, transaction)
+        return block
 
     async def __deploy_fee_token(self):
         starknet = await self.__get_starknet()
@@ -175,10 +557,22 @@ class StarknetWrapper:
 
     async def __deploy_accounts(self):
         starknet = await self.__get_starknet()
-        for account in self.accounts:
-            contract = await account.deploy(starknet)
+        contracts = await Account.deploy_all(starknet, self.accounts)
+        for account, contract in zip(self.accounts, contracts):
             self.contracts.store(account.address, ContractWrapper(contract, Account.get_contract_class()))
 
+    async def __commit_genesis(self):
+        """Commits the state of the predeployed contracts, so that the first block only commits its own changes."""
+        if self.config.lite_mode_block_hash:
+            return
+
+        state = await self.get_state()
+        state.state.shared_state = await state.state.shared_state.apply_state_updates(
+            ffc=state.state.ffc,
+            previous_carried_state=state.state,
+            current_carried_state=state.state
+        )
+
     def set_config(self, config: DevnetConfig):
         """
         Sets the configuration of the devnet.
@@ -186,6 +580,33 @@ class StarknetWrapper:
         self.config = config
         self.blocks.lite = config.lite_mode_block_hash
 
+    async def calculate_hashes(
+        self, transaction: Union[Declare, Deploy, InvokeFunction]
+    ) -> Tuple[int, int, InternalTransaction]:
+        """
+        Calculates the hashes of `transaction` without executing it.
+        Returns (class_hash, transaction_hash) of a declare and (contract_address, transaction_hash) of a deploy or invoke,
+        the same as those returned once the transaction is executed, together with the internal transaction.
+        """
+        state = await self.get_state()
+
+        if isinstance(transaction, Declare):
+            internal_tx = InternalDeclare.from_external(transaction, state.general_config)
+            identifier = int.from_bytes(to_bytes(internal_tx.class_hash), "big")
+
+        elif isinstance(transaction, Deploy):
+            assert not self.config.lite_mode_deploy_hash, "Deploy tx hash can't be calculated in advance in lite mode"
+            internal_tx = InternalDeploy.from_external(transaction, state.general_config)
+            identifier = internal_tx.contract_address
+            if self.contracts.is_deployed(identifier):
+                return identifier, self.contracts.get_by_address(identifier).deployment_tx_hash, internal_tx
+
+        else:
+            internal_tx = InternalInvokeFunction.from_external(transaction, state.general_config)
+            identifier = internal_tx.contract_address
+
+        return identifier, internal_tx.hash_value, internal_tx
+
     async def declare(self, declare_transaction: Declare) -> Tuple[int, int]:
         """
         Declares the class specified with `declare_transaction`
@@ -210,12 +631,9 @@ class StarknetWrapper:
             transaction_hash=tx_hash
         )
 
-        state_update = await self.__update_state()
-
         await self.__store_transaction(
             transaction=transaction,
             tx_hash=tx_hash,
-            state_update=state_update,
             error_message=None
         )
 
@@ -255,12 +673,10 @@ class StarknetWrapper:
             status = TransactionStatus.ACCEPTED_ON_L2
 
             self.contracts.store(contract.contract_address, ContractWrapper(contract, contract_class, tx_hash))
-            state_update = await self.__update_state()
         except StarkException as err:
             error_message = err.message
             status = TransactionStatus.REJECTED
             execution_info = DummyExecutionInfo()
-            state_update = None
 
         transaction = DevnetTransaction(
             internal_tx=internal_tx,
@@ -271,7 +687,6 @@ class StarknetWrapper:
 
         await self.__store_transaction(
             transaction=transaction,
-            state_update=state_update,
             error_message=error_message,
             tx_hash=tx_hash
         )
@@ -282,6 +697,60 @@ class StarknetWrapper:
 
     async def invoke(self, invoke_function: InvokeFunction):
         """Perform invoke according to specifications in `transaction`."""
+        contract_address, tx_hash, result_dict, _ = await self.__invoke(invoke_function)
+        return contract_address, tx_hash, result_dict
+
+    async def invoke_batch(self, invoke_functions: List[InvokeFunction], executor: SpeculativeExecutor):
+        """
+        Performs the invokes specified with `invoke_functions`, with the same outcome as invoking them in order.
+        The invokes are first executed speculatively in parallel by `executor`, against the current state.
+        Their results are committed in order, unless they conflict with the preceding invokes of the batch,
+        in which case they are executed anew.
+        Speculation is only used if the invokes end up in the same block, since their execution may depend on the block info.
+        Returns the list of (contract_address, transaction_hash, result_dict).
+        """
+        if len(invoke_functions) < 2 or not (self.__single_block or self.config.max_txs_per_block is None):
+            return [await self.invoke(invoke_function) for invoke_function in invoke_functions]
+
+        state = await self.get_state()
+        results = await executor.execute(state, invoke_functions)
+
+        written = WriteSet()
+        invoke_results = []
+        for invoke_function, result in zip(invoke_functions, results):
+            if result is not None and not written.conflicts_with(result.accessed):
+                invoke_results.append(await self.__commit_speculative_invoke(invoke_function, result))
+                written.add_result(result)
+            else:
+                *invoke_result, execution_info = await self.__invoke(invoke_function)
+                invoke_results.append(tuple(invoke_result))
+                written.add_execution_info(execution_info)
+
+        return invoke_results
+
+    async def __commit_speculative_invoke(self, invoke_function: InvokeFunction, result: SpeculativeResult):
+        state = await self.get_state()
+        invoke_transaction = InternalInvokeFunction.from_external(invoke_function, state.general_config)
+
+        apply_speculative_writes(state.state, result)
+        state.changes.add_transaction(invoke_transaction)
+        state.changes.add_execution_info(result.execution_info)
+
+        transaction = DevnetTransaction(invoke_transaction, TransactionStatus.ACCEPTED_ON_L2, result.execution_info)
+        tx_hash = transaction.transaction_hash
+
+        await self.__store_transaction(
+            transaction=transaction,
+            error_message=None,
+            tx_hash=tx_hash
+        )
+
+        await self.__register_new_contracts(result.execution_info.call_info.internal_calls, tx_hash)
+
+        adapted_result = list(map(hex, result.execution_info.call_info.retdata))
+        return invoke_function.contract_address, tx_hash, { "result": adapted_result }
+
+    async def __invoke(self, invoke_function: InvokeFunction):
         state = await self.get_state()
         invoke_transaction: InternalInvokeFunction = InternalInvokeFunction.from_external(invoke_function, state.general_config)
 
@@ -296,33 +765,39 @@ class StarknetWrapper:
             )
             status = TransactionStatus.ACCEPTED_ON_L2
             error_message = None
-            state_update = await self.__update_state()
         except StarkException as err:
             error_message = err.message
             status = TransactionStatus.REJECTED
             execution_info = DummyExecutionInfo()
             adapted_result = []
-            state_update = None
 
         transaction = DevnetTransaction(invoke_transaction, status, execution_info)
         tx_hash = transaction.transaction_hash
 
         await self.__store_transaction(
             transaction=transaction,
-            state_update=state_update,
             error_message=error_message,
             tx_hash=tx_hash
         )
 
         await self.__register_new_contracts(execution_info.call_info.internal_calls, tx_hash)
 
-        return invoke_function.contract_address, tx_hash, { "result": adapted_result }
+        return invoke_function.contract_address, tx_hash, { "result": adapted_result }, execution_info
 
     async def call(self, transaction: InvokeFunction):
         """Perform call according to specifications in `transaction`."""
+        result_dict, _ = await self.call_and_get_accessed_addresses(transaction)
+        return result_dict
+
+    async def call_and_get_accessed_addresses(self, transaction: InvokeFunction):
+        """
+        Perform call according to specifications in `transaction`.
+        Returns the result dict and the addresses of the contracts accessed by the call;
+        None instead of the addresses if the call may read the block info, so its result mustn't be cached.
+        """
         contract_wrapper = self.contracts.get_by_address(transaction.contract_address)
 
-        adapted_result = await contract_wrapper.call(
+        adapted_result, call_info = await contract_wrapper.call(
             entry_point_selector=transaction.entry_point_selector,
             calldata=transaction.calldata,
             signature=transaction.signature,
@@ -330,9 +805,48 @@ class StarknetWrapper:
             max_fee=transaction.max_fee
         )
 
-        return { "result": adapted_result }
+        accessed = StateChanges()
+        accessed.add_call_info(call_info)
+
+        if any(self.contracts.reads_block_info(int.from_bytes(class_hash, "big")) for class_hash in accessed.class_hashes):
+            return { "result": adapted_result }, None
+
+        return { "result": adapted_result }, accessed.addresses
+
+    async def call_rows(self, transaction: InvokeFunction, calldata_rows: List[List[int]]) -> List[dict]:
+        """
+        Performs the call specified with `transaction` once per row of `calldata_rows`, instead of its calldata.
+        Returns, per row, the result dict, or the error dict if the call failed; see `ContractWrapper.call_rows`.
+        """
+        contract_wrapper = self.contracts.get_by_address(transaction.contract_address)
+
+        rows = await contract_wrapper.call_rows(
+            entry_point_selector=transaction.entry_point_selector,
+            calldata_rows=calldata_rows,
+            signature=transaction.signature,
+            caller_address=0,
+            max_fee=transaction.max_fee
+        )
+
+        return [
+            { "result": result } if error is None else { "message": error.message, "status_code": error.status_code }
+            for result, error in rows
+        ]
 
+    async def call_all(self, transactions: List[InvokeFunction]):
+        """
+        Performs the calls specified with `transactions`, in order, against the same state.
+        Returns, per call, the result dict and the addresses of the accessed contracts;
+        or the error dict and None if the call failed.
+        """
+        call_results = []
+        for transaction in transactions:
+            try:
+                call_results.append(await self.call_and_get_accessed_addresses(transaction))
+            except StarkException as error:
+                call_results.append(({ "message": error.message, "status_code": error.status_code }, None))
 
+        return call_results
 
     async def __register_new_contracts(self, internal_calls: List[Union[FunctionInvocation, CallInfo]], tx_hash: int):
         for internal_call in internal_calls:
@@ -373,26 +887,123 @@ class StarknetWrapper:
     async def calculate_actual_fee(self, external_tx: InvokeFunction):
         """Calculates actual fee"""
         state = await self.get_state()
-        internal_tx = InternalInvokeFunction.from_external_query_tx(external_tx, state.general_config)
-
         child_state = state.state.create_child_state_for_querying()
-        call_info = await internal_tx.execute(child_state, state.general_config, only_query=True)
+
+        return await self.__estimate_fee(external_tx, child_state, state.general_config)
+
+    async def estimate_fee_bulk(self, transactions: List[InvokeFunction], sequential: bool = False) -> List[dict]:
+        """
+        Calculates the fees of `transactions`, in order, against the same copy of the current state.
+        If `sequential`, each transaction is estimated against the state resulting from the preceding ones,
+        otherwise they don't affect each other. The state of the devnet is left unchanged either way.
+        Returns, per transaction, the fee estimation, or the error dict if the estimation failed.
+        """
+        state = await self.get_state()
+        general_config = state.general_config
+        query_state = state.state.create_child_state_for_querying()
+
+        fee_estimations = []
+        for transaction in transactions:
+            try:
+                if sequential:
+                    # applied to the query state only if the estimation succeeds
+                    with query_state.copy_and_apply() as tx_state:
+                        fee_estimation = await self.__estimate_fee(transaction, tx_state, general_config)
+                else:
+                    tx_state = query_state.create_child_state_for_querying()
+                    fee_estimation = await self.__estimate_fee(transaction, tx_state, general_config)
+            except StarkException as error:
+                fee_estimation = { "message": error.message, "status_code": error.status_code }
+
+            fee_estimations.append(fee_estimation)
+
+        return fee_estimations
+
+    @staticmethod
+    async def __estimate_fee(
+        external_tx: InvokeFunction, tx_state: CarriedState, general_config: StarknetGeneralConfig
+    ) -> dict:
+        """Executes `external_tx` in `tx_state`, a child state, and returns its fee estimation."""
+        internal_tx = InternalInvokeFunction.from_external_query_tx(external_tx, general_config)
+        call_info = await internal_tx.execute(tx_state, general_config, only_query=True)
 
         tx_fee = calculate_tx_fee(
-            state=child_state,
+            state=tx_state,
             call_info=call_info,
-            general_config=state.general_config
+            general_config=general_config
         )
 
-        gas_price = state.state.block_info.gas_price
-        gas_usage = tx_fee // gas_price
+        return get_fee_estimation(tx_fee, tx_state.block_info.gas_price)
+
+    async def simulate_transactions(self, transactions: List[Union[Declare, Deploy, InvokeFunction]]) -> List[dict]:
+        """
+        Executes `transactions` in order, each against the state resulting from the preceding ones,
+        without committing any of them: no transactions, blocks, state commitments or classes are stored.
+        Returns, per transaction, its hash, result (retdata), fee estimation, events and trace;
+        or its hash and the error dict if it was rejected, in which case it has no effect on the following transactions.
+        """
+        state = await self.get_state()
+        general_config = state.general_config
+        sequence_state = state.state.create_child_state_for_querying()
+        # the facts of the declared and deployed classes are needed for execution, but are only written to the overlay
+        sequence_state.ffc = FactFetchingContext(
+            storage=OverlayStorage(sequence_state.ffc.storage),
+            hash_func=sequence_state.ffc.hash_func,
+            n_workers=sequence_state.ffc.n_workers
+        )
 
-        return {
-            "overall_fee": tx_fee,
-            "unit": "wei",
-            "gas_price": gas_price,
-            "gas_usage": gas_usage,
-        }
+        simulation_results = []
+        for transaction in transactions:
+            internal_tx = InternalTransaction.from_external(transaction, general_config)
+            simulation_result = { "transaction_hash": hex(internal_tx.hash_value) }
+
+            contract_class = None
+            if isinstance(transaction, Declare):
+                contract_class = transaction.contract_class
+                simulation_result["class_hash"] = hex(int.from_bytes(to_bytes(internal_tx.class_hash), "big"))
+            elif isinstance(transaction, Deploy):
+                contract_class = transaction.contract_definition
+                simulation_result["address"] = fixed_length_hex(internal_tx.contract_address)
+
+            try:
+                if contract_class is not None:
+                    await write_contract_class_fact(contract_class=contract_class, ffc=sequence_state.ffc)
+
+                # each transaction is applied in a child state, so that its fee is calculated from its own changes
+                with sequence_state.copy_and_apply() as tx_state:
+                    execution_info = await internal_tx.apply_state_updates(tx_state, general_config)
+
+                    tx_fee = execution_info.actual_fee
+                    if isinstance(transaction, InvokeFunction) and not tx_fee:
+                        tx_fee = calculate_tx_fee(
+                            state=tx_state,
+                            call_info=execution_info.call_info,
+                            general_config=general_config
+                        )
+            except StarkException as error:
+                simulation_result["status"] = TransactionStatus.REJECTED.name
+                simulation_result.update({ "message": error.message, "status_code": error.status_code })
+                simulation_results.append(simulation_result)
+                continue
+
+            simulated = DevnetTransaction(internal_tx, TransactionStatus.ACCEPTED_ON_L2, execution_info)
+            simulation_result.update({
+                "status": TransactionStatus.ACCEPTED_ON_L2.name,
+                "result": list(map(hex, execution_info.call_info.retdata)),
+                "fee_estimation": get_fee_estimation(tx_fee, sequence_state.block_info.gas_price),
+                "events": [
+                    {
+                        "from_address": fixed_length_hex(event.from_address),
+                        "keys": list(map(hex, event.keys)),
+                        "data": list(map(hex, event.data)),
+                    }
+                    for event in execution_info.get_sorted_events()
+                ],
+                "trace": simulated.get_trace().dump(),
+            })
+            simulation_results.append(simulation_result)
+
+        return simulation_results
 
     def increase_block_time(self, time_s: int):
         """Increases the block time by `time_s`."""
@@ -2,13 +2,26 @@
 Global state singletone
 """
 
+import dataclasses
+import hashlib
+import os
 import random
 import sys
+import threading
+from typing import Dict
 
-from starkware.crypto.signature.signature import private_to_stark_key
-
+import cloudpickle as pickle
+from . import __version__
 from .account import Account
+from .account_keys import AccountKeysCache, derive_all_keys
+from .constants import CAIRO_LANG_VERSION
 from .dump import Dumper
+from .call_cache import CallCache
+from .call_pool import CallPool
+from .fee_token import FeeToken
+from .mempool import Mempool
+from .restart_pool import RestartPool
+from .speculative_execution import SpeculativeExecutor
 from .starknet_wrapper import StarknetWrapper, DevnetConfig
 
 class State():
@@ -18,39 +31,153 @@ class State():
     def __init__(self):
         self.starknet_wrapper = StarknetWrapper(config=DevnetConfig())
         self.dumper = Dumper(self.starknet_wrapper)
+        self.lock = threading.Lock()
+        """
+        Serializes the changes of the state, made by the requests changing it, the block producer and the mempool sequencer,
+        and the executions against the live state, like the in-process calls.
+        Async request handlers run in a different thread than the one which acquired the lock for the request,
+        so it mustn't be bound to its owner thread, as opposed to a reentrant lock.
+        """
+
+        self.genesis_cache_dir: str = None
+        """Directory where genesis images are cached; if None, they are only kept in memory."""
+        self.__genesis_images: Dict[str, bytes] = {}
+        self.restart_pool: RestartPool = None
+        """Pool of wrappers prepared for restarts; if None, restarting clones the genesis image synchronously."""
+        self.mempool: Mempool = None
+        """Queue of the received transactions; if None, transactions are executed on receipt."""
+        self.call_pool: CallPool = None
+        """Processes running calls and fee estimations; if None, they are run in-process."""
+        self.speculative_executor: SpeculativeExecutor = None
+        """Processes executing batched invokes in parallel; if None, they are executed one by one."""
+        self.call_cache: CallCache = None
+        """Results of the calls to the current starknet wrapper; if None, calls are always executed."""
+        self.__genesis_key: str = None
 
     def __set_starknet_wrapper(self, starknet_wrapper: StarknetWrapper):
         """Sets starknet wrapper and creates new instance of dumper"""
         self.starknet_wrapper = starknet_wrapper
         self.dumper = Dumper(starknet_wrapper)
 
+        # the cached results are validated against the write versions of the previous wrapper
+        if self.call_cache is not None:
+            self.call_cache.clear()
+
+        # the fee token contract is bound to the state of the wrapper it was deployed in
+        if starknet_wrapper.contracts.is_deployed(FeeToken.ADDRESS):
+            FeeToken.contract = starknet_wrapper.contracts.get_by_address(FeeToken.ADDRESS).contract
+
+    async def initialize(self):
+        """
+        Initializes the starknet wrapper if it hasn't been initialized yet.
+        The initialized wrapper is cloned from the genesis image of its configuration,
+        which is built and cached on the first initialization.
+        """
+        if self.starknet_wrapper.is_initialized():
+            return
+
+        self.__genesis_key = self.__get_genesis_key()
+        genesis_image = self.__get_genesis_image(self.__genesis_key)
+
+        if genesis_image is None:
+            await self.starknet_wrapper.initialize()
+            genesis_image = pickle.dumps(self.starknet_wrapper)
+            self.__store_genesis_image(self.__genesis_key, genesis_image)
+        else:
+            self.__set_starknet_wrapper(pickle.loads(genesis_image))
+
+        if self.restart_pool is not None:
+            self.restart_pool.set_genesis(self.__genesis_key, genesis_image)
+
+    def __get_genesis_key(self) -> str:
+        """Returns the identifier of everything the genesis depends on."""
+        starknet_wrapper = self.starknet_wrapper
+        genesis_parameters = (
+            __version__,
+            CAIRO_LANG_VERSION,
+            dataclasses.astuple(starknet_wrapper.config),
+            [(account.private_key, account.initial_balance) for account in starknet_wrapper.accounts],
+            sorted(vars(starknet_wrapper.block_info_generator).items()),
+        )
+        return hashlib.sha256(repr(genesis_parameters).encode()).hexdigest()
+
+    def __get_genesis_image_path(self, genesis_key: str) -> str:
+        return os.path.join(self.genesis_cache_dir, f"genesis-{genesis_key}.pkl")
+
+    def __get_genesis_image(self, genesis_key: str) -> bytes:
+        """Returns the genesis image from memory or from the cache directory; None if there is no such image."""
+        if genesis_key in self.__genesis_images:
+            return self.__genesis_images[genesis_key]
+
+        if self.genesis_cache_dir is None:
+            return None
+
+        try:
+            with open(self.__get_genesis_image_path(genesis_key), "rb") as file:
+                genesis_image = file.read()
+        except FileNotFoundError:
+            return None
+
+        self.__genesis_images[genesis_key] = genesis_image
+        return genesis_image
+
+    def __store_genesis_image(self, genesis_key: str, genesis_image: bytes):
+        self.__genesis_images[genesis_key] = genesis_image
+
+        if self.genesis_cache_dir is not None:
+            os.makedirs(self.genesis_cache_dir, exist_ok=True)
+            with open(self.__get_genesis_image_path(genesis_key), "wb") as file:
+                file.write(genesis_image)
+
     async def reset(self, config: DevnetConfig = None):
         """Reset the starknet wrapper and dumper instances"""
-        previous_config = self.starknet_wrapper.config
-        self.__set_starknet_wrapper(StarknetWrapper(config=config or previous_config))
-        await self.starknet_wrapper.initialize()
+        previous_wrapper = self.starknet_wrapper
+        if self.mempool is not None:
+            self.mempool.clear()
+
+        if (config is None or config == previous_wrapper.config) and self.__genesis_key in self.__genesis_images:
+            starknet_wrapper = self.restart_pool and self.restart_pool.take(self.__genesis_key)
+            self.__set_starknet_wrapper(starknet_wrapper or pickle.loads(self.__genesis_images[self.__genesis_key]))
+            return
+
+        starknet_wrapper = StarknetWrapper(config=config or previous_wrapper.config)
+        starknet_wrapper.accounts = previous_wrapper.accounts
+        self.__set_starknet_wrapper(starknet_wrapper)
+        await self.initialize()
 
     def load(self, load_path: str):
         """Loads starknet wrapper from path"""
         self.__set_starknet_wrapper(StarknetWrapper.load(load_path))
 
-    def generate_accounts(self, n_accounts: int, initial_balance: int, seed: int):
-        """Generates accounts without deploying them"""
+    def generate_accounts(self, n_accounts: int, initial_balance: int, seed: int, cache_dir: str = None):
+        """
+        Generates accounts without deploying them.
+        If `seed` and `cache_dir` are provided, the derived keys are cached in `cache_dir`.
+        """
         random_generator = random.Random()
 
+        keys_cache = None
         if seed is None:
             seed = random_generator.getrandbits(32)
+        elif cache_dir is not None:
+            keys_cache = AccountKeysCache(cache_dir, seed)
         random_generator.seed(seed)
 
-        accounts = []
-        for i in range(n_accounts):
-            private_key = random_generator.getrandbits(128)
-            public_key = private_to_stark_key(private_key)
+        private_keys = [random_generator.getrandbits(128) for _ in range(n_accounts)]
 
+        keys = keys_cache.load(private_keys) if keys_cache else []
+        n_cached = len(keys)
+        keys += derive_all_keys(private_keys[n_cached:])
+        if keys_cache and n_cached < n_accounts:
+            keys_cache.store(private_keys, keys)
+
+        accounts = []
+        for i, (private_key, (public_key, address)) in enumerate(zip(private_keys, keys)):
             account = Account(
                 private_key=private_key,
                 public_key=public_key,
-                initial_balance=initial_balance
+                initial_balance=initial_balance,
+                address=address
             )
             accounts.append(account)
 
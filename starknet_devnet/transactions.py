@@ -2,7 +2,7 @@
 Classes for storing and handling transactions.
 """
 
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from web3 import Web3
 
@@ -157,6 +157,13 @@ class DevnetTransactions:
     def __init__(self, origin: Origin):
         self.origin = origin
         self.__instances: Dict[int, DevnetTransaction] = {}
+        self.__received: Dict[int, InternalTransaction] = {}
+        """The transactions waiting in the mempool, by their hashes."""
+        self.__journal: Optional[List[Tuple[int, Optional[DevnetTransaction]]]] = None
+        """
+        The hash of each transaction stored since the first revision was obtained, together with the transaction it replaced.
+        None until then, so the transactions aren't journaled unless there is a snapshot to revert to.
+        """
 
     def __get_transaction_by_hash(self, tx_hash: str) -> DevnetTransaction or None:
         """
@@ -165,6 +172,21 @@ class DevnetTransactions:
         numeric_hash = int(tx_hash, 16)
         return self.__instances.get(numeric_hash)
 
+    def __is_received(self, tx_hash: str) -> bool:
+        return int(tx_hash, 16) in self.__received
+
+    def receive(self, tx_hash: int, internal_tx: InternalTransaction):
+        """
+        Mark a transaction as received, i.e. waiting to be executed.
+        """
+        self.__received[tx_hash] = internal_tx
+
+    def discard_received(self, tx_hash: int):
+        """
+        Unmark a received transaction which won't be stored.
+        """
+        self.__received.pop(tx_hash, None)
+
     def get_count(self):
         """
         Get the number of transactions.
@@ -175,7 +197,31 @@ class DevnetTransactions:
         """
         Store a transaction.
         """
+        if self.__journal is not None:
+            self.__journal.append((tx_hash, self.__instances.get(tx_hash)))
         self.__instances[tx_hash] = transaction
+        self.__received.pop(tx_hash, None)
+
+    def get_revision(self) -> int:
+        """
+        Get the revision of the stored transactions, to be passed to `revert`.
+        The transactions stored from then on are journaled, so that they can be reverted.
+        """
+        if self.__journal is None:
+            self.__journal = []
+        return len(self.__journal)
+
+    def revert(self, revision: int):
+        """
+        Undo the storing of the transactions stored after `revision` was obtained.
+        A transaction which replaced one with the same hash is replaced back.
+        """
+        while len(self.__journal) > revision:
+            tx_hash, replaced_transaction = self.__journal.pop()
+            if replaced_transaction is None:
+                del self.__instances[tx_hash]
+            else:
+                self.__instances[tx_hash] = replaced_transaction
 
     def get_transaction(self, tx_hash: str):
         """
@@ -184,6 +230,10 @@ class DevnetTransactions:
         transaction = self.__get_transaction_by_hash(tx_hash)
 
         if transaction is None:
+            # read once, since the sequencer thread may store the transaction in the meantime
+            received_tx = self.__received.get(int(tx_hash, 16))
+            if received_tx is not None:
+                return TransactionInfo.create(status=TransactionStatus.RECEIVED, transaction=received_tx)
             return self.origin.get_transaction(tx_hash)
 
         return transaction.get_tx_info()
@@ -207,6 +257,20 @@ class DevnetTransactions:
         transaction = self.__get_transaction_by_hash(tx_hash)
 
         if transaction is None:
+            if self.__is_received(tx_hash):
+                return TransactionReceipt(
+                    status=TransactionStatus.RECEIVED,
+                    transaction_hash=int(tx_hash, 16),
+                    events=[],
+                    l2_to_l1_messages=[],
+                    block_hash=None,
+                    block_number=None,
+                    transaction_index=None,
+                    execution_resources=None,
+                    actual_fee=None,
+                    transaction_failure_reason=None,
+                    l1_to_l2_consumed_message=None
+                )
             return self.origin.get_transaction_receipt(tx_hash)
 
         return transaction.get_receipt()
@@ -218,6 +282,8 @@ class DevnetTransactions:
         transaction = self.__get_transaction_by_hash(tx_hash)
 
         if transaction is None:
+            if self.__is_received(tx_hash):
+                return {"tx_status": TransactionStatus.RECEIVED.name}
             return self.origin.get_transaction_status(tx_hash)
 
         tx_info = transaction.get_tx_info()
@@ -20,6 +20,7 @@ from . import __version__
 from .constants import (
     DEFAULT_ACCOUNTS,
     DEFAULT_GAS_PRICE,
+    DEFAULT_HASH_BATCH_THRESHOLD,
     DEFAULT_HOST,
     DEFAULT_INITIAL_BALANCE,
     DEFAULT_PORT
@@ -96,6 +97,18 @@ class NonNegativeAction(argparse.Action):
 
         setattr(namespace, self.dest, value)
 
+class PositiveAction(argparse.Action):
+    """
+    Action for parsing the positive int argument.
+    """
+    def __call__(self, parser, namespace, values, option_string=None):
+        value = int(values)
+
+        if value <= 0:
+            parser.error(f"{option_string} must be a positive integer.")
+
+        setattr(namespace, self.dest, value)
+
 def parse_args():
     """
     Parses CLI arguments.
@@ -147,6 +160,29 @@ def parse_args():
         action='store_true',
         help="Disables deploy tx hash calculation"
     )
+    parser.add_argument(
+        "--lazy-commitment",
+        action='store_true',
+        help="Defers the state commitment and block hash calculation until block data is requested"
+    )
+    parser.add_argument(
+        "--pipelined-commitment",
+        action='store_true',
+        help="Calculates the state commitment and block hash in a background thread; implies --lazy-commitment"
+    )
+    parser.add_argument(
+        "--hash-workers",
+        action=PositiveAction,
+        help="Specify the number of processes for hashing large state commitment updates; " +
+             "by default hashing is done in-process"
+    )
+    parser.add_argument(
+        "--hash-batch-threshold",
+        action=PositiveAction,
+        default=DEFAULT_HASH_BATCH_THRESHOLD,
+        help="Specify the minimum number of hashes to be calculated by the --hash-workers processes; " +
+             f"defaults to {DEFAULT_HASH_BATCH_THRESHOLD}"
+    )
     parser.add_argument(
         "--accounts",
         type=int,
@@ -165,6 +201,32 @@ def parse_args():
         type=int,
         help="Specify the seed for randomness of accounts to be predeployed"
     )
+    parser.add_argument(
+        "--account-cache-dir",
+        help="Specify the directory where the keys of the accounts generated with --seed are cached between runs"
+    )
+    parser.add_argument(
+        "--genesis-cache-dir",
+        help="Specify the directory where the state after the genesis is cached between runs; " +
+             "by default it is cached in memory only"
+    )
+    parser.add_argument(
+        "--class-hash-cache-dir",
+        help="Specify the directory where the hashes of the declared and deployed classes are cached between runs"
+    )
+    parser.add_argument(
+        "--restart-pool-size",
+        type=int,
+        action=NonNegativeAction,
+        help="Specify the number of initialized states prepared in the background for restarts; " +
+             "by default states are not prepared"
+    )
+    parser.add_argument(
+        "--restart-pool-memory",
+        type=int,
+        action=PositiveAction,
+        help="Specify the estimated memory limit in MB of the states prepared for restarts; defaults to no limit"
+    )
     parser.add_argument(
         "--start-time",
         action=NonNegativeAction,
@@ -177,6 +239,42 @@ def parse_args():
         help="Specify the gas price in wei per gas unit; " +
              f"defaults to {DEFAULT_GAS_PRICE:g}"
     )
+    parser.add_argument(
+        "--block-interval",
+        action=PositiveAction,
+        help="Specify the interval in milliseconds at which the pending block is sealed; " +
+             "by default each accepted transaction is sealed in its own block"
+    )
+    parser.add_argument(
+        "--max-txs-per-block",
+        action=PositiveAction,
+        help="Specify the number of transactions at which the pending block is sealed; " +
+             "defaults to 1, or no limit if --block-interval is present"
+    )
+    parser.add_argument(
+        "--call-workers",
+        action=PositiveAction,
+        help="Specify the number of processes running calls and fee estimations against the state " +
+             "of the last sealed block; by default they are run in-process against the current state"
+    )
+    parser.add_argument(
+        "--call-cache-size",
+        action=PositiveAction,
+        help="Specify the number of call results cached until the called contracts are written to; " +
+             "by default call results are not cached"
+    )
+    parser.add_argument(
+        "--speculative-workers",
+        action=PositiveAction,
+        help="Specify the number of processes executing the consecutive invokes of a transaction batch " +
+             "in parallel; by default they are executed one by one"
+    )
+    parser.add_argument(
+        "--mempool-size",
+        action=PositiveAction,
+        help="Specify the number of received transactions which can wait to be executed in the background; " +
+             "by default transactions are executed on receipt"
+    )
     # Uncomment this once fork support is added
     # parser.add_argument(
     #     "--fork", "-f",
@@ -189,6 +287,9 @@ def parse_args():
     if args.dump_on and not args.dump_path:
         sys.exit("Error: --dump-path required if --dump-on present")
 
+    if args.mempool_size and (args.lite_mode or args.lite_mode_deploy_hash):
+        sys.exit("Error: --mempool-size can't be combined with --lite-mode or --lite-mode-deploy-hash")
+
     return args
 
 class StarknetDevnetException(StarkException):
@@ -241,13 +342,18 @@ def enable_pickling():
     StarknetContract.__getstate__ = contract_getstate
     StarknetContract.__setstate__ = contract_setstate
 
-def generate_storage_diff(previous_storage_updates, storage_updates) -> List[StorageEntry]:
+def generate_storage_diff(previous_storage_updates, storage_updates, keys=None) -> List[StorageEntry]:
     """
-    Returns storage diff between previous and current storage updates
+    Returns storage diff between previous and current storage updates.
+    If `keys` are provided, only they are compared.
     """
     storage_diff = []
 
-    for storage_key, leaf in storage_updates.items():
+    for storage_key in (storage_updates if keys is None else sorted(keys)):
+        leaf = storage_updates.get(storage_key)
+        if leaf is None:
+            continue
+
         previous_leaf = previous_storage_updates.get(storage_key) if previous_storage_updates else None
 
         if previous_leaf is None or previous_leaf.value != leaf.value:
@@ -260,21 +366,22 @@ def generate_storage_diff(previous_storage_updates, storage_updates) -> List[Sto
     return storage_diff
 
 
-def generate_state_update(previous_state: CarriedState, current_state: CarriedState) -> BlockStateUpdate:
+def generate_state_update(previous_state: CarriedState, current_state: CarriedState, changes) -> BlockStateUpdate:
     """
-    Returns roots, deployed contracts and storage diffs between 2 states
+    Returns roots, deployed contracts and storage diffs between 2 states.
+    Only the entries marked as touched in `changes` are compared, the rest of the states is not visited.
     """
     deployed_contracts: List[DeployedContract] = []
     declared_contracts: List[int] = []
     storage_diffs: Dict[int, List[StorageEntry]] = {}
 
-    for class_hash in current_state.contract_definitions:
-        if class_hash not in previous_state.contract_definitions:
+    for class_hash in sorted(changes.class_hashes):
+        if class_hash in current_state.contract_definitions and class_hash not in previous_state.contract_definitions:
             declared_contracts.append(
                 int.from_bytes(class_hash, byteorder="big")
             )
 
-    for contract_address in current_state.contract_states:
+    for contract_address in sorted(changes.addresses):
         if contract_address not in previous_state.contract_states:
             class_hash = int.from_bytes(
                 current_state.contract_states[contract_address].state.contract_hash,
@@ -289,7 +396,11 @@ def generate_state_update(previous_state: CarriedState, current_state: CarriedSt
         else:
             previous_storage_updates = previous_state.contract_states[contract_address].storage_updates
             storage_updates = current_state.contract_states[contract_address].storage_updates
-            storage_diff = generate_storage_diff(previous_storage_updates, storage_updates)
+            storage_diff = generate_storage_diff(
+                previous_storage_updates,
+                storage_updates,
+                keys=changes.storage_keys.get(contract_address, ())
+            )
 
             if len(storage_diff) > 0:
                 storage_diffs[contract_address] = storage_diff
@@ -316,6 +427,25 @@ def to_bytes(value: Union[int, bytes]) -> bytes:
     """
     return value if isinstance(value, bytes) else value.to_bytes(32, "big")
 
+def get_fee_estimation(tx_fee: int, gas_price: int) -> dict:
+    """Returns the fee estimation response of a transaction with the fee of `tx_fee` wei."""
+    return {
+        "overall_fee": tx_fee,
+        "unit": "wei",
+        "gas_price": gas_price,
+        "gas_usage": tx_fee // gas_price,
+    }
+
+def lru_cache_stats(cached_function) -> dict:
+    """Returns the statistics of a function decorated with `functools.lru_cache`."""
+    cache_info = cached_function.cache_info()
+    return {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "max_size": cache_info.maxsize,
+    }
+
 def check_valid_dump_path(dump_path: str):
     """Checks if dump path is a directory. Raises ValueError if not."""
 
@@ -0,0 +1,53 @@
+"""
+Benchmark of submitting transactions one by one against submitting them in batches.
+The same invoke transactions are sent to a fresh Devnet one per request, in batches, and in batches of single blocks.
+"""
+
+import argparse
+
+from test.util import run_devnet_in_background, terminate_and_wait
+
+from .shared import deploy_tx, invoke_tx, send_transaction, send_transactions, timed
+
+def send_one_by_one(tx_dicts: list, _batch_size: int):
+    """Sends each of `tx_dicts` in its own request."""
+    for tx_dict in tx_dicts:
+        send_transaction(tx_dict)
+
+def send_in_batches(tx_dicts: list, batch_size: int, single_block=False):
+    """Sends `tx_dicts` in requests of `batch_size` transactions."""
+    for start in range(0, len(tx_dicts), batch_size):
+        responses = send_transactions(tx_dicts[start:start + batch_size], single_block=single_block)
+        assert len(responses) == len(tx_dicts[start:start + batch_size])
+
+def send_in_single_blocks(tx_dicts: list, batch_size: int):
+    """Sends `tx_dicts` in requests of `batch_size` transactions, each request producing one block."""
+    send_in_batches(tx_dicts, batch_size, single_block=True)
+
+def run(title: str, send, n_txs: int, batch_size: int, devnet_args: list):
+    """Sends `n_txs` invokes with `send` and reports the throughput."""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        contract_address = send_transaction(deploy_tx(salt=0))["address"]
+        tx_dicts = [invoke_tx(contract_address) for _ in range(n_txs)]
+
+        elapsed, _ = timed(send, tx_dicts, batch_size)
+        print(f"  {title:<24} {elapsed:8.2f} s ({n_txs / elapsed:8.2f} tx/s)")
+    finally:
+        terminate_and_wait(proc)
+
+def main():
+    """Parses the arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--txs", type=int, default=1000, help="Number of transactions to send")
+    parser.add_argument("--batch-size", type=int, default=100, help="Number of transactions per batch request")
+    # unknown arguments are passed to Devnet
+    args, devnet_args = parser.parse_known_args()
+
+    print(f"{args.txs} transactions, batches of {args.batch_size} {' '.join(devnet_args)}")
+    run("one by one", send_one_by_one, args.txs, args.batch_size, devnet_args)
+    run("batched", send_in_batches, args.txs, args.batch_size, devnet_args)
+    run("batched, single blocks", send_in_single_blocks, args.txs, args.batch_size, devnet_args)
+
+if __name__ == "__main__":
+    main()
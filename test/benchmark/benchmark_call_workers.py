@@ -0,0 +1,74 @@
+"""
+Benchmark of batch reads executed in-process against executing them in the call workers.
+Each round sends an invoke, so the workers are forked anew, followed by a batch of calls and a batch of fee estimations.
+The Devnet is run once without and once with the call workers; the number of workers is set with `--call-workers`.
+"""
+
+import argparse
+import json
+
+import requests
+
+from test.settings import APP_URL
+from test.util import load_file_content, run_devnet_in_background, terminate_and_wait
+
+from .shared import deploy_tx, invoke_tx, send_transaction, timed
+
+CALL_CONTENT = load_file_content("call.json")
+
+def call_tx(contract_address: str) -> dict:
+    """Returns the dict of the get_balance call of the contract at `contract_address`."""
+    tx_dict = json.loads(CALL_CONTENT)
+    tx_dict["contract_address"] = contract_address
+    return tx_dict
+
+def post_batch(path: str, tx_dicts: list) -> list:
+    """Posts `tx_dicts` to the feeder gateway endpoint at `path` and returns the parsed responses."""
+    resp = requests.post(f"{APP_URL}/feeder_gateway/{path}", json=tx_dicts)
+    assert resp.status_code == 200, resp.text
+    responses = resp.json()
+    assert len(responses) == len(tx_dicts)
+    assert all("message" not in response for response in responses), responses
+    return responses
+
+def run(title: str, n_calls: int, n_rounds: int, devnet_args: list):
+    """Sends `n_rounds` of an invoke and batches of `n_calls` calls and fee estimations, and reports the durations."""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        contract_address = send_transaction(deploy_tx(salt=0))["address"]
+        call_dicts = [call_tx(contract_address) for _ in range(n_calls)]
+        estimate_dicts = [invoke_tx(contract_address) for _ in range(n_calls)]
+
+        call_time = estimate_time = 0
+        for _ in range(n_rounds):
+            send_transaction(invoke_tx(contract_address))
+            elapsed, _ = timed(post_batch, "call_contracts", call_dicts)
+            call_time += elapsed
+            elapsed, _ = timed(post_batch, "estimate_fee_bulk", estimate_dicts)
+            estimate_time += elapsed
+
+        n_reads = n_calls * n_rounds
+        print(
+            f"  {title:<16}"
+            f" calls: {call_time:8.2f} s ({n_reads / call_time:8.2f} calls/s)"
+            f" estimations: {estimate_time:8.2f} s ({n_reads / estimate_time:8.2f} estimations/s)"
+        )
+    finally:
+        terminate_and_wait(proc)
+
+def main():
+    """Parses the arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000, help="Number of calls and fee estimations per batch")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of rounds of an invoke and the batches")
+    parser.add_argument("--call-workers", type=int, default=4, help="Number of call workers of the second run")
+    # unknown arguments are passed to Devnet
+    args, devnet_args = parser.parse_known_args()
+
+    print(f"{args.rounds} rounds of {args.calls} calls and estimations {' '.join(devnet_args)}")
+    run("in-process", args.calls, args.rounds, devnet_args)
+    run(f"{args.call_workers} call workers", args.calls, args.rounds,
+        [*devnet_args, "--call-workers", str(args.call_workers)])
+
+if __name__ == "__main__":
+    main()
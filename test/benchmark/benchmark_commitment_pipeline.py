@@ -0,0 +1,56 @@
+"""
+Benchmark of serial against pipelined state commitment.
+The same transactions are sent to a Devnet committing the state on the request path
+and to a Devnet committing it in a background thread. Both have to end up with the same state root.
+"""
+
+import argparse
+
+import requests
+
+from test.settings import APP_URL
+from test.util import run_devnet_in_background, terminate_and_wait
+
+from .shared import deploy_tx, invoke_tx, send_transaction, timed
+
+def send_transactions(n_txs: int):
+    """Deploys a contract and invokes it until `n_txs` transactions are sent."""
+    contract_address = send_transaction(deploy_tx(salt=0))["address"]
+    for _ in range(n_txs - 1):
+        send_transaction(invoke_tx(contract_address))
+
+def get_latest_state_update() -> dict:
+    """Returns the latest state update, which requires all of the blocks to be committed."""
+    resp = requests.get(f"{APP_URL}/feeder_gateway/get_state_update")
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def run(n_txs: int, devnet_args: list) -> str:
+    """Sends `n_txs` transactions, reports the elapsed times and returns the final state root."""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        send_time, _ = timed(send_transactions, n_txs)
+        commit_time, state_update = timed(get_latest_state_update)
+    finally:
+        terminate_and_wait(proc)
+
+    print(f"{n_txs} transactions {' '.join(devnet_args)}")
+    print(f"  sending:          {send_time:8.2f} s ({n_txs / send_time:.2f} tx/s)")
+    print(f"  until committed:  {send_time + commit_time:8.2f} s ({n_txs / (send_time + commit_time):.2f} tx/s)")
+    return state_update["new_root"]
+
+def main():
+    """Parses the arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--txs", type=int, default=1000, help="Number of transactions to send")
+    # unknown arguments are passed to Devnet
+    args, devnet_args = parser.parse_known_args()
+
+    serial_root = run(args.txs, devnet_args)
+    pipelined_root = run(args.txs, [*devnet_args, "--pipelined-commitment"])
+
+    assert serial_root == pipelined_root, f"State roots differ: {serial_root} != {pipelined_root}"
+    print("State roots match:", serial_root)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of memory growth of a long-running Devnet.
+Every transaction invokes the same contract, so the facts written for the previous states become unreachable.
+The Devnet is run once without and once with periodic garbage collection.
+"""
+
+import argparse
+
+import psutil
+import requests
+
+from test.settings import APP_URL
+from test.util import run_devnet_in_background, terminate_and_wait
+
+from .shared import deploy_tx, invoke_tx, send_transaction
+
+def get_rss_mb(proc) -> float:
+    """Returns the resident memory in MB of `proc` and its child processes."""
+    process = psutil.Process(proc.pid)
+    processes = [process, *process.children(recursive=True)]
+    return sum(process.memory_info().rss for process in processes) / 2 ** 20
+
+def collect_garbage() -> dict:
+    """Removes the unreachable facts and returns the counts of removed and remaining facts."""
+    resp = requests.post(f"{APP_URL}/gc")
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def run(n_txs: int, chunk_size: int, gc_enabled: bool, devnet_args: list):
+    """Sends `n_txs` invokes and reports the memory usage after every `chunk_size` of them."""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        print(f"{n_txs} transactions, garbage collection {'enabled' if gc_enabled else 'disabled'}")
+        contract_address = send_transaction(deploy_tx(salt=0))["address"]
+
+        for i in range(1, n_txs + 1):
+            send_transaction(invoke_tx(contract_address))
+
+            if i % chunk_size == 0:
+                line = f"  txs {i:>6} rss: {get_rss_mb(proc):8.1f} MB"
+                if gc_enabled:
+                    gc_result = collect_garbage()
+                    line += f" removed facts: {gc_result['removed_facts']:>8} remaining: {gc_result['remaining_facts']:>8}"
+                print(line)
+
+        gc_result = collect_garbage()
+        print(f"  unreachable facts at the end: {gc_result['removed_facts']}, reachable: {gc_result['remaining_facts']}")
+    finally:
+        terminate_and_wait(proc)
+
+def main():
+    """Parses the arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--txs", type=int, default=50_000, help="Number of transactions to send")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Number of transactions per reported line")
+    # unknown arguments are passed to Devnet
+    args, devnet_args = parser.parse_known_args()
+
+    run(args.txs, args.chunk_size, gc_enabled=False, devnet_args=devnet_args)
+    run(args.txs, args.chunk_size, gc_enabled=True, devnet_args=devnet_args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark of the startup and restart latency of Devnet.
+Startup is measured twice with the same genesis cache directory: the first run builds the genesis state, the second loads it.
+"""
+
+import argparse
+import tempfile
+
+import requests
+
+from test.settings import APP_URL
+from test.util import run_devnet_in_background, terminate_and_wait
+
+from .shared import deploy_tx, report_latencies, send_transaction, timed
+
+def restart():
+    """Sends the restart request."""
+    resp = requests.post(f"{APP_URL}/restart")
+    assert resp.status_code == 200, resp.text
+
+def get_predeployed_accounts():
+    """Sends the first request, which initializes Devnet."""
+    resp = requests.get(f"{APP_URL}/predeployed_accounts")
+    assert resp.status_code == 200, resp.text
+
+def run(n_restarts: int, devnet_args: list):
+    """Reports the duration of the startup and of `n_restarts` restarts, each preceded by a transaction."""
+    startup_latency, proc = timed(run_devnet_in_background, *devnet_args)
+    try:
+        initialization_latency, _ = timed(get_predeployed_accounts)
+        print(f"  startup: {startup_latency * 1000:8.2f} ms, initialization: {initialization_latency * 1000:8.2f} ms")
+
+        latencies = []
+        for salt in range(n_restarts):
+            send_transaction(deploy_tx(salt))
+            latency, _ = timed(restart)
+            latencies.append(latency)
+
+        report_latencies("  restarts", latencies, chunk_size=n_restarts)
+    finally:
+        terminate_and_wait(proc)
+
+def main():
+    """Parses the arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--restarts", type=int, default=20, help="Number of restarts")
+    # unknown arguments are passed to Devnet
+    args, devnet_args = parser.parse_known_args()
+
+    with tempfile.TemporaryDirectory() as genesis_cache_dir:
+        devnet_args = [*devnet_args, "--genesis-cache-dir", genesis_cache_dir]
+
+        print("Empty genesis cache")
+        run(args.restarts, devnet_args)
+
+        print("Filled genesis cache")
+        run(args.restarts, devnet_args)
+
+if __name__ == "__main__":
+    main()
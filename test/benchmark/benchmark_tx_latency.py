@@ -0,0 +1,42 @@
+"""
+Benchmark of per-transaction latency as the state grows.
+Every other transaction deploys a new contract, so the state keeps growing,
+while the latency of a transaction should stay flat.
+"""
+
+import argparse
+
+from test.util import run_devnet_in_background, terminate_and_wait
+
+from .shared import deploy_tx, invoke_tx, report_latencies, send_transaction, timed
+
+def run(n_txs: int, chunk_size: int, devnet_args: list):
+    """Sends `n_txs` alternating deploys and invokes and reports the latency."""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        latencies = []
+        contract_address = None
+        for i in range(n_txs):
+            if i % 2 == 0:
+                latency, deploy_resp = timed(send_transaction, deploy_tx(salt=i))
+                contract_address = deploy_resp["address"]
+            else:
+                latency, _ = timed(send_transaction, invoke_tx(contract_address))
+            latencies.append(latency)
+
+        report_latencies(f"Latency of {n_txs} transactions {' '.join(devnet_args)}", latencies, chunk_size)
+    finally:
+        terminate_and_wait(proc)
+
+def main():
+    """Parses the arguments and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--txs", type=int, default=10_000, help="Number of transactions to send")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Number of transactions per reported line")
+    # unknown arguments are passed to Devnet
+    args, devnet_args = parser.parse_known_args()
+
+    run(args.txs, args.chunk_size, devnet_args)
+
+if __name__ == "__main__":
+    main()
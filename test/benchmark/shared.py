@@ -0,0 +1,60 @@
+"""
+Functions shared between benchmarks.
+Benchmarks are not collected by pytest; run them from the project root, e.g.:
+poetry run python -m test.benchmark.benchmark_tx_latency
+"""
+
+import json
+import statistics
+import time
+
+import requests
+
+from test.settings import APP_URL
+from test.util import load_file_content
+
+DEPLOY_CONTENT = load_file_content("deploy.json")
+INVOKE_CONTENT = load_file_content("invoke.json")
+
+def send_transaction(tx_dict: dict) -> dict:
+    """Sends `tx_dict` to the gateway and returns the parsed response."""
+    resp = requests.post(f"{APP_URL}/gateway/add_transaction", json=tx_dict)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def send_transactions(tx_dicts: list, single_block=False) -> list:
+    """Sends `tx_dicts` to the gateway in one request and returns the parsed responses."""
+    params = {"singleBlock": "true"} if single_block else {}
+    resp = requests.post(f"{APP_URL}/gateway/add_transactions", json=tx_dicts, params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def deploy_tx(salt: int) -> dict:
+    """Returns a deploy transaction dict using `salt`."""
+    tx_dict = json.loads(DEPLOY_CONTENT)
+    tx_dict["contract_address_salt"] = hex(salt)
+    return tx_dict
+
+def invoke_tx(contract_address: str, amount: int = 10) -> dict:
+    """Returns an invoke transaction dict targeting `contract_address`."""
+    tx_dict = json.loads(INVOKE_CONTENT)
+    tx_dict["contract_address"] = contract_address
+    tx_dict["calldata"] = [str(amount)]
+    return tx_dict
+
+def timed(func, *args, **kwargs):
+    """Runs `func` and returns the number of seconds it took, together with its result."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def report_latencies(title: str, latencies: list, chunk_size: int):
+    """Prints the mean and max latency in ms of every consecutive `chunk_size` latencies."""
+    print(title)
+    for start in range(0, len(latencies), chunk_size):
+        chunk = latencies[start:start + chunk_size]
+        print(
+            f"  txs {start:>6}-{start + len(chunk) - 1:<6}"
+            f" mean: {statistics.mean(chunk) * 1000:8.2f} ms"
+            f" max: {max(chunk) * 1000:8.2f} ms"
+        )
@@ -0,0 +1,14 @@
+%lang starknet
+
+from starkware.cairo.common.cairo_builtins import HashBuiltin
+from starkware.starknet.common.syscalls import get_block_number
+
+@view
+func get_number{
+        syscall_ptr : felt*,
+        pedersen_ptr : HashBuiltin*,
+        range_check_ptr
+    }() -> (block_number: felt):
+    let (block_number) = get_block_number()
+    return (block_number)
+end
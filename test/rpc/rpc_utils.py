@@ -30,6 +30,29 @@ def rpc_call(method: str, params: Union[dict, list]) -> dict:
     return result
 
 
+def rpc_batch_call(requests: list) -> list:
+    """
+    Make a batch of calls to the RPC endpoint; `requests` is a list of (method, params)
+    """
+    req = [
+        {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params,
+            "id": message_id
+        }
+        for message_id, (method, params) in enumerate(requests)
+    ]
+
+    resp = app.test_client().post(
+        "/rpc",
+        content_type="application/json",
+        data=json.dumps(req)
+    )
+    result = json.loads(resp.data.decode("utf-8"))
+    return result
+
+
 def gateway_call(method: str, **kwargs):
     """
     Make a call to the gateway
@@ -5,7 +5,7 @@ Tests RPC rpc_call
 import pytest
 from starkware.starknet.public.abi import get_selector_from_name
 
-from .rpc_utils import rpc_call
+from .rpc_utils import rpc_batch_call, rpc_call
 
 
 def test_call(deploy_info):
@@ -112,3 +112,36 @@ def test_call_raises_on_incorrect_block_hash(deploy_info):
         "code": 24,
         "message": "Invalid block hash"
     }
+
+
+def test_call_batch(deploy_info):
+    """
+    Call contracts in a batch
+    """
+    contract_address: str = deploy_info["address"]
+    params = {
+        "contract_address": contract_address,
+        "entry_point_selector": hex(get_selector_from_name("get_balance")),
+        "calldata": [],
+        "block_hash": "latest"
+    }
+    incorrect_params = {
+        **params,
+        "contract_address": "0x07b529269b82f3f3ebbb2c463a9e1edaa2c6eea8fa308ff70b30398766a2e20c"
+    }
+
+    responses = rpc_batch_call([
+        ("starknet_call", params),
+        ("starknet_call", incorrect_params),
+        ("starknet_nonexistent", {}),
+        ("starknet_call", params),
+    ])
+
+    assert [response["id"] for response in responses] == [0, 1, 2, 3]
+    assert responses[0]["result"]["result"] == ["0x0"]
+    assert responses[1]["error"] == {
+        "code": 20,
+        "message": "Contract not found"
+    }
+    assert responses[2]["error"]["message"] == "Method not found"
+    assert responses[3] == {**responses[0], "id": 3}
@@ -0,0 +1,89 @@
+"""
+Tests RPC estimate fee
+"""
+
+from starkware.starknet.public.abi import get_selector_from_name
+
+from .rpc_utils import rpc_call
+
+
+def estimate_fee_request(contract_address: str) -> dict:
+    """
+    Request of the increase_balance fee estimation of the contract at `contract_address`
+    """
+    return {
+        "contract_address": contract_address,
+        "entry_point_selector": hex(get_selector_from_name("increase_balance")),
+        "calldata": ["0xa"],
+        "signature": [],
+        "max_fee": "0x0",
+        "version": "0x0",
+    }
+
+
+def assert_fee_estimate(fee_estimate: dict):
+    """
+    Check the fields of the fee estimate
+    """
+    assert int(fee_estimate["gas_consumed"], 16) > 0
+    assert int(fee_estimate["overall_fee"], 16) == \
+        int(fee_estimate["gas_consumed"], 16) * int(fee_estimate["gas_price"], 16)
+
+
+def test_estimate_fee(deploy_info):
+    """
+    Estimate fee of invoke
+    """
+    resp = rpc_call(
+        "starknet_estimateFee", params={
+            "request": estimate_fee_request(deploy_info["address"]),
+            "block_hash": "latest"
+        }
+    )
+
+    assert_fee_estimate(resp["result"])
+
+
+# pylint: disable=unused-argument
+def test_estimate_fee_raises_on_incorrect_contract_address(deploy_info):
+    """
+    Estimate fee of invoke of contract with incorrect address
+    """
+    ex = rpc_call(
+        "starknet_estimateFee", params={
+            "request": estimate_fee_request("0x07b529269b82f3f3ebbb2c463a9e1edaa2c6eea8fa308ff70b30398766a2e20c"),
+            "block_hash": "latest"
+        }
+    )
+
+    assert ex["error"] == {
+        "code": 20,
+        "message": "Contract not found"
+    }
+
+
+def test_estimate_fee_bulk(deploy_info):
+    """
+    Estimate fees of many invokes, with a failed estimation among them
+    """
+    request = estimate_fee_request(deploy_info["address"])
+    incorrect_address_request = estimate_fee_request("0x1")
+    single_resp = rpc_call("starknet_estimateFee", params={"request": request, "block_hash": "latest"})
+
+    for sequential in [False, True]:
+        resp = rpc_call(
+            "starknet_estimateFeeBulk", params={
+                "requests": [request, incorrect_address_request, request],
+                "block_hash": "latest",
+                "sequential": sequential
+            }
+        )
+        result = resp["result"]
+
+        assert len(result) == 3
+        assert result[0] == single_resp["result"]
+        assert result[1] == {
+            "code": 20,
+            "message": "Contract not found"
+        }
+        assert result[2] == single_resp["result"]
@@ -1,9 +1,7 @@
 """
 Test account functionality.
 """
-from test.settings import APP_URL
 
-import requests
 import pytest
 
 from .shared import ABI_PATH, CONTRACT_PATH, EVENTS_CONTRACT_PATH
@@ -13,6 +11,7 @@ from .util import (
     assert_tx_status,
     deploy,
     devnet_in_background,
+    get_account_balance,
     get_transaction_receipt,
     load_file_content,
     call,
@@ -51,12 +50,6 @@ def deploy_events_contract():
     """Deploy events contract with salt of 0x99."""
     return deploy(EVENTS_CONTRACT_PATH, salt=SALT)
 
-def get_account_balance(address: str) -> int:
-    """Get balance (wei) of account with `address` (hex)."""
-    resp = requests.get(f"{APP_URL}/account_balance?address={address}")
-    assert resp.status_code == 200
-    return int(resp.json()["amount"])
-
 @pytest.mark.account
 @devnet_in_background()
 def test_account_contract_deploy():
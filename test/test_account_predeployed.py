@@ -1,11 +1,16 @@
 """Predeployed account tests"""
 
+import random
+
 import pytest
 import requests
 
+from starkware.crypto.signature.signature import private_to_stark_key
 from starkware.starknet.core.os.class_hash import compute_class_hash
 from starknet_devnet.account import Account
-from .util import assert_equal, devnet_in_background
+from starknet_devnet.account_keys import AccountKeysCache, derive_all_keys
+from starknet_devnet.constants import ACCOUNT_KEYS_PARALLEL_THRESHOLD
+from .util import assert_equal, devnet_in_background, run_devnet_in_background, terminate_and_wait
 from .support.assertions import assert_valid_schema
 from .settings import APP_URL
 
@@ -35,3 +40,41 @@ def test_predeployed_accounts_predefined_values():
     response = requests.get(f"{APP_URL}/predeployed_accounts")
     assert response.status_code == 200
     assert_valid_schema(response.json(), "predeployed_accounts_fixed_seed.json")
+
+
+@pytest.mark.account_predeployed
+def test_parallel_key_derivation():
+    """Test if the keys derived in parallel are the same as the serially derived ones, in order"""
+    random_generator = random.Random(42)
+    private_keys = [random_generator.getrandbits(128) for _ in range(ACCOUNT_KEYS_PARALLEL_THRESHOLD)]
+
+    expected_keys = []
+    for private_key in private_keys:
+        public_key = private_to_stark_key(private_key)
+        expected_keys.append((public_key, Account.calculate_address(public_key)))
+
+    assert_equal(derive_all_keys(private_keys), expected_keys)
+
+
+@pytest.mark.account_predeployed
+def test_account_keys_cache(tmp_path):
+    """Test if the accounts generated with cached keys are the same as the ones generated without cache"""
+    devnet_args = [*ACCOUNTS_SEED_DEVNET_ARGS, "--account-cache-dir", str(tmp_path)]
+
+    responses = []
+    for _ in range(2):
+        proc = run_devnet_in_background(*devnet_args)
+        try:
+            response = requests.get(f"{APP_URL}/predeployed_accounts")
+            assert response.status_code == 200
+            responses.append(response.json())
+        finally:
+            terminate_and_wait(proc)
+
+    assert_equal(responses[0], responses[1])
+    assert_valid_schema(responses[1], "predeployed_accounts_fixed_seed.json")
+
+    cached_keys = AccountKeysCache(str(tmp_path), seed=123).load(
+        [int(account["private_key"], 16) for account in responses[0]]
+    )
+    assert_equal(len(cached_keys), 3)
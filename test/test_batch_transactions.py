@@ -0,0 +1,73 @@
+"""
+Test submitting transactions in batches
+"""
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .util import assert_equal, assert_tx_status, deploy_tx, devnet_in_background, get_block, invoke_tx
+
+def add_transactions(tx_dicts: list, single_block=False):
+    """Send the batch of transactions; return the response"""
+    params = {"singleBlock": "true"} if single_block else {}
+    return requests.post(f"{APP_URL}/gateway/add_transactions", json=tx_dicts, params=params)
+
+def deploy_address():
+    """Returns the address of the contract deployed with deploy.json and salt 0x1"""
+    res = add_transactions([deploy_tx("0x1")])
+    assert res.status_code == 200
+    return res.json()[0]["address"]
+
+@pytest.mark.batch_transactions
+@devnet_in_background()
+def test_transactions_in_order():
+    """Checks that the transactions are executed in order, each in its own block"""
+    contract_address = deploy_address()
+
+    res = add_transactions([invoke_tx(contract_address), deploy_tx("0x2"), invoke_tx(contract_address)])
+    assert res.status_code == 200
+
+    response_dicts = res.json()
+    assert_equal(len(response_dicts), 3)
+    assert_equal(response_dicts[0]["address"], contract_address)
+    assert "address" in response_dicts[1]
+
+    for response_dict in response_dicts:
+        assert_equal(response_dict["code"], "TRANSACTION_RECEIVED")
+        assert_tx_status(response_dict["transaction_hash"], "ACCEPTED_ON_L2")
+
+    block = get_block(parse=True)
+    assert_equal(block["transactions"][0]["transaction_hash"], response_dicts[2]["transaction_hash"])
+
+@pytest.mark.batch_transactions
+@devnet_in_background()
+def test_single_block():
+    """Checks that the transactions can be included in a single block"""
+    contract_address = deploy_address()
+
+    res = add_transactions([invoke_tx(contract_address), invoke_tx(contract_address)], single_block=True)
+    assert res.status_code == 200
+    tx_hashes = [response_dict["transaction_hash"] for response_dict in res.json()]
+
+    block = get_block(parse=True)
+    assert_equal(block["block_number"], 1)
+    assert_equal([tx["transaction_hash"] for tx in block["transactions"]], tx_hashes)
+
+@pytest.mark.batch_transactions
+@devnet_in_background()
+def test_invalid_transaction():
+    """Checks that no transaction is executed if one of them is invalid"""
+    contract_address = deploy_address()
+    invalid_tx = invoke_tx(contract_address)
+    del invalid_tx["calldata"]
+
+    res = add_transactions([deploy_tx("0x2"), invalid_tx])
+    assert res.status_code == 400
+    assert "index 1" in res.json()["message"]
+
+    res = add_transactions({"transactions": []})
+    assert res.status_code == 400
+
+    block = get_block(parse=True)
+    assert_equal(block["block_number"], 0)
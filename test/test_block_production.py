@@ -0,0 +1,87 @@
+"""
+Test block production with multiple transactions per block
+"""
+
+import time
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import CONTRACT_PATH
+from .util import assert_equal, assert_tx_status, deploy, devnet_in_background, get_block
+
+def create_block():
+    """Send create block request; return the created block"""
+    res = requests.post(f"{APP_URL}/create_block")
+    assert res.status_code == 200
+    return res.json()
+
+def deploy_contract(salt):
+    """Deploy a contract with the provided salt; return the tx hash"""
+    return deploy(CONTRACT_PATH, inputs=["0"], salt=salt)["tx_hash"]
+
+def assert_block_transactions(block, expected_tx_hashes):
+    """Asserts that `block` contains transactions with `expected_tx_hashes`, in order"""
+    tx_hashes = [transaction["transaction_hash"] for transaction in block["transactions"]]
+    assert_equal(tx_hashes, expected_tx_hashes)
+
+    receipt_indices = [receipt["transaction_index"] for receipt in block["transaction_receipts"]]
+    assert_equal(receipt_indices, list(range(len(expected_tx_hashes))))
+
+@pytest.mark.block_production
+@devnet_in_background("--max-txs-per-block", "2")
+def test_max_txs_per_block():
+    """Checks that the pending block is sealed once it reaches the size limit"""
+    first_tx_hash = deploy_contract("0x1")
+    assert_tx_status(first_tx_hash, "PENDING")
+
+    second_tx_hash = deploy_contract("0x2")
+    assert_tx_status(first_tx_hash, "ACCEPTED_ON_L2")
+    assert_tx_status(second_tx_hash, "ACCEPTED_ON_L2")
+
+    block = get_block(parse=True)
+    assert_equal(block["block_number"], 0)
+    assert_block_transactions(block, [first_tx_hash, second_tx_hash])
+
+@pytest.mark.block_production
+@devnet_in_background("--max-txs-per-block", "10")
+def test_create_block():
+    """Checks that the pending block is sealed on request"""
+    tx_hashes = [deploy_contract(salt) for salt in ["0x1", "0x2", "0x3"]]
+    for tx_hash in tx_hashes:
+        assert_tx_status(tx_hash, "PENDING")
+
+    block = create_block()
+    assert_block_transactions(block, tx_hashes)
+    assert_equal(block, get_block(parse=True))
+
+    for tx_hash in tx_hashes:
+        assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+
+@pytest.mark.block_production
+@devnet_in_background()
+def test_create_empty_block():
+    """Checks that an empty block can be created"""
+    tx_hash = deploy_contract("0x1")
+
+    block = create_block()
+    assert_equal(block["block_number"], 1)
+    assert_block_transactions(block, [])
+    genesis_block = requests.get(f"{APP_URL}/feeder_gateway/get_block?blockNumber=0").json()
+    assert_equal(block["parent_block_hash"], genesis_block["block_hash"])
+
+    assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+
+@pytest.mark.block_production
+@devnet_in_background("--block-interval", "500")
+def test_block_interval():
+    """Checks that the pending block is sealed periodically"""
+    tx_hashes = [deploy_contract(salt) for salt in ["0x1", "0x2"]]
+
+    time.sleep(2)
+
+    for tx_hash in tx_hashes:
+        assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+
+    assert_equal(get_block(parse=True)["transactions"][-1]["transaction_hash"], tx_hashes[-1])
@@ -0,0 +1,89 @@
+"""
+Test cache statistics endpoint
+"""
+
+import os
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import ABI_PATH, CONTRACT_PATH
+from .util import (
+    assert_equal, call, declare, deploy, devnet_in_background, invoke, run_devnet_in_background, terminate_and_wait
+)
+
+def get_cache_stats():
+    """Get cache statistics"""
+    res = requests.get(f"{APP_URL}/cache_stats")
+    assert res.status_code == 200
+    return res.json()
+
+@pytest.mark.cache_stats
+@devnet_in_background()
+def test_pedersen_hash_cache():
+    """Checks that the pedersen hash cache is used and that its counters grow"""
+    deploy(CONTRACT_PATH, inputs=["0"])
+    stats = get_cache_stats()["pedersen_hash"]
+
+    assert stats["misses"] > 0
+    assert stats["hits"] > 0
+    assert_equal(stats["size"], min(stats["misses"], stats["max_size"]))
+
+    deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")
+    new_stats = get_cache_stats()["pedersen_hash"]
+    assert new_stats["hits"] + new_stats["misses"] > stats["hits"] + stats["misses"]
+
+@pytest.mark.cache_stats
+@devnet_in_background()
+def test_compiled_hints_cache():
+    """Checks that the hints of a repeatedly executed class are compiled only once"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+    stats = get_cache_stats()["compiled_hints"]
+
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+    assert_equal(call("get_balance", contract_address, ABI_PATH), "60")
+    new_stats = get_cache_stats()["compiled_hints"]
+
+    assert_equal(new_stats["misses"], stats["misses"])
+    assert new_stats["hits"] > stats["hits"]
+
+@pytest.mark.cache_stats
+@devnet_in_background()
+def test_class_hash_cache():
+    """Checks that the class hash of a redeployed class is not calculated again"""
+    deploy(CONTRACT_PATH, inputs=["0"])
+    stats = get_cache_stats()["class_hash"]
+    assert stats["misses"] > 0
+
+    declare(CONTRACT_PATH)
+    deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")
+    new_stats = get_cache_stats()["class_hash"]
+
+    assert_equal(new_stats["misses"], stats["misses"])
+    assert_equal(new_stats["size"], stats["size"])
+    assert new_stats["hits"] > stats["hits"]
+
+@pytest.mark.cache_stats
+def test_class_hash_cache_dir(tmp_path):
+    """Checks that the class hashes are reused by the next run with the same cache directory"""
+    cache_dir = str(tmp_path)
+
+    proc = run_devnet_in_background("--class-hash-cache-dir", cache_dir)
+    try:
+        deploy(CONTRACT_PATH, inputs=["0"])
+        assert get_cache_stats()["class_hash"]["misses"] > 0
+    finally:
+        terminate_and_wait(proc)
+
+    assert len(os.listdir(cache_dir)) == 1
+
+    proc = run_devnet_in_background("--class-hash-cache-dir", cache_dir)
+    try:
+        deploy(CONTRACT_PATH, inputs=["0"])
+        stats = get_cache_stats()["class_hash"]
+        assert_equal(stats["misses"], 0)
+        assert stats["hits"] > 0
+    finally:
+        terminate_and_wait(proc)
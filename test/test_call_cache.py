@@ -0,0 +1,114 @@
+"""
+Test caching the results of calls
+"""
+
+import json
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import ABI_PATH, BLOCK_NUMBER_ABI_PATH, BLOCK_NUMBER_CONTRACT_PATH, CONTRACT_PATH
+from .util import assert_equal, call, deploy, devnet_in_background, invoke, load_file_content
+
+CALL_CONTENT = load_file_content("call.json")
+
+def call_get_balance(contract_address: str) -> requests.Response:
+    """Calls get_balance of the contract at `contract_address`; returns the response"""
+    call_dict = json.loads(CALL_CONTENT)
+    call_dict["contract_address"] = contract_address
+    res = requests.post(f"{APP_URL}/feeder_gateway/call_contract", json=call_dict)
+    assert res.status_code == 200
+    return res
+
+def get_call_cache_stats():
+    """Get the statistics of the call result cache"""
+    res = requests.get(f"{APP_URL}/cache_stats")
+    assert res.status_code == 200
+    return res.json()["call_result"]
+
+def assert_call_cache(*devnet_args):
+    """Checks that the call results are cached until the called contract is written to"""
+    def test():
+        contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+        other_address = deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")["address"]
+
+        first_response = call_get_balance(contract_address)
+        assert_equal(get_call_cache_stats()["misses"], 1)
+
+        second_response = call_get_balance(contract_address)
+        assert_equal(second_response.content, first_response.content)
+        assert_equal(get_call_cache_stats()["hits"], 1)
+
+        # writing to another contract doesn't invalidate the result
+        invoke("increase_balance", ["10", "20"], other_address, ABI_PATH)
+        assert_equal(call_get_balance(contract_address).content, first_response.content)
+        assert_equal(get_call_cache_stats()["hits"], 2)
+
+        invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+        assert_equal(call_get_balance(contract_address).json()["result"], ["0x1e"])
+
+        stats = get_call_cache_stats()
+        assert_equal(stats["invalidations"], 1)
+        assert_equal(stats["hits"], 2)
+        assert_equal(stats["misses"], 2)
+
+    devnet_in_background(*devnet_args)(test)()
+
+@pytest.mark.call
+def test_call_cache():
+    """Checks the call result cache with in-process calls"""
+    assert_call_cache("--call-cache-size", "10")
+
+@pytest.mark.call
+def test_call_cache_with_call_workers():
+    """Checks the call result cache with calls executed by the call workers"""
+    assert_call_cache("--call-cache-size", "10", "--call-workers", "2")
+
+@pytest.mark.call
+@devnet_in_background("--call-cache-size", "1")
+def test_call_cache_eviction():
+    """Checks that the least recently used result is evicted"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    other_address = deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")["address"]
+
+    call_get_balance(contract_address)
+    call_get_balance(other_address)
+    call_get_balance(contract_address)
+
+    stats = get_call_cache_stats()
+    assert_equal(stats["misses"], 3)
+    assert_equal(stats["size"], 1)
+
+@pytest.mark.call
+@devnet_in_background("--call-cache-size", "10")
+def test_call_cache_invalidation():
+    """Checks that the cached result is invalidated once an invoke writes to the called contract"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    assert_equal(call_get_balance(contract_address).json()["result"], ["0x0"])
+    assert_equal(call_get_balance(contract_address).json()["result"], ["0x0"])
+    assert_equal(get_call_cache_stats()["hits"], 1)
+
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+    assert_equal(call_get_balance(contract_address).json()["result"], ["0x1e"])
+    assert_equal(get_call_cache_stats()["invalidations"], 1)
+
+    # the new result is cached in turn
+    assert_equal(call_get_balance(contract_address).json()["result"], ["0x1e"])
+    assert_equal(get_call_cache_stats()["hits"], 2)
+
+@pytest.mark.call
+@devnet_in_background("--call-cache-size", "10")
+def test_call_reading_block_info_not_cached():
+    """Checks that the result of a call reading the block number isn't cached, so it follows the new blocks"""
+    contract_address = deploy(BLOCK_NUMBER_CONTRACT_PATH)["address"]
+    first_number = int(call("get_number", contract_address, BLOCK_NUMBER_ABI_PATH))
+    assert_equal(int(call("get_number", contract_address, BLOCK_NUMBER_ABI_PATH)), first_number)
+
+    res = requests.post(f"{APP_URL}/create_block")
+    assert_equal(res.status_code, 200)
+    assert_equal(int(call("get_number", contract_address, BLOCK_NUMBER_ABI_PATH)), first_number + 1)
+
+    stats = get_call_cache_stats()
+    assert_equal(stats["hits"], 0)
+    assert_equal(stats["size"], 0)
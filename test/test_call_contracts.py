@@ -0,0 +1,147 @@
+"""
+Test running many calls in one request
+"""
+
+import json
+
+import pytest
+import requests
+from starkware.starknet.public.abi import get_selector_from_name
+
+from .settings import APP_URL
+from .shared import ABI_PATH, CONTRACT_PATH
+from .util import assert_equal, deploy, devnet_in_background, invoke, load_file_content
+
+CALL_CONTENT = load_file_content("call.json")
+
+def get_balance_call(contract_address: str) -> dict:
+    """Returns the dict of the get_balance call of the contract at `contract_address`"""
+    call_dict = json.loads(CALL_CONTENT)
+    call_dict["contract_address"] = contract_address
+    return call_dict
+
+def call_contracts(call_dicts) -> requests.Response:
+    """Sends the array of calls; returns the response"""
+    return requests.post(f"{APP_URL}/feeder_gateway/call_contracts", json=call_dicts)
+
+def assert_call_contracts():
+    """Checks that the calls are executed in order, each with its own result or error"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    other_address = deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")["address"]
+    invoke("increase_balance", ["10", "20"], other_address, ABI_PATH)
+
+    malformed_call = get_balance_call(contract_address)
+    del malformed_call["entry_point_selector"]
+
+    res = call_contracts([
+        get_balance_call(contract_address),
+        get_balance_call(other_address),
+        get_balance_call("0x1"),
+        malformed_call,
+        get_balance_call(other_address),
+    ])
+    assert res.status_code == 200
+
+    result_dicts = res.json()
+    assert_equal(len(result_dicts), 5)
+    assert_equal(result_dicts[0], {"result": ["0x0"]})
+    assert_equal(result_dicts[1], {"result": ["0x1e"]})
+    assert "No contract at the provided address" in result_dicts[2]["message"]
+    assert_equal(result_dicts[3]["status_code"], 400)
+    assert_equal(result_dicts[4], result_dicts[1])
+
+    # the results are the same as of the single calls
+    single_res = requests.post(f"{APP_URL}/feeder_gateway/call_contract", json=get_balance_call(other_address))
+    assert_equal(single_res.json(), result_dicts[1])
+
+@pytest.mark.call
+@devnet_in_background()
+def test_call_contracts():
+    """Checks the calls executed in-process"""
+    assert_call_contracts()
+
+@pytest.mark.call
+@devnet_in_background("--call-workers", "2", "--call-cache-size", "10")
+def test_call_contracts_with_call_workers():
+    """Checks the calls executed by the call workers, with the call results cached"""
+    assert_call_contracts()
+
+@pytest.mark.call
+@devnet_in_background()
+def test_invalid_call_contracts():
+    """Checks that a request which isn't an array of calls is rejected"""
+    res = call_contracts({"calls": []})
+    assert_equal(res.status_code, 400)
+
+    res = call_contracts([])
+    assert_equal(res.status_code, 200)
+    assert_equal(res.json(), [])
+
+def call_contract_rows(contract_address: str, function: str, calldata_rows: list) -> requests.Response:
+    """Calls `function` of the contract at `contract_address` once per calldata row; returns the response"""
+    return requests.post(f"{APP_URL}/feeder_gateway/call_contract_rows", json={
+        "contract_address": contract_address,
+        "entry_point_selector": hex(get_selector_from_name(function)),
+        "calldata_rows": calldata_rows,
+        "signature": [],
+    })
+
+@pytest.mark.call
+@devnet_in_background()
+def test_call_contract_rows():
+    """Checks that the rows are called in order and that the results are streamed one per line"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+
+    res = call_contract_rows(contract_address, "sum_point_array", [
+        ["1", "10", "20"],
+        ["2", "1", "2", "3", "4"],
+        ["2", "1"],
+        ["0"],
+    ])
+    assert_equal(res.status_code, 200)
+    assert_equal(res.headers["Content-Type"], "application/x-ndjson")
+
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert_equal(len(lines), 4)
+    assert_equal(lines[0], {"result": ["0xa", "0x14"]})
+    assert_equal(lines[1], {"result": ["0x4", "0x6"]})
+    assert "message" in lines[2]
+    assert_equal(lines[3], {"result": ["0x0", "0x0"]})
+
+@pytest.mark.call
+@devnet_in_background("--call-workers", "2")
+def test_call_contract_rows_with_call_workers():
+    """Checks that the rows called in chunks by the call workers are streamed in order"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+
+    res = call_contract_rows(contract_address, "sum_point_array", [["1", str(i), "1"] for i in range(600)])
+    assert_equal(res.status_code, 200)
+
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert_equal(lines, [{"result": [hex(i), "0x1"]} for i in range(600)])
+
+@pytest.mark.call
+@devnet_in_background()
+def test_call_contract_rows_isolated():
+    """Checks that the calls of the rows don't change the state"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+
+    res = call_contract_rows(contract_address, "increase_balance", [["10", "20"], ["1", "2"]])
+    assert_equal(res.status_code, 200)
+    assert_equal([json.loads(line) for line in res.text.splitlines()], [{"result": []}, {"result": []}])
+
+    res = requests.post(f"{APP_URL}/feeder_gateway/call_contract", json=get_balance_call(contract_address))
+    assert_equal(res.json(), {"result": ["0x0"]})
+
+@pytest.mark.call
+@devnet_in_background()
+def test_invalid_call_contract_rows():
+    """Checks that a call without calldata rows, or of a missing contract, is rejected"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+
+    res = requests.post(f"{APP_URL}/feeder_gateway/call_contract_rows", json=get_balance_call(contract_address))
+    assert_equal(res.status_code, 400)
+
+    res = call_contract_rows("0x1", "get_balance", [[]])
+    assert_equal(res.status_code, 500)
+    assert "No contract at the provided address" in res.json()["message"]
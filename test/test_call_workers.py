@@ -0,0 +1,43 @@
+"""
+Test running calls and fee estimations in worker processes
+"""
+
+import pytest
+
+from .shared import ABI_PATH, CONTRACT_PATH
+from .util import assert_equal, call, deploy, devnet_in_background, estimate_fee, invoke, run_starknet
+
+@pytest.mark.call
+@devnet_in_background("--call-workers", "2")
+def test_call_after_invoke():
+    """Checks that the workers see the state of the last sealed block"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    assert_equal(call("get_balance", contract_address, ABI_PATH), "0")
+
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+    assert_equal(call("get_balance", contract_address, ABI_PATH), "30")
+
+    invoke("increase_balance", ["1", "2"], contract_address, ABI_PATH)
+    assert_equal(call("get_balance", contract_address, ABI_PATH), "33")
+
+@pytest.mark.call
+@devnet_in_background("--call-workers", "2")
+def test_estimate_fee():
+    """Checks that the fee is estimated in the workers"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    fee = estimate_fee("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+    assert fee > 0
+
+@pytest.mark.call
+@devnet_in_background("--call-workers", "2")
+def test_failing_call():
+    """Checks that the errors of the workers are reported"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    output = run_starknet([
+        "call",
+        "--function", "get_balance",
+        "--address", contract_address,
+        "--abi", ABI_PATH,
+        "--inputs", "1"
+    ], raise_on_nonzero=False)
+    assert output.returncode != 0
@@ -82,3 +82,25 @@ async def test_deploy_lite():
 
     assert tx_status["tx_status"] == TransactionStatus.ACCEPTED_ON_L2.name
     assert tx_status["block_hash"] == 0
+
+@pytest.mark.asyncio
+async def test_deploy_same_class():
+    """
+    Test that the contracts of the same class share the stored class and code.
+    """
+    devnet = StarknetWrapper(config=DevnetConfig())
+    await devnet.initialize()
+
+    addresses = []
+    for salt in range(3):
+        contract_address, _ = await devnet.deploy(deploy_transaction=get_deploy_transaction(inputs=[0], salt=salt))
+        addresses.append(contract_address)
+
+    first_address, *other_addresses = addresses
+    expected_class = devnet.contracts.get_full_contract(first_address)
+    expected_code = devnet.contracts.get_code(first_address)
+    assert expected_class == get_contract_class().remove_debug_info()
+
+    for contract_address in other_addresses:
+        assert devnet.contracts.get_full_contract(contract_address) is expected_class
+        assert devnet.contracts.get_code(contract_address) is expected_code
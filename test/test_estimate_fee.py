@@ -78,3 +78,51 @@ def test_estimate_fee_with_complete_request_data():
     assert isinstance(response_parsed["gas_usage"], int)
     assert response_parsed["overall_fee"] == response_parsed["gas_price"] * response_parsed["gas_usage"]
     assert response_parsed["unit"] == "wei"
+
+def estimate_fee_bulk(req_dicts, sequential=False):
+    """Estimate fees of the given transactions"""
+    params = {"sequential": "true"} if sequential else {}
+    return requests.post(f"{APP_URL}/feeder_gateway/estimate_fee_bulk", json=req_dicts, params=params)
+
+@pytest.mark.estimate_fee
+@devnet_in_background("--gas-price", str(GAS_PRICE))
+def test_estimate_fee_bulk():
+    """Estimate fees of many transactions in one request, with a failed estimation among them"""
+
+    deploy_info = deploy(CONTRACT_PATH, ["0"])
+    req_dict = {
+        "contract_address": deploy_info["address"],
+        "version": "0x100000000000000000000000000000000",
+        "signature": [],
+        "calldata": ["10", "20"],
+        "max_fee": "0x0",
+        "entry_point_selector": "0x362398bec32bc0ebb411203221a35a0301193a96f317ebe5e40be9f60d15320"
+    }
+    unknown_address_req_dict = {**req_dict, "contract_address": "0x1"}
+    expected_fee = send_estimate_fee_with_requests(req_dict).json()
+
+    for sequential in [False, True]:
+        response = estimate_fee_bulk([req_dict, unknown_address_req_dict, req_dict], sequential=sequential)
+        assert response.status_code == 200
+
+        fee_responses = response.json()
+        assert len(fee_responses) == 3
+        assert fee_responses[0] == expected_fee
+        assert fee_responses[1]["status_code"] == 500
+        assert "message" in fee_responses[1]
+        assert fee_responses[2] == expected_fee
+
+    # the estimations didn't change the state
+    assert send_estimate_fee_with_requests(req_dict).json() == expected_fee
+
+@pytest.mark.estimate_fee
+@devnet_in_background()
+def test_estimate_fee_bulk_with_invalid_data():
+    """Estimate fees with a malformed transaction in the array"""
+    req_dict = json.loads(INVOKE_CONTENT)
+    del req_dict["type"]
+    del req_dict["calldata"]
+
+    response = estimate_fee_bulk([req_dict])
+    assert response.status_code == 400
+    assert "index 0" in response.json()["message"]
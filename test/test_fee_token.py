@@ -1,7 +1,8 @@
 """Fee token related tests."""
 
 from test.settings import APP_URL
-from test.test_account import deploy_empty_contract, execute, assert_tx_status, get_transaction_receipt, get_account_balance
+from test.test_account import deploy_empty_contract, execute, assert_tx_status, get_transaction_receipt
+from test.util import get_account_balance
 import json
 import pytest
 import requests
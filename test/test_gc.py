@@ -0,0 +1,50 @@
+"""
+Test garbage collection of the state commitment facts
+"""
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import ABI_PATH, CONTRACT_PATH
+from .util import assert_equal, assert_tx_status, call, deploy, devnet_in_background, invoke
+
+def collect_garbage(body=None):
+    """Send gc request; return the response"""
+    return requests.post(f"{APP_URL}/gc", json=body)
+
+@pytest.mark.gc
+@devnet_in_background()
+def test_gc():
+    """Checks that the unreachable facts are removed and the state stays usable"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+
+    res = collect_garbage()
+    assert res.status_code == 200
+    assert res.json()["removed_facts"] > 0
+    assert res.json()["remaining_facts"] > 0
+
+    assert_equal(collect_garbage().json()["removed_facts"], 0)
+
+    assert_equal(call("get_balance", contract_address, ABI_PATH), "30")
+    tx_hash = invoke("increase_balance", ["1", "2"], contract_address, ABI_PATH)
+    assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+    assert_equal(call("get_balance", contract_address, ABI_PATH), "33")
+
+@pytest.mark.gc
+@devnet_in_background()
+def test_gc_retained_blocks():
+    """Checks that the facts of the retained blocks are kept"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+
+    assert_equal(collect_garbage({"retained_blocks": 2}).json()["removed_facts"], 0)
+    assert collect_garbage({"retained_blocks": 1}).json()["removed_facts"] > 0
+
+@pytest.mark.gc
+@devnet_in_background()
+def test_gc_invalid_retained_blocks():
+    """Checks that an invalid number of retained blocks is rejected"""
+    res = collect_garbage({"retained_blocks": -1})
+    assert res.status_code == 400
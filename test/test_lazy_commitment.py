@@ -0,0 +1,109 @@
+"""
+Test deferring and parallelizing the state commitment and block hash calculation
+"""
+
+import json
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import ABI_PATH, CONTRACT_PATH
+from .util import (
+    assert_equal, assert_tx_status, deploy, devnet_in_background,
+    get_block, get_state_update, invoke, load_file_content, run_devnet_in_background, terminate_and_wait
+)
+
+DEPLOY_CONTENT = load_file_content("deploy.json")
+
+def run_scenario():
+    """Deploy and invoke contracts; return the state updates of the generated blocks, without block hashes"""
+    addresses = [deploy(CONTRACT_PATH, inputs=["0"], salt=salt)["address"] for salt in ["0x1", "0x2"]]
+    for address in addresses:
+        invoke("increase_balance", ["10", "20"], address, ABI_PATH)
+
+    state_updates = []
+    for block_number in range(len(addresses) * 2):
+        state_update = get_state_update(block_number=block_number)
+        del state_update["block_hash"]
+        state_updates.append(state_update)
+
+    return state_updates
+
+def run_scenario_in_background(*devnet_args):
+    """Run the scenario on a devnet started with `devnet_args`"""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        return run_scenario()
+    finally:
+        terminate_and_wait(proc)
+
+@pytest.mark.lazy_commitment
+def test_same_state_updates():
+    """Checks that the deferred and pipelined calculations produce the same roots and diffs as the regular one"""
+    lazy_state_updates = run_scenario_in_background("--lazy-commitment")
+    pipelined_state_updates = run_scenario_in_background("--pipelined-commitment")
+    state_updates = run_scenario_in_background()
+
+    assert_equal(lazy_state_updates, state_updates)
+    assert_equal(pipelined_state_updates, state_updates)
+
+    for previous_state_update, state_update in zip(state_updates, state_updates[1:]):
+        assert_equal(state_update["old_root"], previous_state_update["new_root"])
+
+@pytest.mark.lazy_commitment
+@devnet_in_background("--lazy-commitment")
+def test_block_data():
+    """Checks that the block data is available when first requested"""
+    tx_hash = deploy(CONTRACT_PATH, inputs=["0"])["tx_hash"]
+    assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+
+    block = get_block(parse=True)
+    assert_equal(block["block_number"], 0)
+    assert_equal(block["transactions"][0]["transaction_hash"], tx_hash)
+    assert block["block_hash"] != "0x0"
+
+@pytest.mark.lazy_commitment
+def test_hash_workers():
+    """Checks that hashing in a process pool produces the same roots and diffs as hashing in-process"""
+    pooled_state_updates = run_scenario_in_background("--hash-workers", "2", "--hash-batch-threshold", "2")
+    state_updates = run_scenario_in_background()
+
+    assert_equal(pooled_state_updates, state_updates)
+
+def seal_blocks_before_reading():
+    """Send deploys, each sealed in its own block, before any block data is read; return the state updates, without block hashes"""
+    deploy_dict = json.loads(DEPLOY_CONTENT)
+    for salt in ["0x1", "0x2", "0x3"]:
+        res = requests.post(f"{APP_URL}/gateway/add_transaction", json={**deploy_dict, "contract_address_salt": salt})
+        assert res.status_code == 200
+
+    state_updates = []
+    for block_number in range(3):
+        state_update = get_state_update(block_number=block_number)
+        del state_update["block_hash"]
+        state_updates.append(state_update)
+
+    return state_updates
+
+def seal_blocks_before_reading_in_background(*devnet_args):
+    """Seal the blocks on a devnet started with `devnet_args`"""
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        return seal_blocks_before_reading()
+    finally:
+        terminate_and_wait(proc)
+
+@pytest.mark.lazy_commitment
+def test_several_uncommitted_blocks():
+    """Checks the roots of several blocks sealed before the first read, and thus committed one after another"""
+    lazy_state_updates = seal_blocks_before_reading_in_background("--lazy-commitment")
+    pipelined_state_updates = seal_blocks_before_reading_in_background("--pipelined-commitment")
+    state_updates = seal_blocks_before_reading_in_background()
+
+    assert_equal(lazy_state_updates, state_updates)
+    assert_equal(pipelined_state_updates, state_updates)
+
+    for previous_state_update, state_update in zip(state_updates, state_updates[1:]):
+        assert_equal(state_update["old_root"], previous_state_update["new_root"])
+        assert state_update["new_root"] != state_update["old_root"]
@@ -0,0 +1,115 @@
+"""
+Test receiving transactions into the mempool and executing them in the background
+"""
+
+import time
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .util import assert_equal, deploy_tx, devnet_in_background, invoke_tx
+
+def get_tx_status(tx_hash: str):
+    """Get the status of the transaction with `tx_hash`"""
+    res = requests.get(f"{APP_URL}/feeder_gateway/get_transaction_status?transactionHash={tx_hash}")
+    return res.json()["tx_status"]
+
+def wait_for_status(tx_hash: str, expected_status: str, max_wait=30):
+    """Wait until the transaction with `tx_hash` has `expected_status`"""
+    for _ in range(max_wait * 10):
+        if get_tx_status(tx_hash) == expected_status:
+            return
+        time.sleep(0.1)
+
+    raise TimeoutError(f"Transaction {tx_hash} didn't reach status {expected_status}")
+
+def get_mempool():
+    """Get the mempool metrics"""
+    res = requests.get(f"{APP_URL}/mempool")
+    assert res.status_code == 200
+    return res.json()
+
+@pytest.mark.mempool
+@devnet_in_background("--mempool-size", "10")
+def test_transactions_executed_in_order():
+    """Checks that the received transactions are executed in the order they were received"""
+    res = requests.post(f"{APP_URL}/gateway/add_transaction", json=deploy_tx("0x1"))
+    assert res.status_code == 200
+    deploy_response = res.json()
+    contract_address = deploy_response["address"]
+
+    invoke_hashes = []
+    for _ in range(3):
+        res = requests.post(f"{APP_URL}/gateway/add_transaction", json=invoke_tx(contract_address))
+        assert res.status_code == 200
+        assert "result" not in res.json()
+        invoke_hashes.append(res.json()["transaction_hash"])
+
+    wait_for_status(invoke_hashes[-1], "ACCEPTED_ON_L2")
+
+    receipt = requests.get(
+        f"{APP_URL}/feeder_gateway/get_transaction_receipt?transactionHash={deploy_response['transaction_hash']}"
+    ).json()
+    assert_equal(receipt["status"], "ACCEPTED_ON_L2")
+    assert_equal(receipt["block_number"], 0)
+
+    block_numbers = [
+        requests.get(f"{APP_URL}/feeder_gateway/get_transaction_receipt?transactionHash={tx_hash}").json()["block_number"]
+        for tx_hash in invoke_hashes
+    ]
+    assert_equal(block_numbers, [1, 2, 3])
+
+    metrics = get_mempool()
+    assert_equal(metrics["size"], 0)
+    assert_equal(metrics["received"], 4)
+    assert_equal(metrics["executed"], 4)
+
+@pytest.mark.mempool
+@devnet_in_background("--mempool-size", "100")
+def test_receiving_during_execution():
+    """Checks that a transaction is received without waiting for the execution of the preceding ones"""
+    res = requests.post(f"{APP_URL}/gateway/add_transaction", json=deploy_tx("0x1"))
+    contract_address = res.json()["address"]
+    wait_for_status(res.json()["transaction_hash"], "ACCEPTED_ON_L2")
+
+    batch = [invoke_tx(contract_address) for _ in range(50)]
+    # distinct transaction hashes
+    for amount, tx_dict in enumerate(batch, start=1):
+        tx_dict["calldata"] = [str(amount)]
+
+    res = requests.post(f"{APP_URL}/gateway/add_transactions", json=batch)
+    assert res.status_code == 200
+    batch_hashes = [response_dict["transaction_hash"] for response_dict in res.json()]
+
+    res = requests.post(f"{APP_URL}/gateway/add_transaction", json=deploy_tx("0x2"))
+    assert res.status_code == 200
+    assert_equal(get_tx_status(batch_hashes[-1]), "RECEIVED")
+
+    deploy_hash = res.json()["transaction_hash"]
+
+    res = requests.get(f"{APP_URL}/feeder_gateway/get_transaction?transactionHash={batch_hashes[-1]}")
+    assert_equal(res.status_code, 200)
+    assert_equal(res.json()["status"], "RECEIVED")
+    assert_equal(int(res.json()["transaction"]["transaction_hash"], 16), int(batch_hashes[-1], 16))
+    assert_equal(res.json()["transaction"]["calldata"], [hex(50)])
+
+    wait_for_status(deploy_hash, "ACCEPTED_ON_L2")
+
+@pytest.mark.mempool
+@devnet_in_background("--mempool-size", "1")
+def test_full_mempool():
+    """Checks that transactions not fitting in the mempool are rejected as a whole"""
+    res = requests.post(f"{APP_URL}/gateway/add_transactions", json=[deploy_tx("0x1"), deploy_tx("0x2")])
+    assert res.status_code == 503
+
+    metrics = get_mempool()
+    assert_equal(metrics["received"], 0)
+    assert_equal(metrics["rejected"], 2)
+
+@pytest.mark.mempool
+@devnet_in_background()
+def test_mempool_disabled():
+    """Checks that the mempool can't be inspected if it's not enabled"""
+    res = requests.get(f"{APP_URL}/mempool")
+    assert res.status_code == 400
@@ -2,22 +2,22 @@
 Test restart endpoint
 """
 
+import time
+
 import pytest
 import requests
 
 from .settings import APP_URL
-from .util import devnet_in_background, deploy, assert_transaction_not_received, assert_tx_status, call, invoke
+from .util import (
+    devnet_in_background, deploy, assert_transaction_not_received, assert_tx_status, call, invoke,
+    get_account_balance, get_state_update
+)
 from .shared import CONTRACT_PATH, ABI_PATH
 
 def restart():
     """Get restart response"""
     return requests.post(f"{APP_URL}/restart")
 
-def get_state_update():
-    """Get state update"""
-    res = requests.get(f"{APP_URL}/feeder_gateway/get_state_update")
-    return res.json()
-
 
 def deploy_contract(salt=None):
     """Deploy empyt contract with balance of 0"""
@@ -78,3 +78,61 @@ def test_state_update():
     state_update = get_state_update()
 
     assert state_update is None
+
+def get_predeployed_accounts():
+    """Get predeployed accounts"""
+    res = requests.get(f"{APP_URL}/predeployed_accounts")
+    return res.json()
+
+@pytest.mark.restart
+@devnet_in_background("--accounts", "2", "--seed", "42")
+def test_predeployed_accounts():
+    """Checks that the predeployed accounts and their balances are restored from the genesis"""
+    accounts = get_predeployed_accounts()
+    balances = [get_account_balance(account["address"]) for account in accounts]
+
+    res = requests.post(f"{APP_URL}/mint", json={"address": accounts[0]["address"], "amount": 10, "lite": True})
+    assert res.status_code == 200
+
+    restart()
+
+    assert get_predeployed_accounts() == accounts
+    assert [get_account_balance(account["address"]) for account in accounts] == balances
+
+def get_restart_pool():
+    """Get the state of the restart pool"""
+    res = requests.get(f"{APP_URL}/restart_pool")
+    assert res.status_code == 200
+    return res.json()
+
+def wait_for_restart_pool(size: int, max_wait=30):
+    """Wait until the restart pool contains `size` prepared states"""
+    for _ in range(max_wait * 10):
+        if get_restart_pool()["size"] == size:
+            return
+        time.sleep(0.1)
+
+    raise TimeoutError(f"Restart pool not filled with {size} states")
+
+@pytest.mark.restart
+@devnet_in_background("--restart-pool-size", "2")
+def test_restart_pool():
+    """Checks that restarts are served from the restart pool, which is refilled afterwards"""
+    deploy_info = deploy_contract()
+    wait_for_restart_pool(2)
+
+    restart()
+    assert_transaction_not_received(tx_hash=deploy_info["tx_hash"])
+    assert get_restart_pool()["hits"] == 1
+
+    wait_for_restart_pool(2)
+    deploy_contract()
+    restart()
+    assert get_restart_pool()["hits"] == 2
+
+@pytest.mark.restart
+@devnet_in_background()
+def test_restart_pool_disabled():
+    """Checks that the restart pool can't be inspected if it's not enabled"""
+    res = requests.get(f"{APP_URL}/restart_pool")
+    assert res.status_code == 400
@@ -0,0 +1,107 @@
+"""
+Test simulating transactions without committing them
+"""
+
+import json
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .util import assert_equal, deploy_tx, devnet_in_background, get_block, invoke_tx, load_file_content
+
+CALL_CONTENT = load_file_content("call.json")
+
+def get_balance_tx(contract_address: str) -> dict:
+    """Returns the dict of the get_balance invoke of the contract at `contract_address`"""
+    tx_dict = json.loads(CALL_CONTENT)
+    tx_dict["contract_address"] = contract_address
+    tx_dict["type"] = "INVOKE_FUNCTION"
+    return tx_dict
+
+def simulate_transactions(tx_dicts) -> requests.Response:
+    """Sends the array of transactions to be simulated; returns the response"""
+    return requests.post(f"{APP_URL}/feeder_gateway/simulate_transactions", json=tx_dicts)
+
+def assert_simulate_transactions():
+    """Checks that the transactions see the effects of the preceding ones, but are not committed"""
+    res = simulate_transactions([deploy_tx()])
+    assert_equal(res.status_code, 200)
+    contract_address = res.json()[0]["address"]
+
+    res = simulate_transactions([
+        deploy_tx(),
+        invoke_tx(contract_address),
+        get_balance_tx(contract_address),
+        invoke_tx("0x1"),
+        invoke_tx(contract_address),
+        get_balance_tx(contract_address),
+    ])
+    assert_equal(res.status_code, 200)
+
+    simulation_results = res.json()
+    assert_equal(len(simulation_results), 6)
+    assert_equal(simulation_results[0]["address"], contract_address)
+    assert_equal(simulation_results[2]["result"], ["0xa"])
+    assert_equal(simulation_results[3]["status"], "REJECTED")
+    assert "message" in simulation_results[3]
+    assert_equal(simulation_results[5]["result"], ["0x14"])
+
+    for index in [0, 1, 2, 4, 5]:
+        simulation_result = simulation_results[index]
+        assert_equal(simulation_result["status"], "ACCEPTED_ON_L2")
+        invocation = simulation_result["trace"]["function_invocation"]
+        assert_equal(int(invocation["contract_address"], 16), int(contract_address, 16))
+        assert simulation_result["events"] == []
+        assert simulation_result["transaction_hash"].startswith("0x")
+
+    fee_estimation = simulation_results[1]["fee_estimation"]
+    assert fee_estimation["overall_fee"] > 0
+    assert_equal(fee_estimation["unit"], "wei")
+    assert_equal(fee_estimation["gas_usage"], fee_estimation["overall_fee"] // fee_estimation["gas_price"])
+
+    # nothing has been committed
+    assert_equal(get_block(parse=True)["block_number"], 0)
+    res = requests.post(f"{APP_URL}/feeder_gateway/call_contract", json=get_balance_tx(contract_address))
+    assert "No contract at the provided address" in res.json()["message"]
+
+@pytest.mark.estimate_fee
+@devnet_in_background()
+def test_simulate_transactions():
+    """Checks the transactions simulated in-process"""
+    assert_simulate_transactions()
+
+@pytest.mark.estimate_fee
+@devnet_in_background("--call-workers", "2")
+def test_simulate_transactions_with_call_workers():
+    """Checks the transactions simulated by the call workers"""
+    assert_simulate_transactions()
+
+@pytest.mark.estimate_fee
+@devnet_in_background()
+def test_invalid_simulate_transactions():
+    """Checks that a request which isn't an array of valid transactions is rejected"""
+    res = simulate_transactions({"transactions": []})
+    assert_equal(res.status_code, 400)
+
+    invalid_tx = invoke_tx("0x1")
+    del invalid_tx["calldata"]
+    res = simulate_transactions([deploy_tx(), invalid_tx])
+    assert_equal(res.status_code, 400)
+    assert "index 1" in res.json()["message"]
+
+@pytest.mark.estimate_fee
+@devnet_in_background()
+def test_simulate_transactions_stores_no_facts():
+    """Checks that the class of a simulated deployment isn't written to the storage"""
+    res = requests.post(f"{APP_URL}/gc")
+    assert_equal(res.status_code, 200)
+    remaining_facts = res.json()["remaining_facts"]
+
+    res = simulate_transactions([deploy_tx()])
+    assert_equal(res.status_code, 200)
+    assert_equal(res.json()[0]["status"], "ACCEPTED_ON_L2")
+
+    res = requests.post(f"{APP_URL}/gc")
+    assert_equal(res.json()["removed_facts"], 0)
+    assert_equal(res.json()["remaining_facts"], remaining_facts)
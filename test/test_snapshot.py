@@ -0,0 +1,107 @@
+"""
+Test snapshot and revert endpoints
+"""
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .shared import ABI_PATH, CONTRACT_PATH
+from .util import (
+    assert_equal, assert_transaction_not_received, assert_tx_status,
+    call, deploy, devnet_in_background, get_block, get_transaction_receipt, invoke
+)
+
+def snapshot():
+    """Take a snapshot; return its id"""
+    res = requests.post(f"{APP_URL}/snapshot")
+    assert res.status_code == 200
+    return res.json()["snapshot_id"]
+
+def revert(snapshot_id):
+    """Revert to snapshot with `snapshot_id`; return the response"""
+    return requests.post(f"{APP_URL}/revert", json={"snapshot_id": snapshot_id})
+
+def get_balance(contract_address):
+    """Get the balance of the contract at `contract_address`"""
+    return call("get_balance", contract_address, ABI_PATH)
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_revert_storage_and_blocks():
+    """Checks that the storage, the transactions and the blocks are reverted"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH)
+    block = get_block(parse=True)
+
+    snapshot_id = snapshot()
+
+    tx_hash = invoke("increase_balance", ["1", "2"], contract_address, ABI_PATH)
+    assert_equal(get_balance(contract_address), "33")
+
+    res = revert(snapshot_id)
+    assert res.status_code == 200
+
+    assert_equal(get_balance(contract_address), "30")
+    assert_transaction_not_received(tx_hash)
+    assert_equal(get_block(parse=True), block)
+
+    # the state is usable and the snapshot can be reused
+    invoke("increase_balance", ["5", "5"], contract_address, ABI_PATH)
+    assert_equal(get_balance(contract_address), "40")
+    revert(snapshot_id)
+    assert_equal(get_balance(contract_address), "30")
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_revert_deployment():
+    """Checks that the contracts deployed after the snapshot are removed"""
+    snapshot_id = snapshot()
+    deploy_info = deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")
+
+    revert(snapshot_id)
+    assert_transaction_not_received(deploy_info["tx_hash"])
+
+    # deploying the same contract again succeeds
+    redeploy_info = deploy(CONTRACT_PATH, inputs=["0"], salt="0x42")
+    assert_equal(redeploy_info["address"], deploy_info["address"])
+    assert_tx_status(redeploy_info["tx_hash"], "ACCEPTED_ON_L2")
+    assert_equal(get_balance(redeploy_info["address"]), "0")
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_revert_repeated_transaction_hash():
+    """Checks that a transaction stored again after the snapshot is restored, not removed"""
+    contract_address = deploy(CONTRACT_PATH, inputs=["0"])["address"]
+    tx_hash = invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH, max_fee="0")
+    receipt = get_transaction_receipt(tx_hash)
+
+    snapshot_id = snapshot()
+
+    repeated_tx_hash = invoke("increase_balance", ["10", "20"], contract_address, ABI_PATH, max_fee="0")
+    assert_equal(repeated_tx_hash, tx_hash)
+    assert_equal(get_balance(contract_address), "60")
+
+    revert(snapshot_id)
+
+    assert_equal(get_balance(contract_address), "30")
+    assert_equal(get_transaction_receipt(tx_hash), receipt)
+    assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_revert_discards_later_snapshots():
+    """Checks that the snapshots taken after the reverted-to snapshot are discarded"""
+    first_snapshot_id = snapshot()
+    deploy(CONTRACT_PATH, inputs=["0"])
+    second_snapshot_id = snapshot()
+
+    assert revert(first_snapshot_id).status_code == 200
+    assert revert(second_snapshot_id).status_code == 400
+
+@pytest.mark.snapshot
+@devnet_in_background()
+def test_revert_invalid_id():
+    """Checks that reverting to a nonexistent snapshot fails"""
+    assert revert(0).status_code == 400
+    assert revert(-1).status_code == 400
@@ -0,0 +1,78 @@
+"""
+Test executing batched invokes speculatively in parallel
+"""
+
+import pytest
+import requests
+
+from .settings import APP_URL
+from .test_batch_transactions import add_transactions
+from .test_call_contracts import get_balance_call
+from .util import (
+    assert_equal, assert_tx_status, deploy_tx, devnet_in_background, get_state_update, get_transaction_receipt,
+    invoke_tx, run_devnet_in_background, terminate_and_wait
+)
+
+def execute_batch(*devnet_args):
+    """
+    Deploys three contracts and invokes them in a single-block batch on a fresh devnet run with `devnet_args`.
+    The invokes target disjoint contracts as well as the same contract repeatedly.
+    Returns the responses, the receipts and the state update of the batch.
+    """
+    proc = run_devnet_in_background(*devnet_args)
+    try:
+        res = add_transactions([deploy_tx(salt) for salt in ["0x1", "0x2", "0x3"]], single_block=True)
+        assert res.status_code == 200
+        addresses = [response_dict["address"] for response_dict in res.json()]
+
+        batch = [invoke_tx(address) for address in [*addresses, addresses[0], addresses[1], addresses[0]]]
+        res = add_transactions(batch, single_block=True)
+        assert res.status_code == 200
+        response_dicts = res.json()
+
+        receipts = []
+        for response_dict in response_dicts:
+            receipt = get_transaction_receipt(response_dict["transaction_hash"])
+            # the block hash depends on the block timestamp
+            del receipt["block_hash"]
+            receipts.append(receipt)
+
+        state_update = get_state_update()
+        del state_update["block_hash"]
+
+        return response_dicts, receipts, state_update
+    finally:
+        terminate_and_wait(proc)
+
+@pytest.mark.speculative_execution
+def test_same_outcome_as_serial_execution():
+    """Checks that the batch has the same outcome with and without speculative execution"""
+    serial_outcome = execute_batch()
+    speculative_outcome = execute_batch("--speculative-workers", "2")
+
+    assert_equal(speculative_outcome, serial_outcome)
+
+    _, receipts, _ = speculative_outcome
+    assert_equal(len(receipts), 6)
+    for receipt in receipts:
+        assert_equal(receipt["status"], "ACCEPTED_ON_L2")
+
+@pytest.mark.speculative_execution
+@devnet_in_background("--speculative-workers", "2")
+def test_disjoint_invokes():
+    """Checks the batch of invokes whose speculative results are all committed, apart from the failing one"""
+    res = add_transactions([deploy_tx(salt) for salt in ["0x1", "0x2", "0x3"]], single_block=True)
+    assert res.status_code == 200
+    addresses = [response_dict["address"] for response_dict in res.json()]
+
+    res = add_transactions([invoke_tx(address) for address in [*addresses, "0x1"]], single_block=True)
+    assert res.status_code == 200
+    tx_hashes = [response_dict["transaction_hash"] for response_dict in res.json()]
+
+    for tx_hash in tx_hashes[:3]:
+        assert_tx_status(tx_hash, "ACCEPTED_ON_L2")
+    assert_tx_status(tx_hashes[3], "REJECTED")
+
+    for address in addresses:
+        res = requests.post(f"{APP_URL}/feeder_gateway/call_contract", json=get_balance_call(address))
+        assert_equal(res.json()["result"], ["0xa"])
@@ -9,7 +9,7 @@ from starkware.starknet.core.os.class_hash import compute_class_hash
 from starkware.starknet.public.abi import get_selector_from_name
 
 from .util import (
-    deploy, invoke, load_contract_class, devnet_in_background, get_block, assert_equal
+    deploy, invoke, load_contract_class, devnet_in_background, get_block, get_state_update, assert_equal
 )
 from .settings import APP_URL
 from .shared import STORAGE_CONTRACT_PATH, STORAGE_ABI_PATH
@@ -30,10 +30,6 @@ def get_state_update_response(block_hash=None, block_number=None):
 
     return res
 
-def get_state_update(block_hash=None, block_number=None):
-    """Get state update"""
-    return get_state_update_response(block_hash, block_number).json()
-
 def deploy_empty_contract():
     """
     Deploy storage contract
@@ -174,3 +170,21 @@ def test_roots():
     old_root = state_update["old_root"]
 
     assert_equal(old_root, new_root)
+
+@pytest.mark.state_update
+@devnet_in_background("--max-txs-per-block", "2")
+def test_deploy_and_invoke_in_block():
+    """Test that the changes of both a deploy and an invoke of a block are in its state update"""
+    contract_address = deploy_empty_contract()
+    invoke("store_value", ["30"], contract_address, STORAGE_ABI_PATH)
+
+    state_diff = get_state_update()["state_diff"]
+
+    deployed_contracts = state_diff["deployed_contracts"]
+    assert_equal(len(deployed_contracts), 1)
+    assert_equal(int(deployed_contracts[0]["address"], 16), int(contract_address, 16))
+
+    storage_diffs = state_diff["storage_diffs"]
+    assert_equal(len(storage_diffs), 1)
+    contract_storage_diffs = storage_diffs[hex(int(contract_address, 16))]
+    assert_equal(contract_storage_diffs, [{"key": STORAGE_KEY, "value": hex(30)}])
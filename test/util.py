@@ -412,3 +412,31 @@ def load_file_content(file_name: str):
     full_file_path = os.path.join(os.path.dirname(__file__), file_name)
     with open(full_file_path, encoding="utf-8") as deploy_file:
         return deploy_file.read()
+
+def deploy_tx(salt: str = None) -> dict:
+    """Returns the deploy transaction dict of deploy.json, using `salt` if provided"""
+    tx_dict = json.loads(load_file_content("deploy.json"))
+    if salt is not None:
+        tx_dict["contract_address_salt"] = salt
+    return tx_dict
+
+def invoke_tx(contract_address: str) -> dict:
+    """Returns the invoke transaction dict of invoke.json, targeting `contract_address`"""
+    tx_dict = json.loads(load_file_content("invoke.json"))
+    tx_dict["contract_address"] = contract_address
+    return tx_dict
+
+def get_state_update(block_hash=None, block_number=None) -> dict:
+    """Get the state update of the block with `block_hash` or `block_number`. If neither is provided, of the last one."""
+    res = requests.get(
+        f"{APP_URL}/feeder_gateway/get_state_update",
+        params={"blockHash": block_hash, "blockNumber": block_number}
+    )
+    assert res.status_code == 200, res.text
+    return res.json()
+
+def get_account_balance(address: str) -> int:
+    """Get balance (wei) of account with `address` (hex)."""
+    res = requests.get(f"{APP_URL}/account_balance?address={address}")
+    assert res.status_code == 200
+    return int(res.json()["amount"])